@@ -0,0 +1,258 @@
+"""Backtest of the Type A alert claims against the stored match log.
+
+Replays every season and records each F!=4HA / Status3 warning and
+critical alert that ``get_type_a_alerts`` would have shown after each
+match, with the probability the message claimed at that moment. It then
+checks whether the team's counter actually reset within the horizon the
+message promises (``ALERT_HORIZONS``). Counters restart every season, so
+seasons are independent and are replayed in a process pool.
+
+    python alert_backtest.py --db league_data.db
+    python alert_backtest.py --db league_data.db --league spanish
+    python alert_backtest.py --synthetic 100 --workers 8 --csv firings.csv
+"""
+
+import argparse
+import copy
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from league_analytics import ALERT_HORIZONS, alert_kind, alert_probability, pattern_summary
+from league_engine import (
+    F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD, S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD,
+    new_pattern_stats, update_pattern_stats,
+)
+from league_registry import DEFAULT_LEAGUE, league_db_path, load_leagues, new_engine
+
+FIRING_COLUMNS = ["season", "match_id", "team", "kind", "counter", "probability", "horizon", "hit", "evaluated"]
+
+DEFAULT_THRESHOLDS = (F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD, S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD)
+
+# Store columns a season replay needs
+_SEASON_FIELDS = ["match_id", "home", "away", "total_goals", "ha_home", "ha_away", "s3_home", "s3_away"]
+
+
+# ============ SEASON DATA ============
+def season_ranges(store):
+    """``(season, start, stop)`` row ranges in log order"""
+    seasons = store.column("season")
+    if len(seasons) == 0:
+        return []
+    starts = np.flatnonzero(np.r_[True, seasons[1:] != seasons[:-1]])
+    stops = np.r_[starts[1:], len(seasons)]
+    return [(int(seasons[start]), int(start), int(stop)) for start, stop in zip(starts, stops)]
+
+
+def team_entries(columns, status3_exact=False):
+    """Long-format a season: one entry per team per match, in row order.
+
+    Entry ``2 * row`` is the home side and ``2 * row + 1`` the away side.
+    Besides the team codes, both counters after the match and the F!=4HA /
+    Status3 hit flags, it returns ``order`` (a stable permutation grouping
+    entries by team) and, per grouped position, where that team's run ends.
+    """
+    team = np.column_stack([columns["home"], columns["away"]]).ravel()
+    f4_counter = np.column_stack([columns["ha_home"], columns["ha_away"]]).ravel()
+    s3_counter = np.column_stack([columns["s3_home"], columns["s3_away"]]).ravel()
+    total = np.repeat(columns["total_goals"], 2)
+    f4_hit = total == 4
+    s3_hit = total == 3 if status3_exact else total >= 3
+
+    order = np.argsort(team, kind="stable")
+    grouped = team[order]
+    starts = np.flatnonzero(np.r_[True, grouped[1:] != grouped[:-1]])
+    group_end = np.repeat(np.r_[starts[1:], len(grouped)], np.diff(np.r_[starts, len(grouped)]))
+    return {
+        "team": team, "f4_counter": f4_counter, "s3_counter": s3_counter,
+        "f4_hit": f4_hit, "s3_hit": s3_hit, "order": order, "group_end": group_end,
+    }
+
+
+def hits_ahead(hit, order, group_end, horizon):
+    """Per entry: did the team hit within its next ``horizon`` matches, and is that known.
+
+    An entry is unevaluated when the season ends before ``horizon`` more
+    matches and no hit happened in the ones that remain.
+    """
+    sorted_hits = np.cumsum(hit[order])
+    position = np.arange(len(order))
+    last = np.minimum(position + horizon, group_end - 1)
+    ahead = (sorted_hits[last] - sorted_hits[position]) > 0
+    known = ahead | (position + horizon <= group_end - 1)
+
+    hit_ahead = np.empty_like(ahead)
+    evaluated = np.empty_like(known)
+    hit_ahead[order] = ahead
+    evaluated[order] = known
+    return hit_ahead, evaluated
+
+
+# ============ REPLAY ============
+def replay_season(task):
+    """Alert firings of one season as ``FIRING_COLUMNS`` tuples"""
+    season, columns, teams, pattern_stats, status3_exact, thresholds = task
+    f4_alert, f4_critical, s3_alert, s3_critical = thresholds
+    entries = team_entries(columns, status3_exact)
+    outcomes = {}
+    for kind, horizon in ALERT_HORIZONS.items():
+        hit = entries["f4_hit"] if kind.startswith("f4") else entries["s3_hit"]
+        outcomes[kind] = hits_ahead(hit, entries["order"], entries["group_end"], horizon)
+
+    match_ids = columns["match_id"].tolist()
+    codes = entries["team"].tolist()
+    f4_counters = entries["f4_counter"].tolist()
+    s3_counters = entries["s3_counter"].tolist()
+    totals = columns["total_goals"].tolist()
+
+    firings = []
+    for row, total_goals in enumerate(totals):
+        home = 2 * row
+        # Alerts are read after the match, once both teams' patterns include it
+        for entry in (home, home + 1):
+            update_pattern_stats(pattern_stats[teams[codes[entry]]], total_goals, status3_exact)
+        for entry in (home, home + 1):
+            team = teams[codes[entry]]
+            f4_kind = alert_kind(f4_counters[entry], f4_alert, f4_critical, "f4")
+            s3_kind = alert_kind(s3_counters[entry], s3_alert, s3_critical, "s3")
+            if f4_kind is None and s3_kind is None:
+                continue
+            pattern = pattern_summary(pattern_stats[team])
+            for kind, counter, average in (
+                (f4_kind, f4_counters[entry], pattern["avg_f4_before_reset"]),
+                (s3_kind, s3_counters[entry], pattern["avg_s3_before_reset"]),
+            ):
+                if kind is None:
+                    continue
+                hit_ahead, evaluated = outcomes[kind]
+                firings.append((
+                    season, match_ids[row], team, kind, counter,
+                    round(alert_probability(kind, counter, average)), ALERT_HORIZONS[kind],
+                    bool(hit_ahead[entry]), bool(evaluated[entry]),
+                ))
+    return firings
+
+
+def season_tasks(engine, thresholds=DEFAULT_THRESHOLDS):
+    """One picklable replay task per season, with the patterns at its start"""
+    store = engine.store
+    pattern_stats = new_pattern_stats(store.teams)
+    totals = store.column("total_goals").tolist()
+    home_names = [store.teams[code] for code in store.column("home").tolist()]
+    away_names = [store.teams[code] for code in store.column("away").tolist()]
+
+    tasks = []
+    for season, start, stop in season_ranges(store):
+        columns = {name: np.array(store.column(name, start, stop)) for name in _SEASON_FIELDS}
+        tasks.append((season, columns, store.teams, copy.deepcopy(pattern_stats), engine.status3_exact, thresholds))
+        for row in range(start, stop):
+            update_pattern_stats(pattern_stats[home_names[row]], totals[row], engine.status3_exact)
+            update_pattern_stats(pattern_stats[away_names[row]], totals[row], engine.status3_exact)
+    return tasks
+
+
+def backtest_alerts(engine, workers=None, thresholds=DEFAULT_THRESHOLDS):
+    """Every alert firing in the log as a DataFrame of ``FIRING_COLUMNS``"""
+    tasks = season_tasks(engine, thresholds)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) < 2:
+        results = map(replay_season, tasks)
+        firings = [firing for season in results for firing in season]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            chunksize = max(1, len(tasks) // (4 * workers))
+            firings = [firing for season in pool.map(replay_season, tasks, chunksize=chunksize) for firing in season]
+    return pd.DataFrame(firings, columns=FIRING_COLUMNS)
+
+
+# ============ REPORTING ============
+def summarize(firings, by=("kind",)):
+    """Claimed vs realized hit rate (%) per alert kind (or any grouping)"""
+    by = list(by)
+    evaluated = firings[firings["evaluated"]]
+    grouped = evaluated.groupby(by, sort=True)
+    summary = pd.DataFrame({
+        "firings": firings.groupby(by, sort=True).size(),
+        "evaluated": grouped.size(),
+        "hits": grouped["hit"].sum(),
+        "claimed_pct": grouped["probability"].mean().round(1),
+    })
+    summary[["evaluated", "hits"]] = summary[["evaluated", "hits"]].fillna(0).astype(int)
+    summary["hit_rate_pct"] = (summary["hits"] / summary["evaluated"] * 100).round(1)
+    summary["gap_pct"] = (summary["hit_rate_pct"] - summary["claimed_pct"]).round(1)
+    if "kind" in by:
+        summary["horizon"] = summary.index.get_level_values("kind").map(ALERT_HORIZONS)
+    return summary.reset_index()
+
+
+def load_engine(db_path=None, synthetic=None, status3_exact=False, seed=0, league=DEFAULT_LEAGUE, leagues_path=None):
+    """Engine of ``league`` read from its SQLite file or filled with synthetic seasons.
+
+    ``db_path`` is the default league's file, as in cli.py. The file is
+    opened read-only and must exist.
+    """
+    leagues = load_leagues(leagues_path) if leagues_path else load_leagues()
+    if league not in leagues:
+        raise ValueError(f"Unknown league {league!r} (known: {', '.join(leagues)})")
+    engine = new_engine(leagues[league], status3_exact)
+    if synthetic:
+        from synthetic_league import generate_matches
+
+        engine.ingest(generate_matches(synthetic, seed, leagues[league]["teams"]))
+    else:
+        from league_storage import LeagueStorage
+
+        path = league_db_path(db_path, league)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"No league database at {path}")
+        storage = LeagueStorage(path, read_only=True)
+        storage.load(engine)
+        storage.close()
+    return engine
+
+
+def add_source_arguments(parser, verb):
+    """``--db``/``--synthetic``, league and Status3 options of ``load_engine``"""
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--db", default="league_data.db",
+                        help="SQLite file of the default league; other leagues use a suffixed file next to it")
+    source.add_argument("--synthetic", type=int, metavar="SEASONS", help=f"{verb} generated seasons instead")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--league", default=DEFAULT_LEAGUE, help="league key from the registry")
+    parser.add_argument("--leagues", help="league definitions file (default: leagues.json)")
+    parser.add_argument("--status3-exact", action="store_true", help="Status3 resets on exactly 3 goals")
+
+
+def engine_from_args(args):
+    """``load_engine`` for parsed ``add_source_arguments`` options; exits on a missing file or league"""
+    try:
+        return load_engine(args.db, args.synthetic, args.status3_exact, args.seed, args.league, args.leagues)
+    except (FileNotFoundError, ValueError) as error:
+        raise SystemExit(str(error))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest Type A alert claims against the match log")
+    add_source_arguments(parser, "replay")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--csv", help="also write every firing to this CSV file")
+    args = parser.parse_args(argv)
+
+    engine = engine_from_args(args)
+    started = time.perf_counter()
+    firings = backtest_alerts(engine, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(engine.store)} matches, {len(firings)} alert firings replayed in {elapsed:.2f}s")
+    if len(firings):
+        print(summarize(firings).to_string(index=False))
+    if args.csv:
+        firings.to_csv(args.csv, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
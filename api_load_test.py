@@ -0,0 +1,143 @@
+"""Load-test client for the league JSON API.
+
+Opens ``--connections`` keep-alive connections and sends GET requests back
+to back on each for ``--seconds``, then prints requests per second and
+latency percentiles. With ``--etag`` every request revalidates the first
+ETag, so the 304 path is measured. ``--spawn`` starts an api_server.py
+with synthetic seasons on a free port, pinned to one CPU where the
+platform allows, and stops it afterwards:
+
+    python api_load_test.py --spawn 20 --path /table
+    python api_load_test.py --url http://127.0.0.1:8765 --path "/predict?home=Palace&away=Wolves" --etag
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+DEFAULT_CONNECTIONS = 16
+DEFAULT_SECONDS = 5.0
+
+
+async def _read_response(reader):
+    """Status code and ETag of one response; the body is read and discarded"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length, etag = 0, None
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        name = name.lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "etag":
+            etag = value.strip()
+    if length:
+        await reader.readexactly(length)
+    return status, etag
+
+
+def _request(host, path, etag=None):
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}"]
+    if etag:
+        lines.append(f"If-None-Match: {etag}")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _worker(host, port, path, deadline, etag, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = _request(host, path, etag)
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+            status, _ = await _read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def load_test(url=DEFAULT_URL, path="/table", connections=DEFAULT_CONNECTIONS, seconds=DEFAULT_SECONDS,
+                    revalidate=False):
+    """Requests, seconds, status counts and sorted latencies of one run"""
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+
+    # One warm-up request builds the memoized body and yields its ETag
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(_request(host, path))
+    status, etag = await _read_response(reader)
+    writer.close()
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+
+    latencies, statuses = [], {}
+    started = time.perf_counter()
+    deadline = started + seconds
+    await asyncio.gather(*(
+        _worker(host, port, path, deadline, etag if revalidate else None, latencies, statuses)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {"requests": len(latencies), "seconds": elapsed, "statuses": statuses, "latencies": latencies}
+
+
+def _percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def spawn_server(seasons, seed=0):
+    """Start api_server.py on a free port; returns the process and its URL"""
+    server = os.path.join(os.path.dirname(os.path.abspath(__file__)), "api_server.py")
+    command = [sys.executable, server, "--port", "0", "--synthetic", str(seasons), "--seed", str(seed)]
+    # Pin the server to one core so the figure is per core
+    preexec = (lambda: os.sched_setaffinity(0, {min(os.sched_getaffinity(0))})) \
+        if hasattr(os, "sched_setaffinity") else None
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, preexec_fn=preexec)
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError("API server failed to start")
+    return process, line.split()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure requests per second of the league JSON API")
+    parser.add_argument("--url", default=DEFAULT_URL, help="server base URL")
+    parser.add_argument("--path", default="/table", help="request path including the query string")
+    parser.add_argument("--connections", type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS)
+    parser.add_argument("--etag", action="store_true", help="send If-None-Match to measure 304 responses")
+    parser.add_argument("--spawn", type=int, metavar="SEASONS",
+                        help="start a single-core server with generated seasons instead of using --url")
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if args.spawn:
+        process, url = spawn_server(args.spawn)
+    try:
+        result = asyncio.run(load_test(url, args.path, args.connections, args.seconds, args.etag))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latencies = result["latencies"]
+    print(f"GET {args.path} on {url}: {args.connections} connections for {result['seconds']:.1f}s")
+    print(f"  {result['requests']} requests, {result['requests'] / result['seconds']:,.0f} req/s")
+    print(f"  statuses   {dict(sorted(result['statuses'].items()))}")
+    print(f"  latency ms p50 {_percentile(latencies, 0.5) * 1000:.2f}  "
+          f"p99 {_percentile(latencies, 0.99) * 1000:.2f}  max {latencies[-1] * 1000 if latencies else 0:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
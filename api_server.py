@@ -0,0 +1,289 @@
+"""Read-only JSON API over the stored league state.
+
+A small asyncio HTTP/1.1 server (standard library only, keep-alive) for
+tools that want the league table, the Type A alerts and match predictions
+without scraping the dashboards:
+
+    GET /leagues
+    GET /table?league=english
+    GET /alerts?league=english
+    GET /predict?league=english&home=Palace&away=Wolves
+
+Each league is restored from its SQLite file on first use and reloaded
+when the storage version moves, checked at most every ``REFRESH_SECONDS``.
+Files are opened read-only (no schema creation, migration or backfill)
+and loaded into a fresh engine on a worker thread, so the event loop
+keeps serving the previous engine meanwhile.
+Encoded bodies are memoized on the league's engine, so each is built once
+per data version, on a worker thread; memoized bodies are served straight
+from the event loop. Every response carries a strong ETag and a matching
+``If-None-Match`` gets a 304 without a body or Content-Length.
+
+    python api_server.py --db league_data.db --port 8765
+    python api_server.py --synthetic 20           # serve generated seasons
+    python api_load_test.py --path /table --connections 32
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from league_analytics import get_type_a_alerts, league_table
+from league_registry import DEFAULT_LEAGUE, LeagueRegistry, league_db_path, new_engine
+from league_storage import LeagueStorage
+from match_predictor import match_prediction
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_DB_PATH = "league_data.db"
+REFRESH_SECONDS = 1.0
+# Largest request head accepted, in bytes
+MAX_HEADER_SIZE = 16384
+
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+# ============ PAYLOADS ============
+def table_payload(engine):
+    table = engine.cached(league_table)
+    return {"season": engine.season_number, "matches": len(engine.store), "table": table.to_dict(orient="records")}
+
+
+def alerts_payload(engine):
+    return {"season": engine.season_number, "matches": len(engine.store), "alerts": engine.cached(get_type_a_alerts)}
+
+
+def prediction_payload(engine, home_team, away_team):
+    return {
+        "season": engine.season_number,
+        "home": home_team,
+        "away": away_team,
+        "prediction": engine.cached(match_prediction, home_team, away_team),
+    }
+
+
+# Path -> (payload builder, required query parameters)
+ENDPOINTS = {
+    "/table": (table_payload, ()),
+    "/alerts": (alerts_payload, ()),
+    "/predict": (prediction_payload, ("home", "away")),
+}
+
+
+def _json_default(value):
+    # numpy scalars
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_json(payload):
+    """JSON body plus its strong ETag"""
+    body = json.dumps(payload, default=_json_default, ensure_ascii=False).encode("utf-8")
+    return body, '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def encoded_payload(engine, path, args):
+    """``encode_json`` of an endpoint's payload; memoized per data version"""
+    return encode_json(ENDPOINTS[path][0](engine, *args))
+
+
+def etag_matches(header, etag):
+    """Whether an ``If-None-Match`` header covers ``etag``"""
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+# ============ SERVICE ============
+class LeagueService:
+    """Per-league engines kept in step with their SQLite files"""
+
+    def __init__(self, db_path=DEFAULT_DB_PATH, leagues=None, status3_exact=False, refresh_seconds=REFRESH_SECONDS):
+        self.db_path = db_path
+        self.registry = LeagueRegistry(leagues, status3_exact)
+        self.refresh_seconds = refresh_seconds
+        self._storages = {}
+        self._versions = {}
+        self._checked = {}
+        self._reloading = set()
+        self.leagues_body = encode_json({
+            "leagues": [
+                {"key": key, "name": league["name"], "teams": league["teams"]}
+                for key, league in self.registry.leagues.items()
+            ]
+        })
+
+    def _load(self, league):
+        """``(version, engine)`` if the league's file has newer data, else None; blocking"""
+        storage = self._storages.get(league)
+        if storage is None:
+            path = league_db_path(self.db_path, league)
+            if not os.path.exists(path):
+                # Nothing stored yet; never create files from a read-only service
+                return None
+            storage = self._storages[league] = LeagueStorage(path, read_only=True)
+        version = storage.version()
+        if version == self._versions.get(league):
+            return None
+        engine = new_engine(self.registry.leagues[league], self.registry.status3_exact)
+        storage.load(engine)
+        return version, engine
+
+    async def engine(self, league):
+        """The league's engine, reloaded if its storage has newer data"""
+        if self.db_path is None or league in self._reloading:
+            return self.registry.engine(league)
+        now = time.monotonic()
+        if now - self._checked.get(league, float("-inf")) < self.refresh_seconds:
+            return self.registry.engine(league)
+        self._checked[league] = now
+        self._reloading.add(league)
+        try:
+            loaded = await asyncio.get_running_loop().run_in_executor(None, self._load, league)
+        finally:
+            self._reloading.discard(league)
+        if loaded is not None:
+            self._versions[league], engine = loaded
+            self.registry.replace(league, engine)
+        return self.registry.engine(league)
+
+    async def respond(self, method, target, headers):
+        """``(status, body, etag)`` for one request"""
+        if method not in ("GET", "HEAD"):
+            return (405, *encode_json({"error": "read-only API: use GET"}))
+        url = urlsplit(target)
+        query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+
+        if path in ("/", "/leagues"):
+            body, etag = self.leagues_body
+        else:
+            endpoint = ENDPOINTS.get(path)
+            if endpoint is None:
+                return (404, *encode_json({"error": f"unknown path {path}", "paths": ["/leagues", *ENDPOINTS]}))
+            league = query.get("league", DEFAULT_LEAGUE)
+            if league not in self.registry.leagues:
+                return (404, *encode_json({"error": f"unknown league {league!r}"}))
+            missing = [name for name in endpoint[1] if name not in query]
+            if missing:
+                return (400, *encode_json({"error": f"missing query parameter(s): {', '.join(missing)}"}))
+            args = tuple(query[name] for name in endpoint[1])
+            engine = await self.engine(league)
+            if path == "/predict":
+                unknown = [team for team in args if team not in engine.teams]
+                if unknown:
+                    return (400, *encode_json({"error": f"unknown team(s): {', '.join(unknown)}"}))
+                if args[0] == args[1]:
+                    return (400, *encode_json({"error": "home and away must differ"}))
+            encoded = engine.memoized(encoded_payload, path, args)
+            if encoded is None:
+                # Tables, alerts and predictions are built on a worker thread, off the event loop
+                encoded = await asyncio.get_running_loop().run_in_executor(
+                    None, engine.cached, encoded_payload, path, args
+                )
+            body, etag = encoded
+
+        if etag_matches(headers.get("if-none-match"), etag):
+            return 304, b"", etag
+        return 200, body, etag
+
+    # ============ HTTP ============
+    async def handle(self, reader, writer):
+        """Serve one keep-alive connection"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.LimitOverrunError:
+                    writer.write(_response(400, *encode_json({"error": "request head too large"}), False))
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, version = lines[0].split(" ")
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    writer.write(_response(400, *encode_json({"error": "malformed request"}), False))
+                    break
+                if length:
+                    await reader.readexactly(length)
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+                status, body, etag = await self.respond(method, target, headers)
+                writer.write(_response(status, body, etag, keep_alive, head_only=method == "HEAD"))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _response(status, body, etag, keep_alive, head_only=False):
+    """Encoded HTTP/1.1 response"""
+    lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json; charset=utf-8"]
+    if status != 304:
+        # A 304 has no body, and a Content-Length would describe the 200's
+        lines.append(f"Content-Length: {len(body)}")
+    lines += [
+        f"ETag: {etag}",
+        "Cache-Control: no-cache",
+        "Connection: " + ("keep-alive" if keep_alive else "close"),
+    ]
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head if head_only or status == 304 else head + body
+
+
+async def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    """Run the API until cancelled; ``ready(port)`` is called once listening"""
+    server = await asyncio.start_server(service.handle, host, port, limit=MAX_HEADER_SIZE)
+    async with server:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read-only JSON API for league tables, alerts and predictions")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help="SQLite file of the default league; other leagues use a suffixed file next to it")
+    parser.add_argument("--status3-exact", action="store_true", help="Status3 resets on exactly 3 goals")
+    parser.add_argument("--synthetic", type=int, metavar="SEASONS",
+                        help="serve generated seasons of the default league instead of a database")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        from synthetic_league import generate_matches
+
+        service = LeagueService(None, status3_exact=args.status3_exact)
+        service.registry.engine(DEFAULT_LEAGUE).ingest(generate_matches(args.synthetic, args.seed))
+    else:
+        service = LeagueService(args.db, status3_exact=args.status3_exact)
+
+    def ready(port):
+        print(f"Serving league API on http://{args.host}:{port}", flush=True)
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,203 @@
+"""Benchmark suite for the league pipeline on synthetic multi-season data.
+
+Times feed parsing, ingestion, alert generation, team metrics, predictions
+and exports at several league sizes and compares the results with a JSON
+baseline so regressions are visible:
+
+    python benchmark.py                      # 1, 10 and 100 seasons vs baseline
+    python benchmark.py --seasons 1 10 --repeat 5
+    python benchmark.py --save               # record a new baseline
+    python benchmark.py --check              # exit 1 on a regression
+    python benchmark.py --patterns 50        # vectorized vs looped patterns
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from feed_parser import clean_and_parse_matches
+from goal_model import fit_goal_model
+from league_analytics import (
+    calculate_historical_patterns, calculate_team_metrics, create_head_to_head_stats, get_type_a_alerts,
+)
+from league_engine import LeagueEngine, compute_pattern_stats, new_pattern_stats, update_pattern_stats
+from league_export import available_formats, encode_frame
+from match_predictor import fixture_predictions, predict_match_outcome
+from synthetic_league import generate_league
+
+DEFAULT_SEASONS = [1, 10, 100]
+DEFAULT_REPEAT = 3
+DEFAULT_SEED = 2024
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+# Slower than baseline by more than this factor counts as a regression
+DEFAULT_TOLERANCE = 1.5
+# Timings below this are too noisy to compare
+NOISE_FLOOR = 0.002
+
+
+def best_of(repeat, func, setup=None):
+    """Fastest wall time of ``repeat`` calls to ``func(setup())``"""
+    best = float("inf")
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        started = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _ingested(matches):
+    engine = LeagueEngine()
+    engine.ingest(matches)
+    return engine
+
+
+def benchmark_league(seasons, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED):
+    """Timings in seconds for every pipeline stage at one league size"""
+    matches, feed = generate_league(seasons, seed)
+    engine = _ingested(matches)
+    teams = sorted(engine.teams)
+    fixtures = [(home, away) for home in teams for away in teams if home != away]
+    model = fit_goal_model(engine)
+
+    def fresh_frame(_):
+        # Drop the cached frame so the build itself is timed
+        engine._frame_cache = {}
+        return engine.match_frame()
+
+    timings = {
+        "parse": best_of(repeat, lambda _: clean_and_parse_matches(feed)),
+        "ingest": best_of(repeat, lambda new_engine: new_engine.ingest(matches), LeagueEngine),
+        "historical_patterns": best_of(repeat, lambda _: calculate_historical_patterns(engine)),
+        "pattern_rebuild": best_of(repeat, lambda _: compute_pattern_stats(engine.store, engine.teams, engine.status3_exact)),
+        "type_a_alerts": best_of(repeat, lambda _: get_type_a_alerts(engine)),
+        "team_metrics": best_of(repeat, lambda _: calculate_team_metrics(engine)),
+        "goal_model": best_of(repeat, lambda _: fit_goal_model(engine)),
+        "predictions": best_of(
+            repeat, lambda _: [predict_match_outcome(home, away, goal_model=model) for home, away in fixtures]),
+        "fixture_matrix": best_of(repeat, lambda _: fixture_predictions(engine)),
+        "head_to_head": best_of(
+            repeat, lambda _: [create_head_to_head_stats(engine, home, away) for home, away in fixtures]),
+        "match_frame": best_of(repeat, fresh_frame),
+    }
+    frame = engine.match_frame()
+    for fmt in available_formats():
+        key = "export_" + fmt.lower().replace(" ", "_").replace("(", "").replace(")", "")
+        timings[key] = best_of(repeat, lambda _: encode_frame(frame, fmt))
+    return {"matches": len(matches), "timings": timings}
+
+
+def fold_pattern_stats(engine):
+    """Reference per-match Python fold over each team's history"""
+    pattern_stats = new_pattern_stats(engine.teams)
+    store = engine.store
+    totals = store.column("total_goals")
+    for team in engine.teams:
+        acc = pattern_stats[team]
+        for total_goals in totals[store.team_rows(team)].tolist():
+            update_pattern_stats(acc, total_goals, engine.status3_exact)
+    return pattern_stats
+
+
+def benchmark_patterns(seasons=50, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED):
+    """Looped vs vectorized pattern rebuild over the whole history"""
+    matches, _ = generate_league(seasons, seed)
+    engine = _ingested(matches)
+    if fold_pattern_stats(engine) != compute_pattern_stats(engine.store, engine.teams, engine.status3_exact):
+        raise AssertionError("vectorized pattern stats differ from the reference fold")
+    looped = best_of(repeat, lambda _: fold_pattern_stats(engine))
+    vectorized = best_of(repeat, lambda _: compute_pattern_stats(engine.store, engine.teams, engine.status3_exact))
+    return {"matches": len(matches), "looped": looped, "vectorized": vectorized, "speedup": looped / vectorized}
+
+
+def run_benchmarks(seasons_list=DEFAULT_SEASONS, repeat=DEFAULT_REPEAT, seed=DEFAULT_SEED, log=None):
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "seed": seed,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": {},
+    }
+    for seasons in seasons_list:
+        if log:
+            log(f"Benchmarking {seasons} season(s)...")
+        results["results"][str(seasons)] = benchmark_league(seasons, repeat, seed)
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Report lines plus the ``(seasons, stage, ratio)`` regressions"""
+    lines, regressions = [], []
+    for seasons, current in results["results"].items():
+        lines.append(f"\n{seasons} season(s), {current['matches']} matches")
+        lines.append(f"  {'stage':<22}{'seconds':>10}{'baseline':>10}{'ratio':>8}")
+        previous = baseline.get("results", {}).get(seasons, {}).get("timings", {}) if baseline else {}
+        for stage, seconds in current["timings"].items():
+            before = previous.get(stage)
+            if before is None:
+                lines.append(f"  {stage:<22}{seconds:>10.4f}{'-':>10}{'-':>8}")
+                continue
+            ratio = seconds / before if before > 0 else float("inf")
+            flag = ""
+            if ratio > tolerance and max(seconds, before) >= NOISE_FLOOR:
+                flag = "  REGRESSION"
+                regressions.append((seasons, stage, ratio))
+            lines.append(f"  {stage:<22}{seconds:>10.4f}{before:>10.4f}{ratio:>8.2f}{flag}")
+    return lines, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--seasons", type=int, nargs="+", default=DEFAULT_SEASONS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    parser.add_argument("--patterns", type=int, metavar="SEASONS",
+                        help="only compare looped and vectorized pattern rebuilds")
+    args = parser.parse_args(argv)
+
+    if args.patterns:
+        result = benchmark_patterns(args.patterns, args.repeat, args.seed)
+        print(f"{args.patterns} season(s), {result['matches']} matches")
+        print(f"  looped      {result['looped']:.4f}s")
+        print(f"  vectorized  {result['vectorized']:.4f}s")
+        print(f"  speedup     {result['speedup']:.1f}x")
+        return 0
+
+    results = run_benchmarks(args.seasons, args.repeat, args.seed, log=print)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    lines, regressions = compare(results, baseline, args.tolerance)
+    print("\n".join(lines))
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+            handle.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif regressions:
+        print(f"\n{len(regressions)} stage(s) slower than {args.tolerance}x baseline")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Bulk import of raw results feed files into a LeagueEngine.
+
+Files are streamed line by line through the feed parser and the parsed
+matches are ingested in fixed-size chunks, with an optional progress
+callback after every chunk.
+"""
+
+import io
+import os
+import re
+import time
+
+from feed_parser import FeedParser
+
+CHUNK_SIZE = 500
+
+
+def natural_key(name):
+    """Sort key that orders ``week2`` before ``week10``"""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def _source_name(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.basename(os.fspath(source))
+    return getattr(source, "name", "feed")
+
+
+def _source_size(source):
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    size = getattr(source, "size", None)
+    return size if size is not None else 0
+
+
+def _open_lines(source):
+    """Text line iterator over a path or an uploaded binary file"""
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, encoding="utf-8", errors="replace")
+    return io.TextIOWrapper(source, encoding="utf-8", errors="replace")
+
+
+def import_feeds(engine, sources, parser=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Parse and ingest several raw feed files in natural filename order.
+
+    ``sources`` are paths or binary file objects (e.g. Streamlit uploads).
+    Each file is one feed paste, so its matches are reversed to oldest
+    first before ingesting, and becomes one batch for the engine's undo.
+    ``progress(fraction, matches_done, elapsed)`` is called after every
+    ingested chunk.
+    """
+    parser = parser or FeedParser(engine.teams)
+    sources = sorted(sources, key=lambda source: natural_key(_source_name(source)))
+    total_size = sum(_source_size(source) for source in sources) or 1
+
+    summary = {"files": 0, "processed": 0, "errors": [], "completed_seasons": []}
+    started = time.perf_counter()
+    done_size = 0
+
+    for source in sources:
+        name = _source_name(source)
+        errors = []
+        with _open_lines(source) as lines:
+            matches = list(parser.matches(lines, errors))
+        matches.reverse()
+        summary["errors"].extend(f"{name}: {error}" for error in errors)
+
+        size = _source_size(source)
+        for start in range(0, len(matches), chunk_size):
+            chunk = matches[start:start + chunk_size]
+            # One undo batch per file
+            result = engine.ingest(chunk, new_batch=start == 0)
+            summary["processed"] += result["processed"]
+            summary["completed_seasons"].extend(result["completed_seasons"])
+            if progress is not None:
+                fraction = (done_size + size * (start + len(chunk)) / len(matches)) / total_size
+                progress(min(1.0, fraction), summary["processed"], time.perf_counter() - started)
+
+        done_size += size
+        summary["files"] += 1
+
+    summary["seconds"] = time.perf_counter() - started
+    return summary
+
+
+def import_new_feeds(engine, storage, sources, parser=None, progress=None):
+    """``import_feeds`` for the sources not yet recorded in ``storage``, then save.
+
+    The new file names are recorded in the same transaction as their
+    matches, so a file is never imported twice or recorded without them.
+    """
+    imported = set(storage.imported_feeds())
+    pending = [source for source in sources if _source_name(source) not in imported]
+    summary = import_feeds(engine, pending, parser, progress=progress)
+    if pending:
+        storage.save(engine, imported | {_source_name(source) for source in pending})
+    return summary
@@ -0,0 +1,218 @@
+"""Headless batch entry point for cron-driven ingestion and reporting.
+
+Uses the dashboards' feed parser, engine and SQLite storage without
+Streamlit:
+
+    python cli.py ingest feeds/                     # new feed files, then reports/
+    python cli.py ingest feeds/ --league spanish --formats CSV Parquet
+    python cli.py ingest feeds/ --db football2_league.db --status3-exact
+    python cli.py report --out /var/www/league
+    python cli.py ingest feeds/ --league all        # feeds/<league>/, one process per league
+
+Each feed file is imported once: its name is recorded in the league's
+database in the same transaction as its matches, so a cron job can keep
+pointing at a growing directory. Reports (alert list, league table, all
+matches, the current season and every fixture's prediction) are replaced
+atomically. With ``--league all`` every league with a ``<directory>/<league>``
+folder is imported in its own process and each league's reports go to
+``<out>/<league>``. The heavy modules are imported only once a command runs, so
+``--help`` and argument errors return immediately.
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+import time
+
+DEFAULT_DB_PATH = "league_data.db"
+DEFAULT_LEAGUE = "english"
+DEFAULT_OUT = "reports"
+DEFAULT_PATTERN = "*.txt"
+ALL_LEAGUES = "all"
+
+
+def feed_files(directory, pattern=DEFAULT_PATTERN):
+    """Feed file paths in ``directory`` whose names match ``pattern``"""
+    return [
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if fnmatch.fnmatch(name, pattern) and os.path.isfile(os.path.join(directory, name))
+    ]
+
+
+def league_entries(args):
+    """League definitions from ``--leagues`` or the default file"""
+    from league_registry import load_leagues
+
+    leagues = load_leagues(args.leagues) if args.leagues else load_leagues()
+    if args.league != ALL_LEAGUES and args.league not in leagues:
+        raise SystemExit(f"Unknown league {args.league!r} (known: {', '.join(leagues)})")
+    return leagues
+
+
+def open_league(args, key=None, read_only=None):
+    """League entry, engine restored from its database, and the storage.
+
+    Reports only read the database (``read_only`` defaults to the report
+    command), and a missing file is an error rather than a new empty league.
+    """
+    from league_registry import league_db_path, new_engine
+    from league_storage import LeagueStorage
+
+    key = key or args.league
+    read_only = args.command == "report" if read_only is None else read_only
+    league = league_entries(args)[key]
+    path = league_db_path(args.db, key)
+    if read_only and not os.path.isfile(path):
+        raise SystemExit(f"No league database at {path}")
+    engine = new_engine(league, args.status3_exact)
+    storage = LeagueStorage(path, read_only=read_only)
+    storage.load(engine)
+    return league, engine, storage
+
+
+def ingest_new_feeds(league, engine, storage, directory, pattern=DEFAULT_PATTERN):
+    """Import the feed files not seen before and save; returns the import summary"""
+    from bulk_import import import_new_feeds
+    from league_registry import new_parser
+
+    return import_new_feeds(engine, storage, feed_files(directory, pattern), new_parser(league))
+
+
+def print_summary(league, engine, summary, strict):
+    """Report one league's import; returns the exit status"""
+    for error in summary["errors"]:
+        print(error, file=sys.stderr)
+    for season_number, team in summary["completed_seasons"]:
+        print(f"Season {season_number} completed ({team} reached {engine.season_length} matches)")
+    print(f"{league['name']}: imported {summary['processed']} matches from {summary['files']} new file(s)")
+    return 1 if summary["errors"] and strict else 0
+
+
+def write_reports(engine, out, formats):
+    """Write the alert list, league table and match exports; returns the paths"""
+    from league_export import alerts_export, export_file_name, match_export, predictions_export, table_export
+
+    os.makedirs(out, exist_ok=True)
+    season = engine.season_number
+    reports = {
+        "alerts": lambda fmt: alerts_export(engine, fmt),
+        "league_table": lambda fmt: table_export(engine, fmt),
+        "matches": lambda fmt: match_export(engine, fmt),
+        f"season_{season}_matches": lambda fmt: match_export(engine, fmt, season),
+        "fixture_predictions": lambda fmt: predictions_export(engine, fmt),
+    }
+    written = []
+    for stem, build in reports.items():
+        for fmt in formats:
+            path = os.path.join(out, export_file_name(stem, fmt))
+            # Replace in one step so readers never see a half-written report
+            with open(path + ".tmp", "wb") as handle:
+                handle.write(build(fmt))
+            os.replace(path + ".tmp", path)
+            written.append(path)
+    return written
+
+
+def run(args):
+    from league_export import available_formats
+
+    unknown = [fmt for fmt in args.formats if fmt not in available_formats()]
+    if unknown:
+        raise SystemExit(f"Unavailable export format(s): {', '.join(unknown)} "
+                         f"(available: {', '.join(available_formats())})")
+
+    if args.league == ALL_LEAGUES:
+        return run_all(args)
+
+    started = time.perf_counter()
+    league, engine, storage = open_league(args)
+    status = 0
+    try:
+        if args.command == "ingest":
+            summary = ingest_new_feeds(league, engine, storage, args.directory, args.pattern)
+            status = print_summary(league, engine, summary, args.strict)
+        if not args.no_reports:
+            written = write_reports(engine, args.out, args.formats)
+            print(f"Wrote {len(written)} report file(s) to {args.out}")
+    finally:
+        storage.close()
+    print(f"Season {engine.season_number}, {len(engine.store)} matches in total "
+          f"({time.perf_counter() - started:.2f}s)")
+    return status
+
+
+def run_all(args):
+    """``run`` for every league: one import process per league, then each league's reports"""
+    from league_registry import import_leagues, league_db_path
+
+    started = time.perf_counter()
+    leagues = league_entries(args)
+    status = 0
+    if args.command == "ingest":
+        sources = {
+            key: feed_files(os.path.join(args.directory, key), args.pattern)
+            for key in leagues if os.path.isdir(os.path.join(args.directory, key))
+        }
+        summaries = import_leagues(sources, args.db, leagues, args.status3_exact, args.workers)
+    stored = [key for key in leagues if os.path.isfile(league_db_path(args.db, key))]
+    if not stored:
+        raise SystemExit(f"No league database next to {args.db}")
+    for key in stored:
+        league = leagues[key]
+        # The imports are saved already; reports only read
+        _, engine, storage = open_league(args, key, read_only=True)
+        storage.close()
+        if args.command == "ingest" and key in summaries:
+            status = max(status, print_summary(league, engine, summaries[key], args.strict))
+        if not args.no_reports:
+            written = write_reports(engine, os.path.join(args.out, key), args.formats)
+            print(f"Wrote {len(written)} report file(s) to {os.path.join(args.out, key)}")
+    print(f"{len(leagues)} leagues ({time.perf_counter() - started:.2f}s)")
+    return status
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Ingest raw result feeds and write league reports without the dashboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", default=DEFAULT_DB_PATH,
+                        help="SQLite file of the default league; other leagues use a suffixed file next to it")
+    common.add_argument("--league", default=DEFAULT_LEAGUE,
+                        help=f"league key from the registry, or '{ALL_LEAGUES}' for every league")
+    common.add_argument("--leagues", help="league definitions file (default: leagues.json)")
+    common.add_argument("--status3-exact", action="store_true",
+                        help="Status3 resets on exactly 3 goals (football2.py's rule)")
+    common.add_argument("--out", default=DEFAULT_OUT, help="report directory")
+    common.add_argument("--formats", nargs="+", default=["CSV"], metavar="FORMAT",
+                        help="export formats: CSV, 'CSV (gzip)', Parquet")
+    common.add_argument("--no-reports", action="store_true", help="only update the stored state")
+
+    ingest = commands.add_parser("ingest", parents=[common], help="import new feed files, then write reports")
+    ingest.add_argument("directory", help="directory of raw feed files")
+    ingest.add_argument("--pattern", default=DEFAULT_PATTERN, help="feed file name pattern")
+    ingest.add_argument("--strict", action="store_true", help="exit with status 1 on feed parsing errors")
+    ingest.add_argument("--workers", type=int, default=None,
+                        help=f"import processes with --league {ALL_LEAGUES} (default: one per CPU)")
+
+    commands.add_parser("report", parents=[common], help="write reports from the stored state")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "ingest" and not os.path.isdir(args.directory):
+        raise SystemExit(f"Not a directory: {args.directory}")
+    from league_storage import StaleEngineError
+
+    try:
+        return run(args)
+    except StaleEngineError as error:
+        # Another import or a dashboard saved first; nothing of this run was written
+        raise SystemExit(str(error))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
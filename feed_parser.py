@@ -0,0 +1,138 @@
+"""Streaming parser for the raw "<League> WEEK nn" results feeds.
+
+Each line is classified exactly once: an exact team name, a score, a header
+or timestamp line to skip, or free text that may embed a team name. Team
+names inside free text are found with a single regex compiled from a trie of
+the valid names, so the lookup cost does not grow with the number of teams.
+"""
+
+import re
+
+from league_engine import VALID_TEAMS
+
+MAX_SCORE = 20
+
+DEFAULT_HEADER = "English League"
+
+
+def skip_pattern(header=DEFAULT_HEADER):
+    """Headers, kick-off times, feed ids and long numeric ids of a league's feed"""
+    return re.compile(
+        r"WEEK \d+"
+        r"|" + re.escape(header) +
+        r"|\d{1,2}:\d{2}\s*(?:am|pm)"
+        r"|#\d+"
+        r"|^\d{8,}$",
+        re.IGNORECASE,
+    )
+
+
+SKIP_PATTERN = skip_pattern()
+
+
+def _trie_pattern(words):
+    """Regex source matching any of ``words``, factored on shared prefixes"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # Greedy optional group keeps the longest name at each position
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class FeedParser:
+    """Precompiled tokenizer and match assembler for one league's teams and header"""
+
+    def __init__(self, teams=VALID_TEAMS, max_score=MAX_SCORE, header=DEFAULT_HEADER):
+        self.teams = frozenset(teams)
+        self.max_score = max_score
+        self._skip = skip_pattern(header).search
+        self._find_team = re.compile(_trie_pattern(self.teams)).search
+
+    def tokens(self, lines):
+        """Yield the cleaned team-name and score tokens from raw lines"""
+        teams = self.teams
+        max_score = self.max_score
+        skip = self._skip
+        find_team = self._find_team
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            if line in teams:
+                yield line
+            elif line.isdecimal() and int(line) <= max_score:
+                yield line
+            elif not skip(line):
+                found = find_team(line)
+                if found:
+                    yield found.group()
+
+    def matches(self, lines, errors=None, cleaned=None):
+        """Yield ``[home, home_score, away_score, away]`` in feed order.
+
+        Problems are appended to ``errors`` and the cleaned tokens to
+        ``cleaned`` when those lists are given.
+        """
+        teams = self.teams
+        position = 0
+        group = []
+        for token in self.tokens(lines):
+            if cleaned is not None:
+                cleaned.append(token)
+            group.append(token)
+            if len(group) < 4:
+                continue
+
+            home_team, home_score_raw, away_score_raw, away_team = group
+            group = []
+            position += 4
+
+            valid = True
+            if home_team not in teams:
+                valid = False
+                if errors is not None:
+                    errors.append(f"Invalid home team: {home_team}")
+            if away_team not in teams:
+                valid = False
+                if errors is not None:
+                    errors.append(f"Invalid away team: {away_team}")
+            if not home_score_raw.isdecimal():
+                valid = False
+                if errors is not None:
+                    errors.append(f"Non-numeric home score: {home_score_raw}")
+            if not away_score_raw.isdecimal():
+                valid = False
+                if errors is not None:
+                    errors.append(f"Non-numeric away score: {away_score_raw}")
+
+            if valid:
+                yield [home_team, int(home_score_raw), int(away_score_raw), away_team]
+
+        if group and errors is not None:
+            errors.append(f"Incomplete match at position {position + 1}")
+
+
+_default_parser = FeedParser()
+
+
+def clean_and_parse_matches(text: str, parser=None):
+    """Clean messy input data and parse matches"""
+    parser = parser or _default_parser
+    errors, cleaned_lines = [], []
+    matches = list(parser.matches(text.splitlines(), errors, cleaned_lines))
+    # The feed lists the newest result first
+    matches.reverse()
+    return matches, errors, cleaned_lines
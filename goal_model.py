@@ -0,0 +1,202 @@
+"""Attack/defence Poisson goal model fitted on the match log.
+
+Home goals are Poisson with rate ``home * attack[home] * defence[away]``
+and away goals with rate ``attack[away] * defence[home]`` (Maher's model).
+``defence`` is a team's goals-conceded factor, so higher means weaker.
+The ratings are the weighted maximum-likelihood fit, found with
+vectorized fixed-point updates. Older matches are down-weighted
+exponentially. Every team is shrunk toward the league average by a few
+pseudo-matches so short histories stay sane.
+
+The optional Dixon-Coles term ``rho`` corrects the 0-0, 1-0, 0-1 and 1-1
+scorelines, which independent Poissons get wrong. It is fitted by a
+vectorized grid search of its likelihood. Predictions come from the full
+scoreline probability matrix, so 1X2, over/under and both-teams-to-score
+are consistent with each other.
+"""
+
+import numpy as np
+
+MAX_GOALS = 10  # Scoreline matrix covers 0..MAX_GOALS goals per side
+PRIOR_MATCHES = 4  # Pseudo-matches of league-average play per team
+FIT_TOLERANCE = 1e-6
+MIN_RATE = 1e-9  # Floor on scoring rates so the Poisson log stays finite
+MAX_ITERATIONS = 200
+RHO_GRID = np.linspace(-0.25, 0.25, 101)
+
+# Rates used before any match is logged
+DEFAULT_HOME_RATE = 1.5
+DEFAULT_AWAY_RATE = 1.2
+
+_GOALS = np.arange(MAX_GOALS + 1)
+_LOG_FACTORIAL = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, MAX_GOALS + 1)))])
+_HOME_GOALS, _AWAY_GOALS = np.meshgrid(_GOALS, _GOALS, indexing="ij")
+_TOTALS = _HOME_GOALS + _AWAY_GOALS
+
+# Market -> weight of each scoreline; one matrix product prices them all
+_MARKETS = {
+    "home_win": _HOME_GOALS > _AWAY_GOALS,
+    "draw": _HOME_GOALS == _AWAY_GOALS,
+    "away_win": _HOME_GOALS < _AWAY_GOALS,
+    "over_2_5": _TOTALS > 2,
+    "over_3_5": _TOTALS > 3,
+    "over_4_5": _TOTALS > 4,
+    "both_teams_score": (_HOME_GOALS > 0) & (_AWAY_GOALS > 0),
+    "home_goals": _HOME_GOALS,
+    "away_goals": _AWAY_GOALS,
+}
+_MARKET_WEIGHTS = np.column_stack([weights.ravel() for weights in _MARKETS.values()]).astype(np.float64)
+
+
+def default_half_life(engine):
+    """Half-life of a match's weight: one season's worth of matches"""
+    return max(1, engine.season_length * len(engine.teams) // 2)
+
+
+def _default_rates(model):
+    """``model`` with every team at the default home and away rates"""
+    model["home"] = DEFAULT_HOME_RATE / DEFAULT_AWAY_RATE
+    return model
+
+
+def _dixon_coles_rho(home_rate, away_rate, home_goals, away_goals, weights):
+    """Weighted maximum-likelihood ``rho`` over ``RHO_GRID``"""
+    low = (home_goals <= 1) & (away_goals <= 1)
+    if not low.any():
+        return 0.0
+    lam, mu = home_rate[low, None], away_rate[low, None]
+    h, a = home_goals[low, None], away_goals[low, None]
+    rho = RHO_GRID[None, :]
+    tau = np.where(
+        (h == 0) & (a == 0), 1 - lam * mu * rho,
+        np.where((h == 0) & (a == 1), 1 + lam * rho,
+                 np.where((h == 1) & (a == 0), 1 + mu * rho, 1 - rho)),
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        loglik = np.where(tau > 0, np.log(tau), -np.inf)
+    score = (weights[low, None] * loglik).sum(axis=0)
+    return float(RHO_GRID[int(np.argmax(score))])
+
+
+def fit_goal_model(engine, half_life=None, dixon_coles=True):
+    """Team ratings, home factor and ``rho`` fitted on the engine's match log.
+
+    ``half_life`` is in matches (a season's worth by default). The result
+    is a plain dict and is cheap to memoize with ``engine.cached``.
+    """
+    store = engine.store
+    teams = store.teams
+    size = len(teams)
+    model = {
+        "teams": teams,
+        "index": dict(store.team_codes),
+        "attack": np.ones(size),
+        "defence": np.ones(size),
+        "home": 1.0,
+        "base": DEFAULT_AWAY_RATE,
+        "rho": 0.0,
+        "matches": len(store),
+    }
+    if len(store) == 0:
+        return _default_rates(model)
+
+    home = store.column("home").astype(np.intp)
+    away = store.column("away").astype(np.intp)
+    home_goals = store.column("home_score").astype(np.float64)
+    away_goals = store.column("away_score").astype(np.float64)
+    half_life = half_life or default_half_life(engine)
+    age = np.arange(len(store) - 1, -1, -1)
+    weights = 0.5 ** (age / half_life)
+
+    def per_team(index, values):
+        return np.bincount(index, weights=values, minlength=size)
+
+    # Goals scored and conceded per team, each weighted
+    scored = per_team(home, weights * home_goals) + per_team(away, weights * away_goals)
+    conceded = per_team(away, weights * home_goals) + per_team(home, weights * away_goals)
+    # Shrink every team toward average with PRIOR_MATCHES of mean scoring
+    mean_goals = (weights * (home_goals + away_goals)).sum() / (2 * weights.sum())
+    if not np.isfinite(mean_goals) or mean_goals <= 0:
+        # Only goalless draws: nothing to rate teams by
+        return _default_rates(model)
+    prior = PRIOR_MATCHES * mean_goals
+    total_home_goals = (weights * home_goals).sum()
+
+    attack = np.ones(size)
+    defence = np.full(size, mean_goals)
+    home_factor = 1.0
+    for _ in range(MAX_ITERATIONS):
+        home_exposure = weights * home_factor
+        # Expected goals per unit of a team's attack, then per unit of its defence
+        attack_exposure = per_team(home, home_exposure * defence[away]) + per_team(away, weights * defence[home])
+        new_attack = (scored + prior) / (attack_exposure + PRIOR_MATCHES * defence.mean())
+        new_attack /= new_attack.mean()
+        defence_exposure = per_team(away, home_exposure * new_attack[home]) + per_team(home, weights * new_attack[away])
+        new_defence = (conceded + prior) / (defence_exposure + prior / mean_goals)
+        home_factor = total_home_goals / (weights * new_attack[home] * new_defence[away]).sum()
+        change = max(np.abs(new_attack - attack).max(), np.abs(new_defence - defence).max() / mean_goals)
+        attack, defence = new_attack, new_defence
+        if change < FIT_TOLERANCE:
+            break
+
+    model["attack"] = attack
+    # Fold the scale into ``base`` so defence is a relative factor around 1
+    scale = defence.mean()
+    model["defence"] = defence / scale
+    model["base"] = float(scale)
+    model["home"] = float(home_factor)
+    if dixon_coles:
+        home_rate = home_factor * attack[home] * defence[away]
+        away_rate = attack[away] * defence[home]
+        model["rho"] = _dixon_coles_rho(home_rate, away_rate, home_goals, away_goals, weights)
+    return model
+
+
+def expected_goals(model, home_teams, away_teams):
+    """Home and away scoring rates for arrays of fixtures"""
+    index = model["index"]
+    home = np.array([index[team] for team in home_teams], dtype=np.intp)
+    away = np.array([index[team] for team in away_teams], dtype=np.intp)
+    attack, defence, base = model["attack"], model["defence"], model["base"]
+    home_rate = base * model["home"] * attack[home] * defence[away]
+    away_rate = base * attack[away] * defence[home]
+    return home_rate, away_rate
+
+
+def _poisson_pmf(rates):
+    """``(n, MAX_GOALS + 1)`` Poisson probabilities of 0..MAX_GOALS goals"""
+    # A zero rate (e.g. no home goals logged yet) would give 0 * log(0)
+    rates = np.maximum(np.asarray(rates, dtype=np.float64), MIN_RATE)[:, None]
+    return np.exp(_GOALS * np.log(rates) - rates - _LOG_FACTORIAL)
+
+
+def score_matrices(model, home_teams, away_teams):
+    """``(n, G, G)`` scoreline probabilities, home goals on the first axis"""
+    home_rate, away_rate = expected_goals(model, home_teams, away_teams)
+    matrices = _poisson_pmf(home_rate)[:, :, None] * _poisson_pmf(away_rate)[:, None, :]
+    rho = model["rho"]
+    if rho:
+        # Clipped at zero for extreme rates, where the correction breaks down
+        matrices[:, 0, 0] *= np.maximum(0, 1 - home_rate * away_rate * rho)
+        matrices[:, 0, 1] *= np.maximum(0, 1 + home_rate * rho)
+        matrices[:, 1, 0] *= np.maximum(0, 1 + away_rate * rho)
+        matrices[:, 1, 1] *= 1 - rho
+    # Scores above MAX_GOALS are dropped; renormalize what is left
+    matrices /= matrices.sum(axis=(1, 2), keepdims=True)
+    return matrices
+
+
+def score_matrix(model, home_team, away_team):
+    """Scoreline probability matrix of one fixture"""
+    return score_matrices(model, [home_team], [away_team])[0]
+
+
+def market_probabilities(matrices):
+    """1X2, over/under, both-teams-to-score and expected goals per matrix"""
+    flat = matrices.reshape(len(matrices), -1)
+    values = flat @ _MARKET_WEIGHTS
+    markets = {name: values[:, column] for column, name in enumerate(_MARKETS)}
+    best = flat.argmax(axis=1)
+    markets["likely_home_score"] = best // (MAX_GOALS + 1)
+    markets["likely_away_score"] = best % (MAX_GOALS + 1)
+    return markets
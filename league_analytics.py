@@ -0,0 +1,257 @@
+"""Derived league analytics shared by the dashboards.
+
+Every function takes a LeagueEngine. Match-log scans go through the
+store's per-team row indexes, while head-to-head records and the counter
+patterns behind Type A alerts come from aggregates the engine updates on
+ingest.
+"""
+
+import numpy as np
+import pandas as pd
+
+from league_engine import (
+    F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD, PAIR_FIELDS, S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD,
+)
+
+
+LEAGUE_TABLE_COLUMNS = ["Pos", "Team", "P", "W", "D", "L", "GF", "GA", "GD", "Pts", "Elo", "Form"]
+
+
+def league_table(engine, empty_form=""):
+    """Current league table as a display DataFrame"""
+    table_data = []
+    for pos, (team, stats) in enumerate(engine.calculate_rankings(), 1):
+        table_data.append([
+            pos, team, stats["P"], stats["W"], stats["D"], stats["L"],
+            stats["GF"], stats["GA"], stats["GD"], stats["Pts"], round(engine.elo[team], 1),
+            " ".join(stats["Form"][-5:]) if stats["Form"] else empty_form
+        ])
+    return pd.DataFrame(table_data, columns=LEAGUE_TABLE_COLUMNS)
+
+
+def calculate_team_metrics(engine):
+    """Calculate detailed metrics for each team"""
+    metrics = {}
+
+    store = engine.store
+    home_scores = store.column("home_score")
+    away_scores = store.column("away_score")
+
+    for team in engine.teams:
+        stats = engine.team_stats[team]
+
+        total_matches = stats["P"]
+        win_rate = (stats["W"] / total_matches * 100) if total_matches > 0 else 0
+        draw_rate = (stats["D"] / total_matches * 100) if total_matches > 0 else 0
+        loss_rate = (stats["L"] / total_matches * 100) if total_matches > 0 else 0
+
+        avg_gf = stats["GF"] / total_matches if total_matches > 0 else 0
+        avg_ga = stats["GA"] / total_matches if total_matches > 0 else 0
+
+        # Actual Both Teams Scored count from match data
+        rows = store.team_rows(team)
+        bts_matches = int(np.count_nonzero((home_scores[rows] > 0) & (away_scores[rows] > 0)))
+
+        bts_rate = (bts_matches / total_matches * 100) if total_matches > 0 else 0
+
+        metrics[team] = {
+            "win_rate": round(win_rate, 1),
+            "draw_rate": round(draw_rate, 1),
+            "loss_rate": round(loss_rate, 1),
+            "avg_gf": round(avg_gf, 2),
+            "avg_ga": round(avg_ga, 2),
+            "bts_rate": round(bts_rate, 1),
+            "form": stats["Form"][-5:] if len(stats["Form"]) >= 5 else stats["Form"],
+            "points_per_game": round(stats["Pts"] / total_matches, 2) if total_matches > 0 else 0,
+            # Carried across seasons, unlike the rates above
+            "elo": round(engine.elo[team], 1),
+        }
+
+    return metrics
+
+
+def pattern_summary(acc):
+    """Historical counter pattern of one team from its pattern accumulator"""
+    total_matches = acc["matches"]
+
+    if total_matches < 3:
+        return {
+            "avg_f4_before_reset": 0,
+            "max_f4_counter": 0,
+            "avg_s3_before_reset": 0,
+            "max_s3_counter": 0,
+            "f4_hit_rate": 0,
+            "s3_hit_rate": 0,
+            "total_matches": total_matches
+        }
+
+    avg_f4 = acc["f4_gap_total"] / acc["f4_hits"] if acc["f4_hits"] else 0
+    avg_s3 = acc["s3_gap_total"] / acc["s3_hits"] if acc["s3_hits"] else 0
+
+    return {
+        "avg_f4_before_reset": round(avg_f4, 1),
+        "max_f4_counter": acc["f4_max"],
+        "avg_s3_before_reset": round(avg_s3, 1),
+        "max_s3_counter": acc["s3_max"],
+        "f4_hit_rate": round(acc["f4_hits"] / total_matches * 100, 1),
+        "s3_hit_rate": round(acc["s3_hits"] / total_matches * 100, 1),
+        "total_matches": total_matches
+    }
+
+
+def calculate_historical_patterns(engine):
+    """Calculate historical patterns for each team's counter behavior"""
+    return {team: pattern_summary(engine.pattern_stats[team]) for team in engine.teams}
+
+
+# Alert kind -> (pattern average key, scale, ceiling, floor, probability without history)
+ALERT_PROBABILITY_RULES = {
+    "f4_critical": ("avg_f4_before_reset", 85, 95, 10, 90),
+    "f4_warning": ("avg_f4_before_reset", 75, 90, 15, 70),
+    "s3_critical": ("avg_s3_before_reset", 80, 95, 10, 85),
+    "s3_warning": ("avg_s3_before_reset", 70, 90, 15, 65),
+}
+
+# Matches within which each alert message says the reset should happen
+ALERT_HORIZONS = {"f4_critical": 1, "f4_warning": 3, "s3_critical": 1, "s3_warning": 2}
+
+
+def alert_kind(counter, alert_threshold, critical_threshold, prefix):
+    """``"<prefix>_critical"``, ``"<prefix>_warning"`` or None for a counter"""
+    if counter >= critical_threshold:
+        return prefix + "_critical"
+    if counter >= alert_threshold:
+        return prefix + "_warning"
+    return None
+
+
+def alert_probability(kind, counter, avg_between):
+    """Claimed hit probability (%) shown in a Type A alert message"""
+    _, scale, ceiling, floor, default = ALERT_PROBABILITY_RULES[kind]
+    if avg_between > 0:
+        return max(floor, min(ceiling, (counter / avg_between) * scale))
+    return default
+
+
+def get_type_a_alerts(engine):
+    """Get Type A alerts for all teams"""
+    alerts = {
+        "f4_critical": [],
+        "f4_warning": [],
+        "s3_critical": [],
+        "s3_warning": []
+    }
+
+    patterns = calculate_historical_patterns(engine)
+
+    for team in engine.teams:
+        f4_counter = engine.ha_counters[team]
+        s3_counter = engine.status3_counters[team]
+        pattern = patterns[team]
+
+        # F!=4HA Alerts
+        kind = alert_kind(f4_counter, F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD, "f4")
+        if kind:
+            probability = round(alert_probability(kind, f4_counter, pattern['avg_f4_before_reset']))
+            if kind == "f4_critical":
+                message = f"🔴 **{team}**: F!=4HA counter = **{f4_counter}** (EXCEEDED {F4_CRITICAL_THRESHOLD} LIMIT!) | Historical: Hits 4 goals within next match **{probability}%** of time"
+            else:
+                message = f"⚠️ **{team}**: F!=4HA counter = **{f4_counter}** | Historical: Hits 4 goals within next 3 matches **{probability}%** of time"
+            alerts[kind].append({
+                "team": team,
+                "counter": f4_counter,
+                "probability": probability,
+                "avg_between": pattern['avg_f4_before_reset'],
+                "message": message
+            })
+
+        # Status3 Alerts
+        kind = alert_kind(s3_counter, S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD, "s3")
+        if kind:
+            probability = round(alert_probability(kind, s3_counter, pattern['avg_s3_before_reset']))
+            if kind == "s3_critical":
+                message = f"🔥 **{team}**: Status3 counter = **{s3_counter}** (EXCEEDED {S3_CRITICAL_THRESHOLD} LIMIT!) | Historical: Hits 3+ goals within next match **{probability}%** of time"
+            else:
+                message = f"🎯 **{team}**: Status3 counter = **{s3_counter}** | Historical: Hits 3+ goals within next 2 matches **{probability}%** of time"
+            alerts[kind].append({
+                "team": team,
+                "counter": s3_counter,
+                "probability": probability,
+                "avg_between": pattern['avg_s3_before_reset'],
+                "message": message
+            })
+
+    # Sort by counter value (highest first)
+    for key in alerts:
+        alerts[key].sort(key=lambda x: x["counter"], reverse=True)
+
+    return alerts
+
+
+ALERT_LIST_COLUMNS = ["kind", "team", "counter", "probability", "avg_between", "horizon", "message"]
+
+
+def alert_list(engine):
+    """Current Type A alerts as one DataFrame, most urgent first"""
+    alerts = engine.cached(get_type_a_alerts)
+    rows = [
+        [kind, alert["team"], alert["counter"], alert["probability"], alert["avg_between"],
+         ALERT_HORIZONS[kind], alert["message"].replace("**", "")]
+        for kind in ("f4_critical", "s3_critical", "f4_warning", "s3_warning")
+        for alert in alerts[kind]
+    ]
+    return pd.DataFrame(rows, columns=ALERT_LIST_COLUMNS)
+
+
+def create_head_to_head_stats(engine, home_team, away_team):
+    """Head-to-head statistics over every season, read from the pair counters"""
+    codes = engine.store.team_codes
+    team, opponent = codes[home_team], codes[away_team]
+    # Either venue: the fixture as selected plus the reverse fixture
+    hosted = dict(zip(PAIR_FIELDS, engine.pair_stats[:, team, opponent].tolist()))
+    visited = dict(zip(PAIR_FIELDS, engine.pair_stats[:, opponent, team].tolist()))
+    total_matches = hosted["matches"] + visited["matches"]
+    if total_matches == 0:
+        return None
+
+    stats = {
+        "total_matches": total_matches,
+        "home_wins": hosted["host_wins"] + visited["visitor_wins"],
+        "away_wins": hosted["visitor_wins"] + visited["host_wins"],
+        "draws": hosted["draws"] + visited["draws"],
+        "avg_goals": round((hosted["goals"] + visited["goals"]) / total_matches, 2),
+        "over_2_5": hosted["over_2_5"] + visited["over_2_5"],
+        "over_3_5": hosted["over_3_5"] + visited["over_3_5"],
+        "both_teams_score": hosted["both_teams_score"] + visited["both_teams_score"],
+    }
+    stats["over_2_5_pct"] = round(stats["over_2_5"] / total_matches * 100, 1)
+    stats["over_3_5_pct"] = round(stats["over_3_5"] / total_matches * 100, 1)
+    stats["both_teams_score_pct"] = round(stats["both_teams_score"] / total_matches * 100, 1)
+
+    return stats
+
+
+# Stat -> counter of the selected team's fixtures plus counter of the reverse fixtures
+HEAD_TO_HEAD_STATS = {
+    "matches": ("matches", "matches"),
+    "wins": ("host_wins", "visitor_wins"),
+    "losses": ("visitor_wins", "host_wins"),
+    "draws": ("draws", "draws"),
+    "goals": ("goals", "goals"),
+    "over_2_5": ("over_2_5", "over_2_5"),
+    "over_3_5": ("over_3_5", "over_3_5"),
+    "both_teams_score": ("both_teams_score", "both_teams_score"),
+}
+
+
+def head_to_head_matrix(engine, stat="wins"):
+    """One head-to-head count for every pairing at once, either venue.
+
+    Rows are the team, columns the opponent; ``wins`` counts the row
+    team's wins against the column team.
+    """
+    hosted, visited = HEAD_TO_HEAD_STATS[stat]
+    pair_stats = engine.pair_stats
+    counts = pair_stats[PAIR_FIELDS.index(hosted)] + pair_stats[PAIR_FIELDS.index(visited)].T
+    teams = engine.store.teams
+    return pd.DataFrame(counts, index=pd.Index(teams, name="Team"), columns=pd.Index(teams, name="Opponent"))
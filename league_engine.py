@@ -0,0 +1,977 @@
+"""Headless league engine shared by the dashboards.
+
+Owns the team stats, the F!=4HA / Status3 counters, the Elo ratings and the
+match log, and applies parsed results in one batch call so large backfills
+never go through Streamlit reruns.
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from match_store import (
+    MatchStore, RESULT_HOME_WIN, RESULT_DRAW, RESULT_AWAY_WIN, RESULT_LABELS,
+)
+
+# Allowed team names (case-sensitive)
+VALID_TEAMS = {
+    "Leeds", "Aston V", "Manchester Blue", "Liverpool", "London Blues", "Everton",
+    "Brighton", "Sheffield U", "Tottenham", "Palace", "Newcastle", "West Ham",
+    "Leicester", "West Brom", "Burnley", "London Reds", "Southampton", "Wolves",
+    "Fulham", "Manchester Reds"
+}
+
+# ============ COUNTER ALERT SETTINGS ============
+F4_ALERT_THRESHOLD = 8  # Warn when F!=4HA counter reaches 8
+F4_CRITICAL_THRESHOLD = 10  # Critical alert when reaches 10
+S3_ALERT_THRESHOLD = 7  # Warn when Status3 counter reaches 7
+S3_CRITICAL_THRESHOLD = 9  # Critical alert when reaches 9
+
+SEASON_LENGTH = 38  # Matches per team before the league resets (20-team double round robin)
+
+# ============ ELO SETTINGS ============
+ELO_START = 1500.0  # Rating of a team before its first match
+ELO_K = 20.0  # Rating points at stake in a one-goal result
+ELO_HOME_ADVANTAGE = 60.0  # Rating points added to the home side's expectation
+
+SNAPSHOT_INTERVAL = 500  # Matches between periodic state snapshots
+
+# Derived views kept per data version before the least recently used is dropped
+MEMO_SIZE = 128
+
+MATCH_COLUMNS = [
+    "Match_ID", "Home_Team", "Home_Score", "Away_Score", "Away_Team",
+    "Total_Goals", "Total-G", "Match_Result", "Goal_Difference",
+    "Both_Teams_Scored", "Over_Under", "Home_Rank", "Away_Rank",
+    "Games_Since_Last_Won_Home", "Games_Since_Last_Won_Away",
+    "Games_Since_Last_Won_Combined_Home", "Games_Since_Last_Won_Combined_Away",
+    "Games_Since_Last_3Goals_Home", "Games_Since_Last_3Goals_Away",
+    "F!=4HA", "Status3",
+    "F4_Alert_Home", "S3_Alert_Home", "F4_Alert_Away", "S3_Alert_Away", "Alert_Reason",
+    "Season_Number", "Season_Label"
+]
+ALERT_COLUMNS = ["F4_Alert_Home", "S3_Alert_Home", "F4_Alert_Away", "S3_Alert_Away", "Alert_Reason"]
+
+
+def new_team_stats(teams):
+    """Empty league table for the given teams"""
+    return {
+        team: {
+            "P": 0, "W": 0, "D": 0, "L": 0,
+            "GF": 0, "GA": 0, "GD": 0, "Pts": 0, "Form": []
+        }
+        for team in teams
+    }
+
+
+def new_pattern_stats(teams):
+    """Empty running accumulators behind the historical counter patterns"""
+    return {
+        team: {
+            "matches": 0,
+            "f4_hits": 0, "f4_gap_total": 0, "f4_streak": 0, "f4_max": 0,
+            "s3_hits": 0, "s3_gap_total": 0, "s3_streak": 0, "s3_max": 0,
+        }
+        for team in teams
+    }
+
+
+def update_pattern_stats(acc, total_goals, status3_exact=False):
+    """Fold one match into a team's pattern accumulator (S3 hits by the Status3 rule)"""
+    acc["matches"] += 1
+
+    if total_goals == 4:
+        acc["f4_hits"] += 1
+        acc["f4_gap_total"] += acc["f4_streak"]
+        acc["f4_streak"] = 0
+    else:
+        acc["f4_streak"] += 1
+        if acc["f4_streak"] > acc["f4_max"]:
+            acc["f4_max"] = acc["f4_streak"]
+
+    if total_goals == 3 if status3_exact else total_goals >= 3:
+        acc["s3_hits"] += 1
+        acc["s3_gap_total"] += acc["s3_streak"]
+        acc["s3_streak"] = 0
+    else:
+        acc["s3_streak"] += 1
+        if acc["s3_streak"] > acc["s3_max"]:
+            acc["s3_max"] = acc["s3_streak"]
+
+
+def _run_stats(hits, starts, ends):
+    """Hits, gap total, trailing streak and longest run per contiguous group"""
+    index = np.arange(len(hits))
+    # Index of the latest hit at or before each row, or the row before the group
+    baseline = np.full(len(hits), -1)
+    baseline[starts] = starts - 1
+    last_hit = np.maximum.accumulate(np.where(hits, index, baseline))
+    streak = index - last_hit
+    # Streak standing just before each row; a hit adds it to the gap total
+    before = np.empty_like(streak)
+    before[0] = 0
+    before[1:] = streak[:-1]
+    before[starts] = 0
+    return (
+        np.add.reduceat(hits.astype(np.int64), starts),
+        np.add.reduceat(np.where(hits, before, 0), starts),
+        streak[ends - 1],
+        np.maximum.reduceat(streak, starts),
+    )
+
+
+def compute_pattern_stats(store, teams, status3_exact=False):
+    """Pattern accumulators for the whole match log in one grouped pass.
+
+    Long-formats the log (one entry per team per match), stable-sorts it
+    by team so each team's matches stay in row order, and derives every team's run lengths between resets
+    with array operations. Matches ``update_pattern_stats`` folded over
+    each team's matches in order with the same ``status3_exact``.
+    """
+    pattern_stats = new_pattern_stats(teams)
+    size = len(store)
+    if size == 0:
+        return pattern_stats
+
+    # Interleave home and away entries so a stable sort keeps row order per team
+    team_codes = np.column_stack([store.column("home"), store.column("away")]).ravel()
+    totals = np.repeat(store.column("total_goals"), 2)
+    order = np.argsort(team_codes, kind="stable")
+    team_codes = team_codes[order]
+    totals = totals[order]
+
+    starts = np.flatnonzero(np.r_[True, team_codes[1:] != team_codes[:-1]])
+    ends = np.r_[starts[1:], len(team_codes)]
+    f4 = _run_stats(totals == 4, starts, ends)
+    s3 = _run_stats(totals == 3 if status3_exact else totals >= 3, starts, ends)
+
+    for group, code in enumerate(team_codes[starts].tolist()):
+        team = store.teams[code]
+        if team not in pattern_stats:
+            continue
+        pattern_stats[team] = {
+            "matches": int(ends[group] - starts[group]),
+            "f4_hits": int(f4[0][group]), "f4_gap_total": int(f4[1][group]),
+            "f4_streak": int(f4[2][group]), "f4_max": int(f4[3][group]),
+            "s3_hits": int(s3[0][group]), "s3_gap_total": int(s3[1][group]),
+            "s3_streak": int(s3[2][group]), "s3_max": int(s3[3][group]),
+        }
+    return pattern_stats
+
+
+# Head-to-head counters kept per (host, visitor) pair of team codes
+PAIR_FIELDS = ["matches", "host_wins", "visitor_wins", "draws", "goals", "over_2_5", "over_3_5", "both_teams_score"]
+
+
+def new_pair_stats(size):
+    """Zeroed ``(len(PAIR_FIELDS), size, size)`` head-to-head counters"""
+    return np.zeros((len(PAIR_FIELDS), size, size), dtype=np.int64)
+
+
+def add_pair_stats(pair_stats, columns, sign=1):
+    """Fold a block of match log columns into the head-to-head counters.
+
+    ``sign=-1`` takes the block back out again.
+    """
+    size = pair_stats.shape[1]
+    home_scores = columns["home_score"].astype(np.int64)
+    away_scores = columns["away_score"].astype(np.int64)
+    totals = home_scores + away_scores
+    values = (
+        None, home_scores > away_scores, home_scores < away_scores, home_scores == away_scores,
+        totals, totals > 2, totals > 3, (home_scores > 0) & (away_scores > 0),
+    )
+    pairs = columns["home"].astype(np.intp) * size + columns["away"]
+    flat = pair_stats.reshape(len(PAIR_FIELDS), -1)
+    for field, weights in enumerate(values):
+        counts = np.bincount(pairs, weights=weights, minlength=size * size)
+        flat[field] += sign * counts.astype(np.int64)
+
+
+def elo_expectancy(home_rating, away_rating):
+    """Expected score of the home side (win 1, draw 0.5), home advantage included"""
+    return 1 / (1 + 10 ** ((away_rating - home_rating - ELO_HOME_ADVANTAGE) / 400))
+
+
+def elo_shift(home_rating, away_rating, home_score, away_score):
+    """Rating points the home side gains (the away side loses) from a result.
+
+    The usual Elo update with a home-advantage term and the World Football
+    Elo margin multiplier: x1 for one goal, x1.5 for two, (11 + N) / 8 above.
+    """
+    expected = elo_expectancy(home_rating, away_rating)
+    margin = abs(home_score - away_score)
+    if home_score > away_score:
+        actual = 1.0
+    elif home_score < away_score:
+        actual = 0.0
+    else:
+        actual = 0.5
+    multiplier = 1.0 if margin <= 1 else 1.5 if margin == 2 else (11 + margin) / 8
+    return ELO_K * multiplier * (actual - expected)
+
+
+def replay_elo(home, away, home_scores, away_scores, size):
+    """Post-match ``(home_elo, away_elo)`` columns and final ratings for a match log.
+
+    ``home`` and ``away`` are team codes below ``size``. Used to rebuild
+    ratings for logs stored before they were tracked.
+    """
+    ratings = [ELO_START] * size
+    home_elo = np.empty(len(home), dtype=np.float32)
+    away_elo = np.empty(len(home), dtype=np.float32)
+    rows = zip(home.tolist(), away.tolist(), home_scores.tolist(), away_scores.tolist())
+    for row, (home_code, away_code, home_score, away_score) in enumerate(rows):
+        shift = elo_shift(ratings[home_code], ratings[away_code], home_score, away_score)
+        home_elo[row] = ratings[home_code] + shift
+        away_elo[row] = ratings[away_code] - shift
+        # Keep the stored float32 value so a reload continues identically
+        ratings[home_code] = float(home_elo[row])
+        ratings[away_code] = float(away_elo[row])
+    return home_elo, away_elo, ratings
+
+
+def get_alert_symbols_and_reason(f4_counter, s3_counter):
+    """Generate alert symbols and reason text for a team"""
+    f4_alert = ""
+    s3_alert = ""
+    reasons = []
+
+    if f4_counter >= F4_CRITICAL_THRESHOLD:
+        f4_alert = "🔴"
+        reasons.append(f"F4={f4_counter} (CRITICAL)")
+    elif f4_counter >= F4_ALERT_THRESHOLD:
+        f4_alert = "⚠️"
+        reasons.append(f"F4={f4_counter}")
+
+    if s3_counter >= S3_CRITICAL_THRESHOLD:
+        s3_alert = "🔥"
+        reasons.append(f"S3={s3_counter} (CRITICAL)")
+    elif s3_counter >= S3_ALERT_THRESHOLD:
+        s3_alert = "🎯"
+        reasons.append(f"S3={s3_counter}")
+
+    alert_reason = " | ".join(reasons) if reasons else ""
+
+    return f4_alert, s3_alert, alert_reason
+
+
+class LeagueRanking:
+    """League table order maintained incrementally.
+
+    Teams are kept sorted on (Pts, GD, GF) descending with the team name as
+    a stable tie-break, so a result only moves the two teams it touched and
+    a position lookup is a binary search.
+    """
+
+    def __init__(self, team_stats):
+        self._key_of = {
+            team: (-stats["Pts"], -stats["GD"], -stats["GF"], team)
+            for team, stats in team_stats.items()
+        }
+        self._keys = sorted(self._key_of.values())
+
+    def update(self, team, stats):
+        """Re-slot a team after its stats changed"""
+        keys = self._keys
+        old_key = self._key_of[team]
+        new_key = (-stats["Pts"], -stats["GD"], -stats["GF"], team)
+        if new_key == old_key:
+            return
+        del keys[bisect_left(keys, old_key)]
+        insort(keys, new_key)
+        self._key_of[team] = new_key
+
+    def position(self, team):
+        """1-based table position of a team"""
+        key = self._key_of.get(team)
+        if key is None:
+            return None
+        return bisect_left(self._keys, key) + 1
+
+    def ordered_teams(self):
+        """Teams from top to bottom of the table"""
+        return [key[3] for key in self._keys]
+
+
+def _memo_key(compute, args):
+    """Memo key of ``compute(engine, *args)``"""
+    return compute.__module__, compute.__qualname__, args
+
+
+# Engines are shared between threads, so lookups are observed per thread
+_memo_observers = threading.local()
+
+
+def observe_memo(callback):
+    """Report this thread's ``LeagueEngine.cached`` lookups as ``callback(name, hit, seconds)``.
+
+    ``seconds`` is the compute time of a miss (0 for a hit); None stops reporting.
+    """
+    _memo_observers.callback = callback
+
+
+class LeagueEngine:
+    """League state plus the batch ingest path used by every front end.
+
+    ``status3_exact`` selects the Status3 reset rule: oddbet.py resets on
+    3+ goals, football2.py only on exactly 3. ``season_length`` is the
+    matches per team after which the season resets.
+    """
+
+    def __init__(self, teams=VALID_TEAMS, status3_exact=False, season_length=SEASON_LENGTH,
+                 snapshot_interval=SNAPSHOT_INTERVAL):
+        self.teams = set(teams)
+        self.status3_exact = status3_exact
+        self.season_length = season_length
+        self.snapshot_interval = snapshot_interval
+        self.store = MatchStore(self.teams)
+        self.season_number = 1
+        self.match_counter = 1
+        self._frame_cache = {}
+        # Bumped whenever league data changes; memoized views key off it
+        self.version = 0
+        self._memo = OrderedDict()
+        # Deferred downloads read the memo from a worker thread
+        self._memo_lock = threading.Lock()
+        # Pattern accumulators, Elo ratings and head-to-head counters span every season
+        self.pattern_stats = new_pattern_stats(self.teams)
+        self.elo = {team: ELO_START for team in self.teams}
+        self.pair_stats = new_pair_stats(len(self.store.teams))
+        self._reset_season_state()
+        # State as of given log rows, oldest first; rebuilds replay from the nearest
+        self.snapshots = [self.snapshot()]
+        # [first row, season before it] of every pasted or imported batch, for undo
+        self.batches = []
+
+    def _reset_season_state(self):
+        self.team_stats = new_team_stats(self.teams)
+        self.home_counters = {team: 0 for team in self.teams}
+        self.away_counters = {team: 0 for team in self.teams}
+        self.ha_counters = {team: 0 for team in self.teams}
+        self.status3_counters = {team: 0 for team in self.teams}
+        self.ranking = LeagueRanking(self.team_stats)
+        self._bump_version()
+
+    # ============ MEMOIZATION ============
+    def _bump_version(self):
+        with self._memo_lock:
+            self.version += 1
+            self._memo.clear()
+
+    def cached(self, compute, *args):
+        """``compute(self, *args)``, reused until the league data changes.
+
+        Results are shared between callers, so treat them as read-only.
+        ``args`` must be hashable.
+        """
+        observer = getattr(_memo_observers, "callback", None)
+        memo = self._memo
+        key = _memo_key(compute, args)
+        with self._memo_lock:
+            hit = key in memo
+            if hit:
+                memo.move_to_end(key)
+                value = memo[key]
+            version = self.version
+        if hit:
+            if observer is not None:
+                observer(compute.__qualname__, True, 0.0)
+            return value
+        started = time.perf_counter()
+        value = compute(self, *args)
+        with self._memo_lock:
+            # Skip storing a result computed from data that changed meanwhile
+            if version == self.version:
+                memo[key] = value
+                if len(memo) > MEMO_SIZE:
+                    memo.popitem(last=False)
+        if observer is not None:
+            observer(compute.__qualname__, False, time.perf_counter() - started)
+        return value
+
+    def memoized(self, compute, *args):
+        """The result ``cached(compute, *args)`` would reuse, or None without computing it"""
+        key = _memo_key(compute, args)
+        with self._memo_lock:
+            if key not in self._memo:
+                return None
+            self._memo.move_to_end(key)
+            return self._memo[key]
+
+    # ============ SEASON MANAGEMENT ============
+    def reset_season(self):
+        """Reset team statistics for a new season while preserving match history"""
+        self._reset_season_state()
+        self.season_number += 1
+        self.match_counter = 1
+        # A manual reset is not in the match log, so the boundary is always snapshotted
+        self._take_snapshot(len(self.store))
+        return True
+
+    def clear(self):
+        """Drop the whole match history and start a fresh season"""
+        self.store.clear()
+        self._frame_cache = {}
+        self.pattern_stats = new_pattern_stats(self.teams)
+        self.elo = {team: ELO_START for team in self.teams}
+        self.pair_stats = new_pair_stats(len(self.store.teams))
+        self.snapshots = []
+        self.batches = []
+        self.reset_season()
+
+    # ============ SNAPSHOTS ============
+    def snapshot(self, row=None):
+        """Everything ingest reads, as a JSON-ready dict for log row ``row``"""
+        return {
+            "row": len(self.store) if row is None else row,
+            "season_number": self.season_number,
+            "match_counter": self.match_counter,
+            "state": self.season_state(),
+            "elo": dict(self.elo),
+            "patterns": {team: dict(acc) for team, acc in self.pattern_stats.items()},
+            "status3_exact": self.status3_exact,
+        }
+
+    def _take_snapshot(self, row):
+        snapshot = self.snapshot(row)
+        if self.snapshots and self.snapshots[-1]["row"] == row:
+            # The latest state at a row wins, e.g. a season reset after a periodic snapshot
+            self.snapshots[-1] = snapshot
+        else:
+            self.snapshots.append(snapshot)
+
+    def _apply_snapshot(self, snapshot):
+        self.season_number = snapshot["season_number"]
+        self.match_counter = snapshot["match_counter"]
+        self._load_season_state(snapshot["state"])
+        self.elo = {team: snapshot["elo"].get(team, ELO_START) for team in self.teams}
+        self.pattern_stats = new_pattern_stats(self.teams)
+        for team, acc in snapshot["patterns"].items():
+            if team in self.pattern_stats:
+                self.pattern_stats[team] = dict(acc)
+
+    def initial_snapshot(self, season_number=1):
+        """Snapshot of an empty log starting at ``season_number``"""
+        fresh = LeagueEngine(self.teams, self.status3_exact, self.season_length, self.snapshot_interval)
+        fresh.season_number = season_number
+        return fresh.snapshot()
+
+    def logged_events(self, start=0, stop=None):
+        """``(season, [home, home_score, away_score, away])`` for the log rows ``start:stop``"""
+        cols = self.store.columns(start, stop)
+        teams = self.store.teams
+        return [
+            (season, [teams[home], home_score, away_score, teams[away]])
+            for season, home, home_score, away_score, away in zip(
+                cols["season"].tolist(), cols["home"].tolist(), cols["home_score"].tolist(),
+                cols["away_score"].tolist(), cols["away"].tolist(),
+            )
+        ]
+
+    def replay(self, events, season_number=None):
+        """Ingest logged ``(season, match)`` events again, keeping their seasons.
+
+        Seasons change exactly where the logged season does, never by the
+        automatic reset: an edited log can leave a team with more or fewer
+        matches in a season than it had, and the stored season labels still
+        hold. ``season_number`` is the season to finish in. Returns the summary.
+        """
+        summary = {"processed": 0, "completed_seasons": []}
+        start = 0
+        for stop in range(1, len(events) + 1):
+            if stop < len(events) and events[stop][0] == events[start][0]:
+                continue
+            if self.season_number < events[start][0]:
+                team = self.season_complete_team()
+                if team is not None:
+                    summary["completed_seasons"].append((self.season_number, team))
+            while self.season_number < events[start][0]:
+                self.reset_season()
+            result = self.ingest([match for _, match in events[start:stop]], new_batch=False, auto_reset=False)
+            summary["processed"] += result["processed"]
+            start = stop
+        while season_number is not None and self.season_number < season_number:
+            self.reset_season()
+        return summary
+
+    def _snapshot_index(self, row):
+        """Index of the latest snapshot at or before log row ``row``"""
+        return bisect_right([snapshot["row"] for snapshot in self.snapshots], row) - 1
+
+    def rebuild(self, row=None, events=None, season_number=None):
+        """Recompute the state from the nearest snapshot at or before log row ``row``.
+
+        The log is cut back to the snapshot and ``events`` (by default the
+        logged events from there on) are replayed, so the cost grows with
+        the matches after the snapshot, not with the whole history. The
+        rebuilt state ends in ``season_number`` (the current one by default).
+        """
+        row = len(self.store) if row is None else row
+        index = self._snapshot_index(row)
+        snapshot = self.snapshots[index]
+        if events is None:
+            events = self.logged_events(snapshot["row"])
+        season_number = self.season_number if season_number is None else season_number
+        add_pair_stats(self.pair_stats, self.store.columns(snapshot["row"]), sign=-1)
+        self.store.truncate(snapshot["row"])
+        self._frame_cache = {}
+        del self.snapshots[index + 1:]
+        self._apply_snapshot(snapshot)
+        return self.replay(events, season_number)
+
+    # ============ CORRECTIONS ============
+    def match_row(self, match_id, season=None):
+        """Log row of a season's ``Match_ID`` (current season by default), or None"""
+        start, stop = self.store.season_bounds(self.season_number if season is None else season)
+        rows = np.flatnonzero(self.store.column("match_id", start, stop) == match_id)
+        return start + int(rows[0]) if len(rows) else None
+
+    def _edit_log(self, start, stop, matches=(), season_number=None):
+        """Replace log rows ``start:stop`` with ``matches`` and recompute from there.
+
+        Only the matches after the nearest snapshot are replayed; the new
+        matches keep the season of the rows they replace.
+        """
+        first = self.snapshots[self._snapshot_index(start)]["row"]
+        events = self.logged_events(first)
+        season = events[start - first][0] if start - first < len(events) else self.season_number
+        events[start - first:stop - first] = [(season, list(match)) for match in matches]
+        shift = len(matches) - (stop - start)
+        batches = [[row + shift if row > start else row, batch_season] for row, batch_season in self.batches]
+        summary = self.rebuild(start, events, season_number)
+        # A batch left without rows gives way to the one after it
+        self.batches = [
+            batch for i, batch in enumerate(batches)
+            if batch[0] < len(self.store) and (i + 1 == len(batches) or batches[i + 1][0] != batch[0])
+        ]
+        return summary
+
+    def _check_row(self, row):
+        if not 0 <= row < len(self.store):
+            raise IndexError(f"no match at log row {row}")
+
+    def delete_match(self, row):
+        """Remove the match at log row ``row`` and recompute everything after it"""
+        self._check_row(row)
+        return self._edit_log(row, row + 1)
+
+    def correct_match(self, row, match):
+        """Replace the match at log row ``row`` with ``[home, home_score, away_score, away]``"""
+        self._check_row(row)
+        return self._edit_log(row, row + 1, [match])
+
+    def undo_last_batch(self):
+        """Remove the latest pasted or imported batch; returns its match count, 0 if none.
+
+        Season resets the batch triggered are undone with it; manual resets
+        made after it are kept.
+        """
+        if not self.batches:
+            return 0
+        start, season_number = self.batches.pop()
+        removed = len(self.store) - start
+        # The batch's rows end the log, so any later season change was a manual reset
+        manual_resets = self.season_number - int(self.store.column("season")[-1])
+        self._edit_log(start, len(self.store), season_number=season_number + manual_resets)
+        return removed
+
+    # ============ PERSISTENCE ============
+    def season_state(self):
+        """Current-season stats and counters per team, for persistence"""
+        return {
+            team: {
+                **self.team_stats[team],
+                "Form": list(self.team_stats[team]["Form"]),
+                "home_counter": self.home_counters[team],
+                "away_counter": self.away_counters[team],
+                "ha_counter": self.ha_counters[team],
+                "s3_counter": self.status3_counters[team],
+            }
+            for team in self.teams
+        }
+
+    def _load_season_state(self, season_state):
+        self._reset_season_state()
+        for team, state in season_state.items():
+            if team not in self.teams:
+                continue
+            stats = self.team_stats[team]
+            for key in stats:
+                stats[key] = list(state[key]) if key == "Form" else state[key]
+            self.home_counters[team] = state["home_counter"]
+            self.away_counters[team] = state["away_counter"]
+            self.ha_counters[team] = state["ha_counter"]
+            self.status3_counters[team] = state["s3_counter"]
+        self.ranking = LeagueRanking(self.team_stats)
+
+    def _load_columns(self, match_columns):
+        self.store.clear()
+        self._frame_cache = {}
+        self.batches = []
+        if match_columns is not None:
+            if "home_elo" not in match_columns:
+                match_columns = dict(match_columns)
+                match_columns["home_elo"], match_columns["away_elo"], _ = replay_elo(
+                    match_columns["home"], match_columns["away"],
+                    match_columns["home_score"], match_columns["away_score"], len(self.store.teams),
+                )
+            self.store.load_columns(match_columns)
+        self.pair_stats = new_pair_stats(len(self.store.teams))
+        add_pair_stats(self.pair_stats, self.store.columns())
+
+    def _first_season(self, default):
+        return int(self.store.column("season")[0]) if len(self.store) else default
+
+    def restore(self, season_number, match_counter, season_state, match_columns=None):
+        """Load saved state directly, without replaying the match history"""
+        self._load_columns(match_columns)
+        self.season_number = season_number
+        self.match_counter = match_counter
+        self._load_season_state(season_state)
+        self.pattern_stats = compute_pattern_stats(self.store, self.teams, self.status3_exact)
+        self.elo = {team: self._last_elo(team) for team in self.teams}
+        # Without stored snapshots, a rebuild has to start from the first match
+        self.snapshots = [self.initial_snapshot(self._first_season(season_number)), self.snapshot()]
+        self._bump_version()
+
+    def restore_snapshot(self, snapshot, match_columns=None, snapshots=None):
+        """Load a snapshot and the match log up to its row; replay the rest with ``replay``"""
+        self._load_columns(match_columns)
+        self._apply_snapshot(snapshot)
+        snapshots = list(snapshots or [snapshot])
+        if snapshot.get("status3_exact", False) != self.status3_exact:
+            # Saved under the other Status3 rule: recount the S3 patterns from the log
+            self.pattern_stats = compute_pattern_stats(self.store, self.teams, self.status3_exact)
+            snapshot = self.snapshot(snapshot["row"])
+            snapshots = [snapshot if kept["row"] == snapshot["row"] else kept for kept in snapshots]
+        # Other snapshots of the other rule are dropped; an empty log counts no hits
+        self.snapshots = [
+            kept for kept in snapshots
+            if kept["row"] == 0 or kept.get("status3_exact", False) == self.status3_exact
+        ]
+        if self.snapshots[0]["row"] != 0:
+            self.snapshots.insert(0, self.initial_snapshot(self._first_season(snapshot["season_number"])))
+        self._bump_version()
+
+    def _last_elo(self, team):
+        """Rating after the team's latest logged match"""
+        rows = self.store.team_rows(team)
+        if len(rows) == 0:
+            return ELO_START
+        row = int(rows[-1])
+        store = self.store
+        side = "home_elo" if store.column("home")[row] == store.team_codes[team] else "away_elo"
+        return float(store.column(side)[row])
+
+    def season_complete_team(self):
+        """First team that has played a full season, or None"""
+        for team in self.teams:
+            if self.team_stats[team]["P"] >= self.season_length:
+                return team
+        return None
+
+    def max_played(self):
+        """Most matches played by any team this season"""
+        return max((stats["P"] for stats in self.team_stats.values()), default=0)
+
+    # ============ RANKINGS ============
+    def calculate_rankings(self):
+        """Current league table as ``(team, stats)`` pairs, already sorted"""
+        team_stats = self.team_stats
+        return [(team, team_stats[team]) for team in self.ranking.ordered_teams()]
+
+    def get_team_position(self, team_name):
+        """Get current ranking position for a team"""
+        return self.ranking.position(team_name)
+
+    # ============ INGEST ============
+    def ingest(self, matches, new_batch=True, auto_reset=True):
+        """Apply parsed ``[home, home_score, away_score, away]`` results in order.
+
+        Returns a summary dict with the number of processed matches and a
+        ``completed_seasons`` list of ``(season_number, team)`` for every
+        automatic end-of-season reset triggered along the way. With
+        ``new_batch`` the matches are recorded as one batch for
+        :meth:`undo_last_batch`; otherwise they extend the latest batch.
+        Without ``auto_reset`` no season ends automatically, as when
+        :meth:`replay` follows the logged seasons.
+        """
+        completed = []
+        team_stats = self.team_stats
+        rows = []
+        append = rows.append
+        first_row = len(self.store)
+        if new_batch and matches:
+            self.batches.append([first_row, self.season_number])
+
+        def season_reset():
+            team = self.season_complete_team()
+            if team is None:
+                return
+            completed.append((self.season_number, team))
+            # Log the closed season's rows so the boundary snapshot lines up with the log
+            self.store.extend(rows)
+            rows.clear()
+            self.reset_season()
+
+        # No team ever reaches an unbounded season
+        season_length = self.season_length if auto_reset else float("inf")
+
+        # A pending season end anywhere in the batch closes the season first
+        for home_team, _, _, away_team in matches:
+            if team_stats[home_team]["P"] >= season_length or team_stats[away_team]["P"] >= season_length:
+                season_reset()
+                break
+
+        status3_exact = self.status3_exact
+        team_codes = self.store.team_codes
+        elo = self.elo
+        # Assigning into a float32 array rounds a rating to its stored precision
+        rounded = array("f", (0.0, 0.0))
+        pattern_stats = self.pattern_stats
+        snapshot_interval = self.snapshot_interval
+        processed = 0
+        for home_team, home_score, away_score, away_team in matches:
+            if (first_row + processed) % snapshot_interval == 0:
+                self._take_snapshot(first_row + processed)
+            team_stats = self.team_stats
+            home = team_stats[home_team]
+            away = team_stats[away_team]
+            if home["P"] >= season_length or away["P"] >= season_length:
+                season_reset()
+                team_stats = self.team_stats
+                home = team_stats[home_team]
+                away = team_stats[away_team]
+
+            match_id = self.match_counter
+            self.match_counter += 1
+
+            total_goals = home_score + away_score
+            home_counters = self.home_counters
+            away_counters = self.away_counters
+            ha_counters = self.ha_counters
+            status3_counters = self.status3_counters
+
+            if total_goals == 4:
+                home_counters[home_team] = 0
+                away_counters[away_team] = 0
+                ha_counters[home_team] = 0
+                ha_counters[away_team] = 0
+            else:
+                home_counters[home_team] += 1
+                away_counters[away_team] += 1
+                ha_counters[home_team] += 1
+                ha_counters[away_team] += 1
+
+            if total_goals == 3 if status3_exact else total_goals >= 3:
+                status3_counters[home_team] = 0
+                status3_counters[away_team] = 0
+            else:
+                status3_counters[home_team] += 1
+                status3_counters[away_team] += 1
+
+            home["P"] += 1
+            home["GF"] += home_score
+            home["GA"] += away_score
+            home["GD"] = home["GF"] - home["GA"]
+
+            away["P"] += 1
+            away["GF"] += away_score
+            away["GA"] += home_score
+            away["GD"] = away["GF"] - away["GA"]
+
+            if home_score > away_score:
+                home["W"] += 1
+                home["Pts"] += 3
+                home["Form"].append("W")
+                away["L"] += 1
+                away["Form"].append("L")
+                result = RESULT_HOME_WIN
+            elif away_score > home_score:
+                away["W"] += 1
+                away["Pts"] += 3
+                away["Form"].append("W")
+                home["L"] += 1
+                home["Form"].append("L")
+                result = RESULT_AWAY_WIN
+            else:
+                home["D"] += 1
+                home["Pts"] += 1
+                home["Form"].append("D")
+                away["D"] += 1
+                away["Pts"] += 1
+                away["Form"].append("D")
+                result = RESULT_DRAW
+
+            # Ratings are kept at the stored float32 precision so a reload continues identically
+            shift = elo_shift(elo[home_team], elo[away_team], home_score, away_score)
+            rounded[0] = elo[home_team] + shift
+            rounded[1] = elo[away_team] - shift
+            home_elo = elo[home_team] = rounded[0]
+            away_elo = elo[away_team] = rounded[1]
+
+            update_pattern_stats(pattern_stats[home_team], total_goals, status3_exact)
+            update_pattern_stats(pattern_stats[away_team], total_goals, status3_exact)
+
+            if len(home["Form"]) > 5:
+                home["Form"].pop(0)
+            if len(away["Form"]) > 5:
+                away["Form"].pop(0)
+
+            ranking = self.ranking
+            ranking.update(home_team, home)
+            ranking.update(away_team, away)
+            home_rank = ranking.position(home_team)
+            away_rank = ranking.position(away_team)
+
+            append((
+                match_id, self.season_number,
+                team_codes[home_team], team_codes[away_team],
+                home_score, away_score, total_goals, result,
+                home_rank, away_rank,
+                home_counters[home_team], away_counters[away_team],
+                ha_counters[home_team], ha_counters[away_team],
+                status3_counters[home_team], status3_counters[away_team],
+                home_elo, away_elo,
+            ))
+
+            processed += 1
+
+        self.store.extend(rows)
+        if processed:
+            add_pair_stats(self.pair_stats, self.store.columns(len(self.store) - processed))
+            self._bump_version()
+        return {"processed": processed, "completed_seasons": completed}
+
+    # ============ MATCH LOG VIEWS ============
+    def season_match_count(self, season=None):
+        """Number of logged matches in a season (current season by default)"""
+        start, stop = self.store.season_bounds(self.season_number if season is None else season)
+        return stop - start
+
+    def match_frame(self, season=None):
+        """Match log as a DataFrame in ``MATCH_COLUMNS`` layout.
+
+        Numeric columns are zero-copy views of the store and the frame is
+        kept until the log changes, so reruns reuse it.
+        """
+        store = self.store
+        key = (store.generation, len(store), season)
+        frame = self._frame_cache.get(key)
+        if frame is None:
+            if season is None:
+                start, stop = 0, len(store)
+            else:
+                start, stop = store.season_bounds(season)
+            frame = _build_match_frame(store, store.columns(start, stop))
+            # Only the all-seasons frame and the latest season frame are worth keeping
+            self._frame_cache = {k: v for k, v in self._frame_cache.items() if k[:2] == key[:2]}
+            self._frame_cache[key] = frame
+        return frame
+
+    def match_rows(self, start=0, stop=None):
+        """Match log rows as ``MATCH_COLUMNS``-ordered lists"""
+        store = self.store
+        return _build_match_frame(store, store.columns(start, stop)).values.tolist()
+
+    def elo_history(self, team):
+        """A team's rating after each of its matches, indexed by row in the log"""
+        store = self.store
+        rows = store.team_rows(team)
+        at_home = store.column("home")[rows] == store.team_codes[team]
+        ratings = np.where(at_home, store.column("home_elo")[rows], store.column("away_elo")[rows])
+        return pd.Series(ratings, index=rows, name=team)
+
+    def recent_matches(self, count):
+        """Last ``count`` matches, oldest first"""
+        return self.match_rows(max(0, len(self.store) - count))
+
+
+def _total_g_labels(max_total):
+    return ["Won" if total == 4 else "3 ✔" if total == 3 else str(total) for total in range(max_total + 1)]
+
+
+def _alert_codes(counter, alert_threshold, critical_threshold):
+    return np.where(counter >= critical_threshold, 2, np.where(counter >= alert_threshold, 1, 0)).astype(np.int8)
+
+
+def _build_match_frame(store, cols):
+    """Assemble the display frame; derived text columns are built once per call"""
+    n = len(cols["match_id"])
+    home_names = store.team_categorical(cols["home"])
+    away_names = store.team_categorical(cols["away"])
+    total = cols["total_goals"]
+    max_total = int(total.max()) if n else 0
+    bts = ((cols["home_score"] > 0) & (cols["away_score"] > 0)).astype(np.int8)
+    over = (total > 2).astype(np.int8)
+
+    home_list = np.asarray(home_names).tolist()
+    away_list = np.asarray(away_names).tolist()
+    ha_home, ha_away = cols["ha_home"].tolist(), cols["ha_away"].tolist()
+    s3_home, s3_away = cols["s3_home"].tolist(), cols["s3_away"].tolist()
+
+    reason_cache = {}
+
+    def reason(f4, s3):
+        text = reason_cache.get((f4, s3))
+        if text is None:
+            text = reason_cache[(f4, s3)] = get_alert_symbols_and_reason(f4, s3)[2]
+        return text
+
+    alert_reason = []
+    for home, away, hf4, af4, hs3, as3 in zip(home_list, away_list, ha_home, ha_away, s3_home, s3_away):
+        home_reason = reason(hf4, hs3)
+        away_reason = reason(af4, as3)
+        if home_reason or away_reason:
+            alert_reason.append(f"{home}: {home_reason} | {away}: {away_reason}")
+        else:
+            alert_reason.append("")
+
+    seasons = cols["season"]
+    first_season = int(seasons[0]) if n else 1
+    last_season = int(seasons[-1]) if n else 1
+    season_labels = [f"Season {season}" for season in range(first_season, last_season + 1)]
+
+    f4_symbols = pd.CategoricalDtype(["", "⚠️", "🔴"])
+    s3_symbols = pd.CategoricalDtype(["", "🎯", "🔥"])
+
+    return pd.DataFrame({
+        "Match_ID": cols["match_id"],
+        "Home_Team": home_names,
+        "Home_Score": cols["home_score"],
+        "Away_Score": cols["away_score"],
+        "Away_Team": away_names,
+        "Total_Goals": total,
+        "Total-G": pd.Categorical.from_codes(total, categories=_total_g_labels(max_total), validate=False),
+        "Match_Result": pd.Categorical.from_codes(cols["result"], categories=RESULT_LABELS, validate=False),
+        "Goal_Difference": cols["home_score"].astype(np.int16) - cols["away_score"],
+        "Both_Teams_Scored": pd.Categorical.from_codes(bts, categories=["No", "Yes"], validate=False),
+        "Over_Under": pd.Categorical.from_codes(over, categories=["Under 2.5", "Over 2.5"], validate=False),
+        "Home_Rank": cols["home_rank"],
+        "Away_Rank": cols["away_rank"],
+        "Games_Since_Last_Won_Home": cols["home_counter"],
+        "Games_Since_Last_Won_Away": cols["away_counter"],
+        "Games_Since_Last_Won_Combined_Home": cols["ha_home"],
+        "Games_Since_Last_Won_Combined_Away": cols["ha_away"],
+        "Games_Since_Last_3Goals_Home": cols["s3_home"],
+        "Games_Since_Last_3Goals_Away": cols["s3_away"],
+        "F!=4HA": [f"{h}: {hc} | {a}: {ac}" for h, a, hc, ac in zip(home_list, away_list, ha_home, ha_away)],
+        "Status3": [f"{h}: {hc} | {a}: {ac}" for h, a, hc, ac in zip(home_list, away_list, s3_home, s3_away)],
+        "F4_Alert_Home": pd.Categorical.from_codes(
+            _alert_codes(cols["ha_home"], F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD), dtype=f4_symbols, validate=False),
+        "S3_Alert_Home": pd.Categorical.from_codes(
+            _alert_codes(cols["s3_home"], S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD), dtype=s3_symbols, validate=False),
+        "F4_Alert_Away": pd.Categorical.from_codes(
+            _alert_codes(cols["ha_away"], F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD), dtype=f4_symbols, validate=False),
+        "S3_Alert_Away": pd.Categorical.from_codes(
+            _alert_codes(cols["s3_away"], S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD), dtype=s3_symbols, validate=False),
+        "Alert_Reason": alert_reason,
+        "Season_Number": seasons,
+        "Season_Label": pd.Categorical.from_codes(seasons - first_season, categories=season_labels, validate=False),
+    }, columns=MATCH_COLUMNS, copy=False)
@@ -0,0 +1,75 @@
+"""Download payloads for the dashboards' export buttons.
+
+Exports are encoded only when a download is requested and are memoized on
+the engine, so they are rebuilt at most once per data version. Parquet
+needs pyarrow and is only offered when it is installed.
+"""
+
+import gzip
+import io
+
+from league_analytics import alert_list, league_table
+from match_predictor import prediction_frame
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+# Format key -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "CSV (gzip)": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def available_formats():
+    """Export formats usable with the installed packages"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "Parquet" or pyarrow is not None]
+
+
+def export_file_name(stem, fmt):
+    return stem + EXPORT_FORMATS[fmt][0]
+
+
+def export_mime(fmt):
+    return EXPORT_FORMATS[fmt][1]
+
+
+def encode_frame(frame, fmt):
+    """Serialize a DataFrame to bytes in one of ``EXPORT_FORMATS``"""
+    if fmt == "Parquet":
+        if pyarrow is None:
+            raise ImportError("Parquet export requires pyarrow")
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    data = frame.to_csv(index=False).encode("utf-8")
+    if fmt == "CSV (gzip)":
+        # Fixed mtime keeps the bytes identical for identical data
+        data = gzip.compress(data, compresslevel=6, mtime=0)
+    return data
+
+
+def match_export(engine, fmt="CSV", season=None, drop_columns=()):
+    """Match log (one season or all) encoded for download"""
+    frame = engine.match_frame(season)
+    if drop_columns:
+        frame = frame.drop(columns=list(drop_columns))
+    return encode_frame(frame, fmt)
+
+
+def table_export(engine, fmt="CSV", empty_form=""):
+    """Current league table encoded for download"""
+    return encode_frame(engine.cached(league_table, empty_form), fmt)
+
+
+def predictions_export(engine, fmt="CSV"):
+    """Predictions for every ordered pairing encoded for download"""
+    return encode_frame(engine.cached(prediction_frame), fmt)
+
+
+def alerts_export(engine, fmt="CSV"):
+    """Current Type A alert list encoded for download"""
+    return encode_frame(engine.cached(alert_list), fmt)
@@ -0,0 +1,156 @@
+"""Registry of the virtual leagues followed by the dashboards.
+
+Every league has its own team list, feed header, season length, SQLite
+file and LeagueEngine, so counters, stats and match logs never mix.
+Engines and parsers are built the first time a league is opened, so memory
+and compute grow with the leagues actually in use, and a league's memoized
+views survive switching to another one and back.
+
+Leagues beyond the built-in English league are read from a JSON file that
+maps a league key to its ``name``, ``teams`` and optionally ``header``
+(the feed header text, the name by default):
+
+    {"spanish": {"name": "Spanish League", "teams": ["Barcelona", "Madrid", ...]}}
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from bulk_import import import_new_feeds
+from feed_parser import FeedParser
+from league_engine import VALID_TEAMS, LeagueEngine
+from league_storage import LeagueStorage
+
+DEFAULT_LEAGUE = "english"
+LEAGUES_PATH = "leagues.json"
+
+# League key -> display name, teams, feed header and matches per team per season
+LEAGUES = {
+    DEFAULT_LEAGUE: {
+        "name": "English League",
+        "teams": sorted(VALID_TEAMS),
+        "header": "English League",
+        "season_length": 38,
+    },
+}
+
+
+def league_config(key, name, teams, header=None):
+    """League entry for ``teams`` playing a double round robin"""
+    teams = sorted(set(teams))
+    if len(teams) < 2:
+        raise ValueError(f"League {key!r} needs at least two teams")
+    return {
+        "name": name,
+        "teams": teams,
+        "header": header or name,
+        "season_length": 2 * (len(teams) - 1),
+    }
+
+
+def load_leagues(path=LEAGUES_PATH):
+    """Built-in leagues plus the ones defined in ``path``, if it exists"""
+    leagues = dict(LEAGUES)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as handle:
+            for key, league in json.load(handle).items():
+                name = league.get("name", key)
+                leagues[key] = league_config(key, name, league["teams"], league.get("header"))
+    return leagues
+
+
+def league_db_path(base_path, league):
+    """SQLite file of ``league``; the default league keeps ``base_path``"""
+    if league == DEFAULT_LEAGUE:
+        return base_path
+    root, ext = os.path.splitext(base_path)
+    return f"{root}_{league}{ext or '.db'}"
+
+
+def new_engine(league, status3_exact=False):
+    """Empty LeagueEngine for a league entry"""
+    return LeagueEngine(league["teams"], status3_exact=status3_exact, season_length=league["season_length"])
+
+
+def new_parser(league):
+    """FeedParser for a league entry"""
+    return FeedParser(league["teams"], header=league["header"])
+
+
+class LeagueRegistry:
+    """Per-league engines and parsers, built on first use"""
+
+    def __init__(self, leagues=None, status3_exact=False):
+        self.leagues = leagues if leagues is not None else load_leagues()
+        self.status3_exact = status3_exact
+        self._engines = {}
+        self._parsers = {}
+
+    def keys(self):
+        return list(self.leagues)
+
+    def name(self, key):
+        return self.leagues[key]["name"]
+
+    def engine(self, key):
+        """The league's engine, created empty on first access"""
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = self._engines[key] = new_engine(self.leagues[key], self.status3_exact)
+        return engine
+
+    def parser(self, key):
+        parser = self._parsers.get(key)
+        if parser is None:
+            parser = self._parsers[key] = new_parser(self.leagues[key])
+        return parser
+
+    def loaded(self):
+        """Keys of the leagues whose engine exists"""
+        return list(self._engines)
+
+    def replace(self, key, engine):
+        """Swap in an engine built elsewhere, e.g. loaded off the serving thread"""
+        self._engines[key] = engine
+
+    def unload(self, key):
+        """Drop a league's engine and parser to free their memory"""
+        self._engines.pop(key, None)
+        self._parsers.pop(key, None)
+
+
+# ============ BATCH IMPORT ============
+def _import_league(task):
+    key, league, sources, db_path, status3_exact = task
+    engine = new_engine(league, status3_exact)
+    storage = LeagueStorage(db_path)
+    try:
+        storage.load(engine)
+        summary = import_new_feeds(engine, storage, sources, new_parser(league))
+    finally:
+        storage.close()
+    summary["season_number"] = engine.season_number
+    return key, summary
+
+
+def import_leagues(sources, base_path, leagues=None, status3_exact=False, workers=None):
+    """Bulk import feed files for several leagues in parallel processes.
+
+    ``sources`` maps a league key to its feed file paths; files already
+    recorded as imported in the league's database are skipped. Each league
+    is loaded from, imported into and saved to its own SQLite file in its
+    own process, so parsing and ingest use several cores (threads would
+    not: both are pure Python under the GIL). Open dashboards pick the new
+    data up through the storage version. Returns ``{league: import summary}``.
+    """
+    leagues = leagues if leagues is not None else load_leagues()
+    tasks = [
+        (key, leagues[key], list(paths), league_db_path(base_path, key), status3_exact)
+        for key, paths in sources.items()
+    ]
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    if workers == 1:
+        return dict(map(_import_league, tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_import_league, tasks))
@@ -0,0 +1,351 @@
+"""Durable SQLite backend for the match log and league state.
+
+The database runs in WAL mode so dashboards and batch jobs can read while
+another process writes. The match log is an append-only event log: rows
+are only ever added, except when an edit cuts it back to a snapshot. Next
+to it are the engine's state snapshots (taken every few hundred matches
+and at each season boundary), per-season team stats and counters, and a
+small key/value table with the season pointer. Startup loads the log,
+restores the latest snapshot and replays only the matches after it.
+``read_only`` storages (the JSON API) open the file without writing to it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import urllib.parse
+import weakref
+
+import numpy as np
+
+DEFAULT_DB_PATH = "league_data.db"
+
+
+class StaleEngineError(RuntimeError):
+    """Another writer saved to the database after this engine was loaded or saved"""
+
+
+# Match log columns persisted alongside the team names
+_MATCH_FIELDS = [
+    "match_id", "season", "home_score", "away_score", "total_goals", "result",
+    "home_rank", "away_rank", "home_counter", "away_counter",
+    "ha_home", "ha_away", "s3_home", "s3_away", "home_elo", "away_elo",
+]
+# Columns added after the first schema: name -> SQL type
+_ADDED_COLUMNS = {"home_elo": "REAL", "away_elo": "REAL"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    row_id INTEGER PRIMARY KEY,
+    match_id INTEGER NOT NULL,
+    season INTEGER NOT NULL,
+    home TEXT NOT NULL,
+    away TEXT NOT NULL,
+    home_score INTEGER NOT NULL,
+    away_score INTEGER NOT NULL,
+    total_goals INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    home_rank INTEGER,
+    away_rank INTEGER,
+    home_counter INTEGER NOT NULL,
+    away_counter INTEGER NOT NULL,
+    ha_home INTEGER NOT NULL,
+    ha_away INTEGER NOT NULL,
+    s3_home INTEGER NOT NULL,
+    s3_away INTEGER NOT NULL,
+    home_elo REAL,
+    away_elo REAL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_season ON matches(season);
+CREATE INDEX IF NOT EXISTS idx_matches_home ON matches(home);
+CREATE INDEX IF NOT EXISTS idx_matches_away ON matches(away);
+
+CREATE TABLE IF NOT EXISTS team_state (
+    season INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    P INTEGER NOT NULL, W INTEGER NOT NULL, D INTEGER NOT NULL, L INTEGER NOT NULL,
+    GF INTEGER NOT NULL, GA INTEGER NOT NULL, GD INTEGER NOT NULL, Pts INTEGER NOT NULL,
+    form TEXT NOT NULL,
+    home_counter INTEGER NOT NULL,
+    away_counter INTEGER NOT NULL,
+    ha_counter INTEGER NOT NULL,
+    s3_counter INTEGER NOT NULL,
+    PRIMARY KEY (season, team)
+);
+
+CREATE TABLE IF NOT EXISTS snapshots (
+    row INTEGER PRIMARY KEY,
+    state TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS league_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class LeagueStorage:
+    """SQLite persistence for the engines of one league.
+
+    A dashboard shares one instance between its sessions, and every
+    engine saved here (the published one, the copies changes are applied
+    to) has its own sync point: the rows already on disk, tracked per
+    match store, and the storage version they match. A save from an
+    engine that missed another writer's save is refused instead of
+    overwriting it.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, read_only=False):
+        self.path = path
+        self.read_only = read_only
+        if read_only:
+            # Never creates, migrates or backfills anything; save() fails
+            uri = "file:" + urllib.parse.quote(os.path.abspath(path)) + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(_SCHEMA)
+            existing = {row[1] for row in self.conn.execute("PRAGMA table_info(matches)")}
+            for name, sql_type in _ADDED_COLUMNS.items():
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE matches ADD COLUMN {name} {sql_type}")
+            self.conn.commit()
+        # A read-only file may predate later tables and columns
+        self._tables = {row[0] for row in self.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self._match_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(matches)")}
+        # The connection is shared by session threads; one transaction at a time
+        self._lock = threading.RLock()
+        # Match store -> (generation whose rows are on disk, storage version it matches)
+        self._synced = weakref.WeakKeyDictionary()
+
+    def close(self):
+        self.conn.close()
+
+    # ============ META ============
+    def _get_meta(self, key, default=None):
+        if "league_meta" not in self._tables:
+            return default
+        row = self.conn.execute("SELECT value FROM league_meta WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def _set_meta(self, key, value):
+        self.conn.execute(
+            "INSERT INTO league_meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, json.dumps(value)),
+        )
+
+    def version(self):
+        """Write counter, bumped on every save; lets readers spot changes"""
+        with self._lock:
+            return self._get_meta("version", 0)
+
+    def in_sync(self, engine):
+        """Whether ``engine`` was loaded or saved here at the stored version"""
+        with self._lock:
+            synced = self._synced.get(engine.store)
+            return synced is not None and synced[1] == self._get_meta("version", 0)
+
+    def match_count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def imported_feeds(self):
+        """Names of the feed files already imported by the batch CLI"""
+        with self._lock:
+            return self._get_meta("imported_feeds", [])
+
+    def clear(self):
+        """Delete every stored match, snapshot and team state and the imported-feed list"""
+        with self._lock, self.conn:
+            for table in ("matches", "snapshots", "team_state"):
+                self.conn.execute(f"DELETE FROM {table}")
+            self.conn.execute("DELETE FROM league_meta WHERE key = 'imported_feeds'")
+
+    # ============ SAVE ============
+    def save(self, engine, imported_feeds=None):
+        """Persist new matches and the current-season state of ``engine``.
+
+        ``imported_feeds`` replaces the list of imported feed file names in
+        the same transaction, so a crash never records a file without its
+        matches. Raises StaleEngineError, without writing anything, when
+        another engine or process saved since ``engine`` was last loaded
+        or saved here; reload it and apply the change again.
+        """
+        store = engine.store
+        with self._lock:
+            with self.conn:
+                # Hold the write lock from the version check to the commit
+                self.conn.execute("BEGIN IMMEDIATE")
+                version = self._get_meta("version", 0)
+                synced = self._synced.get(store)
+                if synced is None and version or synced is not None and synced[1] != version:
+                    raise StaleEngineError(
+                        f"{self.path} was saved by another session or process (version {version}); "
+                        "reload it before saving"
+                    )
+                if synced is None or store.cleared_generation > synced[0]:
+                    # A log never loaded from or saved here, or a cleared one, replaces the rows on disk
+                    self.conn.execute("DELETE FROM team_state")
+                    stored = 0
+                else:
+                    # Rows cut by a rebuild since the last sync are rewritten from there
+                    stored = min(self.match_count(), store.rows_kept_since(synced[0]))
+                self.conn.execute("DELETE FROM matches WHERE row_id >= ?", (stored,))
+
+                if len(store) > stored:
+                    cols = store.columns(stored)
+                    teams = store.teams
+                    home_names = [teams[code] for code in cols["home"].tolist()]
+                    away_names = [teams[code] for code in cols["away"].tolist()]
+                    values = [cols[name].tolist() for name in _MATCH_FIELDS]
+                    self.conn.executemany(
+                        f"INSERT INTO matches (row_id, home, away, {', '.join(_MATCH_FIELDS)}) "
+                        f"VALUES ({', '.join('?' * (len(_MATCH_FIELDS) + 3))})",
+                        zip(range(stored, len(store)), home_names, away_names, *values),
+                    )
+
+                self.conn.execute("DELETE FROM snapshots WHERE row >= ?", (stored,))
+                self.conn.executemany(
+                    "INSERT INTO snapshots (row, state) VALUES (?, ?)",
+                    [(snapshot["row"], json.dumps(snapshot)) for snapshot in engine.snapshots if snapshot["row"] >= stored],
+                )
+
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO team_state "
+                    "(season, team, P, W, D, L, GF, GA, GD, Pts, form, "
+                    "home_counter, away_counter, ha_counter, s3_counter) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            engine.season_number, team,
+                            state["P"], state["W"], state["D"], state["L"],
+                            state["GF"], state["GA"], state["GD"], state["Pts"],
+                            "".join(state["Form"]),
+                            state["home_counter"], state["away_counter"],
+                            state["ha_counter"], state["s3_counter"],
+                        )
+                        for team, state in engine.season_state().items()
+                    ],
+                )
+                self._set_meta("season_number", engine.season_number)
+                self._set_meta("match_counter", engine.match_counter)
+                self._set_meta("batches", engine.batches)
+                if imported_feeds is not None:
+                    self._set_meta("imported_feeds", sorted(imported_feeds))
+                self._set_meta("version", version + 1)
+            self._synced[store] = (store.generation, version + 1)
+
+    # ============ LOAD ============
+    def load(self, engine):
+        """Restore ``engine`` from disk; returns False when nothing is stored.
+
+        Raises ValueError when the log has teams that the engine's league
+        does not, e.g. after editing the league's teams or opening another
+        league's file.
+        """
+        store = engine.store
+        with self._lock:
+            version = self._get_meta("version", 0)
+            season_number = self._get_meta("season_number")
+            if season_number is None:
+                self._synced[store] = (store.generation, version)
+                return False
+
+            count = self.match_count()
+            # Logged before ratings were tracked; restore replays them
+            backfill = count > 0 and (
+                "home_elo" not in self._match_columns
+                or self.conn.execute("SELECT 1 FROM matches WHERE home_elo IS NULL LIMIT 1").fetchone() is not None
+            )
+            snapshots = [
+                json.loads(state)
+                for (state,) in self.conn.execute("SELECT state FROM snapshots WHERE row <= ? ORDER BY row", (count,))
+            ] if "snapshots" in self._tables else []
+            if snapshots and not backfill:
+                # Latest snapshot, then replay only the matches logged after it
+                start = snapshots[-1]["row"]
+                engine.restore_snapshot(snapshots[-1], self._read_columns(store, start), snapshots)
+                engine.replay(self._logged_events(store, start), season_number)
+            else:
+                self._restore_season_state(engine, season_number, self._read_columns(store, count, not backfill))
+            engine.batches = [batch for batch in self._get_meta("batches", []) if batch[0] < len(store)]
+            if backfill and not self.read_only:
+                cols = store.columns()
+                with self.conn:
+                    self.conn.executemany(
+                        "UPDATE matches SET home_elo = ?, away_elo = ? WHERE row_id = ?",
+                        zip(cols["home_elo"].tolist(), cols["away_elo"].tolist(), range(len(store))),
+                    )
+            self._synced[store] = (store.generation, version)
+            return True
+
+    def _unknown_teams(self, store):
+        """ValueError naming the logged teams that ``store``'s league does not have"""
+        logged = {name for (name,) in self.conn.execute("SELECT home FROM matches UNION SELECT away FROM matches")}
+        unknown = sorted(logged - set(store.team_codes))
+        return ValueError(
+            f"{self.path} has matches of {', '.join(map(repr, unknown))}, which the league does not have; "
+            "check the league's teams or the database path"
+        )
+
+    def _read_columns(self, store, stop, with_elo=True):
+        """Match log rows ``0:stop`` as ``store`` columns; None if empty.
+
+        SQLite maps the team names to the store's codes, so the rows come
+        back as plain numbers and are converted to arrays in one step.
+        """
+        if stop == 0:
+            return None
+        names = [name for name in _MATCH_FIELDS if with_elo or name not in ("home_elo", "away_elo")]
+        fields = [name if name in self._match_columns else "NULL" for name in names]
+        codes = " ".join(f"WHEN ? THEN {code}" for code in range(len(store.teams)))
+        rows = self.conn.execute(
+            f"SELECT CASE home {codes} ELSE -1 END, CASE away {codes} ELSE -1 END, {', '.join(fields)} "
+            "FROM matches WHERE row_id < ? ORDER BY row_id",
+            (*store.teams, *store.teams, stop),
+        ).fetchall()
+        values = np.array(rows, dtype=np.float64)
+        if (values[:, :2] < 0).any():
+            raise self._unknown_teams(store)
+        dtypes = dict(store.fields)
+        return {
+            name: values[:, column].astype(dtypes[name])
+            for column, name in enumerate(["home", "away"] + names)
+        }
+
+    def _logged_events(self, store, start):
+        """``(season, [home, home_score, away_score, away])`` for the log rows from ``start`` on"""
+        events = [
+            (season, [home, home_score, away_score, away])
+            for season, home, home_score, away_score, away in self.conn.execute(
+                "SELECT season, home, home_score, away_score, away FROM matches WHERE row_id >= ? ORDER BY row_id",
+                (start,),
+            )
+        ]
+        team_codes = store.team_codes
+        if any(match[0] not in team_codes or match[3] not in team_codes for _, match in events):
+            raise self._unknown_teams(store)
+        return events
+
+    def _restore_season_state(self, engine, season_number, match_columns):
+        """Restore from the saved team state, for databases without snapshots"""
+        season_state = {}
+        for row in self.conn.execute(
+            "SELECT team, P, W, D, L, GF, GA, GD, Pts, form, "
+            "home_counter, away_counter, ha_counter, s3_counter "
+            "FROM team_state WHERE season = ?",
+            (season_number,),
+        ):
+            team, p, w, d, l, gf, ga, gd, pts, form, home_c, away_c, ha_c, s3_c = row
+            season_state[team] = {
+                "P": p, "W": w, "D": d, "L": l, "GF": gf, "GA": ga, "GD": gd, "Pts": pts,
+                "Form": list(form),
+                "home_counter": home_c, "away_counter": away_c,
+                "ha_counter": ha_c, "s3_counter": s3_c,
+            }
+        engine.restore(season_number, self._get_meta("match_counter", 1), season_state, match_columns)
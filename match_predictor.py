@@ -0,0 +1,172 @@
+"""Match outcome predictions and betting recommendations.
+
+Headless, so the dashboards, scripts and benchmarks share one predictor.
+Probabilities come from the scoreline matrices of the Poisson goal model
+(``goal_model``), priced for every fixture at once; recommendations also
+use ``calculate_team_metrics``.
+"""
+
+import numpy as np
+import pandas as pd
+
+from goal_model import fit_goal_model, market_probabilities, score_matrices
+from league_analytics import calculate_team_metrics, create_head_to_head_stats
+from league_engine import elo_expectancy
+
+# Markets reported as percentages, in the prediction dict's order
+PERCENT_MARKETS = ["home_win", "away_win", "draw", "over_2_5", "over_3_5", "over_4_5", "both_teams_score"]
+
+
+def _predictions(markets):
+    """Prediction dicts for every fixture priced in ``markets``"""
+    percents = (np.column_stack([markets[key] for key in PERCENT_MARKETS]) * 100).round(1).tolist()
+    home_goals = markets["home_goals"].tolist()
+    away_goals = markets["away_goals"].tolist()
+    scores = zip(markets["likely_home_score"].tolist(), markets["likely_away_score"].tolist())
+    return [
+        {
+            **dict(zip(PERCENT_MARKETS, percent)),
+            "expected_goals": round(home + away, 2),
+            "home_expected_goals": round(home, 2),
+            "away_expected_goals": round(away, 2),
+            # Expected goals per side, in the "1.5-1.2" format the dashboards always showed
+            "predicted_score": f"{round(home, 1)}-{round(away, 1)}",
+            "likely_score": f"{home_score}-{away_score}",
+        }
+        for percent, home, away, (home_score, away_score) in zip(percents, home_goals, away_goals, scores)
+    ]
+
+
+def predict_match_outcome(home_team, away_team, *, goal_model):
+    """Predict match outcome probabilities from the fitted goal model.
+
+    The model used to be fed ``team_metrics`` as the third positional
+    argument; ``goal_model`` is keyword-only so such calls fail loudly.
+    The return dict keeps every earlier key. ``likely_score`` adds the
+    most probable scoreline.
+    """
+    return _predictions(market_probabilities(score_matrices(goal_model, [home_team], [away_team])))[0]
+
+
+def fixture_predictions(engine):
+    """Predictions for every ordered pairing, keyed by ``(home, away)``.
+
+    All fixtures are priced in one batched pass over the goal model, so
+    memoized with ``engine.cached`` the whole matrix is built once per
+    data version and a fixture is a dict lookup.
+    """
+    teams = sorted(engine.teams)
+    fixtures = [(home, away) for home in teams for away in teams if home != away]
+    if not fixtures:
+        return {}
+    model = engine.cached(fit_goal_model)
+    homes, aways = zip(*fixtures)
+    predictions = _predictions(market_probabilities(score_matrices(model, homes, aways)))
+    home_elo = np.array([engine.elo[team] for team in homes])
+    away_elo = np.array([engine.elo[team] for team in aways])
+    elo_columns = zip(
+        home_elo.round(1).tolist(), away_elo.round(1).tolist(),
+        (elo_expectancy(home_elo, away_elo) * 100).round(1).tolist(),
+    )
+    for prediction, (home, away, expectancy) in zip(predictions, elo_columns):
+        prediction["home_elo"] = home
+        prediction["away_elo"] = away
+        prediction["elo_home_expectancy"] = expectancy
+    return dict(zip(fixtures, predictions))
+
+
+def match_prediction(engine, home_team, away_team):
+    """Prediction for one fixture from the memoized fixture matrix"""
+    return engine.cached(fixture_predictions)[(home_team, away_team)]
+
+
+def prediction_frame(engine):
+    """The fixture matrix as one row per ordered pairing"""
+    predictions = engine.cached(fixture_predictions)
+    frame = pd.DataFrame.from_dict(predictions, orient="index")
+    frame.index = pd.MultiIndex.from_tuples(frame.index, names=["Home_Team", "Away_Team"])
+    return frame.reset_index()
+
+
+def match_recommendations(engine, home_team, away_team):
+    """``generate_betting_recommendations`` for one fixture from the memoized views"""
+    return generate_betting_recommendations(
+        home_team, away_team,
+        engine.cached(match_prediction, home_team, away_team),
+        engine.cached(calculate_team_metrics),
+        engine.cached(create_head_to_head_stats, home_team, away_team),
+    )
+
+
+def generate_betting_recommendations(home_team, away_team, predictions, team_metrics, h2h_stats):
+    """Generate betting recommendations based on analysis"""
+
+    home_metrics = team_metrics[home_team]
+    away_metrics = team_metrics[away_team]
+
+    recommendations = {
+        "best_bets": [],
+        "avoid_bets": [],
+        "insights": []
+    }
+
+    # 1. Both Teams to Score analysis
+    bts_prob = predictions['both_teams_score']
+    if bts_prob >= 50:
+        reason = f"{home_team} leaks goals ({home_metrics['avg_ga']} GA/game) | "
+        reason += f"{away_team} can score ({away_metrics['avg_gf']} GF/game)"
+        if h2h_stats and h2h_stats['both_teams_score_pct'] >= 70:
+            reason += f" | Historical: {h2h_stats['both_teams_score_pct']}% both teams scored"
+        recommendations["best_bets"].append(("Both Teams to Score: YES", reason))
+    else:
+        recommendations["avoid_bets"].append("Both Teams to Score")
+
+    # 2. Double Chance (Home Win or Draw)
+    home_win_or_draw = round(predictions['home_win'] + predictions['draw'], 1)
+    if home_win_or_draw >= 65:
+        reason = f"{home_win_or_draw}% probability | Covers both likely outcomes"
+        recommendations["best_bets"].append((f"{home_team} or Draw (Double Chance)", reason))
+
+    # 3. Under/Over markets
+    if predictions['over_2_5'] < 50:
+        under_prob = round(100 - predictions['over_2_5'], 1)
+        reason = f"{under_prob}% probability | "
+        reason += f"{away_team}'s defense ({away_metrics['avg_ga']} GA) considered"
+        recommendations["best_bets"].append(("Under 2.5 Goals", reason))
+    else:
+        reason = f"{predictions['over_2_5']}% probability | High expected goals ({predictions['expected_goals']})"
+        recommendations["best_bets"].append(("Over 2.5 Goals", reason))
+
+    # 4. Clean Sheet analysis
+    if home_metrics['avg_ga'] > 1.4:
+        reason = f"Poor defense ({home_metrics['avg_ga']} GA/game) | Rarely keeps clean sheets"
+        recommendations["avoid_bets"].append(f"{home_team} to Win to Nil (Clean Sheet)")
+
+    # 5. High over markets
+    if predictions['over_3_5'] < 25:
+        reason = f"Only {predictions['over_3_5']}% probability | Low scoring teams"
+        recommendations["avoid_bets"].append("Over 3.5 Goals")
+
+    if predictions['over_4_5'] < 10:
+        recommendations["avoid_bets"].append("Over 4.5 Goals")
+
+    # Add insights
+    if home_metrics['avg_gf'] > away_metrics['avg_gf']:
+        recommendations["insights"].append(f"{home_team} has better attack ({home_metrics['avg_gf']} vs {away_metrics['avg_gf']} GF/game)")
+    else:
+        recommendations["insights"].append(f"{away_team} has better attack ({away_metrics['avg_gf']} vs {home_metrics['avg_gf']} GF/game)")
+
+    if away_metrics['avg_ga'] < home_metrics['avg_ga']:
+        recommendations["insights"].append(f"{away_team} has better defense ({away_metrics['avg_ga']} vs {home_metrics['avg_ga']} GA/game)")
+    else:
+        recommendations["insights"].append(f"{home_team} has better defense ({home_metrics['avg_ga']} vs {away_metrics['avg_ga']} GA/game)")
+
+    if h2h_stats and h2h_stats['total_matches'] > 0:
+        if h2h_stats['home_wins'] == 0 and h2h_stats['away_wins'] == 0:
+            recommendations["insights"].append(f"Historical trend: {h2h_stats['draws']}/{h2h_stats['total_matches']} matches ended in draw")
+        elif h2h_stats['home_wins'] > h2h_stats['away_wins'] * 2:
+            recommendations["insights"].append(f"Strong historical advantage for {home_team}")
+        elif h2h_stats['away_wins'] > h2h_stats['home_wins'] * 2:
+            recommendations["insights"].append(f"Strong historical advantage for {away_team}")
+
+    return recommendations
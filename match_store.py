@@ -0,0 +1,250 @@
+"""Columnar, array-backed match log.
+
+Every match is one slot in a set of typed NumPy arrays; team names are
+stored as small integer codes and the match result as a one-byte enum.
+Columns are handed out as read-only views, so building a DataFrame from
+the store does not copy the data.
+"""
+
+import numpy as np
+import pandas as pd
+
+RESULT_HOME_WIN = 0
+RESULT_DRAW = 1
+RESULT_AWAY_WIN = 2
+RESULT_LABELS = ["Home Win", "Draw", "Away Win"]
+
+
+def _fields(code_dtype):
+    return (
+        ("match_id", np.int32),
+        ("season", np.int32),
+        ("home", code_dtype),
+        ("away", code_dtype),
+        ("home_score", np.int8),
+        ("away_score", np.int8),
+        ("total_goals", np.int8),
+        ("result", np.int8),
+        ("home_rank", np.int16),
+        ("away_rank", np.int16),
+        ("home_counter", np.int16),
+        ("away_counter", np.int16),
+        ("ha_home", np.int16),
+        ("ha_away", np.int16),
+        ("s3_home", np.int16),
+        ("s3_away", np.int16),
+        # Post-match Elo ratings; a team's history is its rows of these
+        ("home_elo", np.float32),
+        ("away_elo", np.float32),
+    )
+
+
+class RowIndex:
+    """Row positions grouped by an integer key, kept in insertion order.
+
+    Each key owns a growable ``int32`` array, so lookups return a view of
+    exactly the rows for that key.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self._sizes = {}
+
+    def clear(self):
+        self._rows = {}
+        self._sizes = {}
+
+    def add(self, keys, rows):
+        """Append ``rows`` under the matching ``keys`` (both 1-D arrays)"""
+        if len(keys) == 0:
+            return
+        order = np.lexsort((rows, keys))
+        keys = keys[order]
+        rows = rows[order]
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        stops = np.r_[starts[1:], len(keys)]
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            key = int(keys[start])
+            size = self._sizes.get(key, 0)
+            array = self._rows.get(key)
+            needed = size + stop - start
+            if array is None or needed > len(array):
+                grown = np.empty(max(64, 2 * needed), dtype=np.int32)
+                if array is not None:
+                    grown[:size] = array[:size]
+                array = self._rows[key] = grown
+            array[size:needed] = rows[start:stop]
+            self._sizes[key] = needed
+
+    def truncate(self, stop):
+        """Forget rows from ``stop`` on; shrunk keys get fresh arrays"""
+        for key, array in list(self._rows.items()):
+            size = self._sizes[key]
+            kept = int(np.searchsorted(array[:size], stop))
+            if kept == size:
+                continue
+            if kept == 0:
+                del self._rows[key], self._sizes[key]
+            else:
+                # Copied so views handed out earlier keep their rows
+                self._rows[key] = array[:kept].copy()
+                self._sizes[key] = kept
+
+    def get(self, key):
+        """Read-only view of the row positions stored under ``key``"""
+        array = self._rows.get(key)
+        if array is None:
+            return np.empty(0, dtype=np.int32)
+        view = array[:self._sizes[key]]
+        view.flags.writeable = False
+        return view
+
+
+class MatchStore:
+    """Append-only typed columns for the match log.
+
+    Rows are appended in batches with :meth:`extend`, each row being a tuple
+    in :attr:`field_names` order. Capacity doubles as needed so appends are
+    amortised O(1). Per-team and per-pairing row indexes are updated with
+    every append so scans can visit only the relevant rows. The only way
+    back is :meth:`truncate`, which bumps :attr:`generation`.
+    """
+
+    def __init__(self, teams, capacity=1024):
+        self.teams = sorted(teams)
+        self.team_codes = {team: code for code, team in enumerate(self.teams)}
+        # pandas keeps int8 category codes for fewer than 128 teams, which
+        # lets team columns be wrapped without a copy
+        code_dtype = np.int8 if len(self.teams) < 128 else np.int16
+        self.fields = _fields(code_dtype)
+        self.field_names = [name for name, _ in self.fields]
+        self.team_dtype = pd.CategoricalDtype(self.teams)
+        self.generation = 0
+        # (generation, rows kept) of every truncation, for storage sync
+        self._truncations = []
+        self.cleared_generation = 0
+        self._size = 0
+        self._arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.fields}
+        self._team_index = RowIndex()
+        self._pair_index = RowIndex()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self):
+        return len(self._arrays["match_id"])
+
+    @property
+    def nbytes(self):
+        """Bytes used by the filled part of the store"""
+        return sum(array[:self._size].nbytes for array in self._arrays.values())
+
+    def _reserve(self, needed):
+        capacity = self.capacity
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._arrays.items():
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+
+    def extend(self, rows):
+        """Append a batch of row tuples in one assignment per column"""
+        if not rows:
+            return
+        start = self._size
+        stop = start + len(rows)
+        self._reserve(stop)
+        for name, values in zip(self.field_names, zip(*rows)):
+            self._arrays[name][start:stop] = values
+        self._size = stop
+        self._index_rows(start, stop)
+
+    def load_columns(self, columns):
+        """Bulk-append whole columns, e.g. when loading from disk"""
+        count = len(columns[self.field_names[0]])
+        start = self._size
+        self._reserve(start + count)
+        for name in self.field_names:
+            self._arrays[name][start:start + count] = columns[name]
+        self._size = start + count
+        self._index_rows(start, start + count)
+
+    def _index_rows(self, start, stop):
+        home = self._arrays["home"][start:stop].astype(np.int32)
+        away = self._arrays["away"][start:stop].astype(np.int32)
+        rows = np.arange(start, stop, dtype=np.int32)
+        self._team_index.add(np.concatenate([home, away]), np.concatenate([rows, rows]))
+        self._pair_index.add(self._pair_key(home, away), rows)
+
+    def _pair_key(self, first, second):
+        return np.minimum(first, second) * len(self.teams) + np.maximum(first, second)
+
+    def clear(self):
+        """Forget every row"""
+        self.truncate(0)
+        self.cleared_generation = self.generation
+
+    def truncate(self, stop):
+        """Drop the rows from ``stop`` on.
+
+        Columns are reallocated rather than overwritten later, so views and
+        frames handed out before keep their data.
+        """
+        stop = max(0, min(stop, self._size))
+        for name, array in self._arrays.items():
+            kept = np.zeros(len(array), dtype=array.dtype)
+            kept[:stop] = array[:stop]
+            self._arrays[name] = kept
+        self._size = stop
+        self.generation += 1
+        self._truncations.append((self.generation, stop))
+        if stop == 0:
+            self._team_index.clear()
+            self._pair_index.clear()
+        else:
+            self._team_index.truncate(stop)
+            self._pair_index.truncate(stop)
+
+    def rows_kept_since(self, generation):
+        """Rows untouched since ``generation``: the shortest truncation after it"""
+        kept = self._size
+        for truncated_generation, stop in self._truncations:
+            if truncated_generation > generation:
+                kept = min(kept, stop)
+        return kept
+
+    def column(self, name, start=0, stop=None):
+        """Read-only view of one column"""
+        stop = self._size if stop is None else min(stop, self._size)
+        view = self._arrays[name][start:stop]
+        view.flags.writeable = False
+        return view
+
+    def columns(self, start=0, stop=None):
+        """Read-only views of every column"""
+        return {name: self.column(name, start, stop) for name in self.field_names}
+
+    def team_rows(self, team):
+        """Row positions of every match a team played, oldest first"""
+        return self._team_index.get(self.team_codes[team])
+
+    def pair_rows(self, team, opponent):
+        """Row positions of every meeting between two teams, either venue"""
+        key = int(self._pair_key(self.team_codes[team], self.team_codes[opponent]))
+        return self._pair_index.get(key)
+
+    def team_categorical(self, codes):
+        """Wrap a code array as team-name categorical without copying"""
+        return pd.Categorical.from_codes(codes, dtype=self.team_dtype, validate=False)
+
+    def season_bounds(self, season):
+        """Row range ``(start, stop)`` holding a season; seasons are contiguous"""
+        seasons = self.column("season")
+        return (
+            int(np.searchsorted(seasons, season, side="left")),
+            int(np.searchsorted(seasons, season, side="right")),
+        )
@@ -0,0 +1,130 @@
+"""Optional wall-time instrumentation for dashboard reruns.
+
+A dashboard marks where each of its sections starts and wraps the helpers
+it wants timed; every rerun then yields one record of seconds and call
+counts per section and helper. Every ``LeagueEngine.cached`` lookup of the
+rerun is recorded too, as a memo hit or a memo miss with its compute time,
+including the lookups helpers make internally, and the hits that never
+call a wrapped helper. Nested misses each count their full time. The last
+``HISTORY_SIZE`` reruns are kept and can be shown in any Streamlit
+container and downloaded as CSV. While disabled every hook is a cheap no-op.
+"""
+
+import time
+from collections import deque
+from functools import wraps
+
+import pandas as pd
+
+from league_engine import observe_memo
+
+HISTORY_SIZE = 50
+
+HISTORY_COLUMNS = ["rerun", "kind", "name", "seconds", "calls"]
+
+
+class RerunProfiler:
+    """Per-rerun wall time and call counts for sections, helpers and memo lookups"""
+
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.enabled = False
+        self.history = deque(maxlen=history_size)
+        self.reruns = 0
+        self._current = None
+        self._section = None
+        self._section_started = 0.0
+        self._started = 0.0
+
+    def begin(self):
+        """Start recording a rerun; drops any rerun left unfinished"""
+        self._current = {} if self.enabled else None
+        self._section = None
+        self._started = time.perf_counter()
+        # Only this session's script thread reports into this profiler
+        observe_memo(self._memo_lookup if self.enabled else None)
+
+    def _record(self, kind, name, seconds):
+        entry = self._current.get((kind, name))
+        if entry is None:
+            entry = self._current[(kind, name)] = [0.0, 0]
+        entry[0] += seconds
+        entry[1] += 1
+
+    def _memo_lookup(self, name, hit, seconds):
+        if self._current is not None:
+            self._record("memo hit" if hit else "memo miss", name, seconds)
+
+    def mark(self, name):
+        """Close the running section and start timing ``name``"""
+        if self._current is None:
+            return
+        now = time.perf_counter()
+        if self._section is not None:
+            self._record("section", self._section, now - self._section_started)
+        self._section = name
+        self._section_started = now
+
+    def wrap(self, func):
+        """``func`` with its calls timed as a helper.
+
+        The wrapper keeps the wrapped name and module, so memo keys built
+        from them (``LeagueEngine.cached``) are unchanged.
+        """
+        @wraps(func)
+        def timed(*args, **kwargs):
+            if self._current is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                if self._current is not None:
+                    self._record("helper", func.__name__, time.perf_counter() - started)
+        return timed
+
+    def finish(self):
+        """Close the rerun and append it to the rolling history"""
+        observe_memo(None)
+        if self._current is None:
+            return
+        self.mark(None)
+        self.reruns += 1
+        rows = [
+            [self.reruns, kind, name, seconds, calls]
+            for (kind, name), (seconds, calls) in self._current.items()
+        ]
+        rows.append([self.reruns, "total", "Rerun", time.perf_counter() - self._started, 1])
+        self.history.append(rows)
+        self._current = None
+
+    def last_rerun(self):
+        """The most recent rerun as a DataFrame"""
+        rows = self.history[-1] if self.history else []
+        return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+    def history_frame(self):
+        """Every kept rerun, one row per section or helper"""
+        return pd.DataFrame([row for rows in self.history for row in rows], columns=HISTORY_COLUMNS)
+
+
+def render_timing_panel(panel, profiler):
+    """Fill a Streamlit container (e.g. a sidebar expander) with the timings"""
+    if not profiler.history:
+        panel.caption("Enable profiling and interact with the page to collect timings.")
+        return
+
+    last = profiler.last_rerun()
+    last["ms"] = (last["seconds"] * 1000).round(1)
+    panel.caption(f"Rerun #{profiler.reruns}")
+    panel.dataframe(last[["kind", "name", "ms", "calls"]], hide_index=True, use_container_width=True)
+
+    history = profiler.history_frame()
+    totals = history[history["kind"] == "total"].set_index("rerun")["seconds"] * 1000
+    panel.line_chart(totals.rename("rerun ms"), height=120)
+    panel.download_button(
+        "Download timing history",
+        data=history.to_csv(index=False),
+        file_name="rerun_timings.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
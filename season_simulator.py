@@ -0,0 +1,230 @@
+"""Monte Carlo simulation of the rest of the current season.
+
+Every fixture still to be played this season is priced once with the goal
+model's scoreline matrix (Dixon-Coles included), then whole seasons are
+drawn at once: a chunk of simulations is a ``(simulations, fixtures)``
+array of sampled scorelines, folded into per-team points, goal difference
+and goals for with two matrix products and ranked with the table's own
+order (Pts, GD, GF, then name). Chunks are spread over a process pool and
+each gets its own child seed, so a seed gives the same result for any
+number of workers.
+
+The remaining fixtures are the ordered pairs of the double round robin
+that have not been played this season yet:
+
+    python season_simulator.py --db league_data.db --simulations 100000 --seed 7
+    python season_simulator.py --synthetic 1 --played 200
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from goal_model import MAX_GOALS, fit_goal_model, score_matrices
+
+DEFAULT_SIMULATIONS = 100_000
+CHUNK_SIZE = 10_000
+TOP_PLACES = 4
+RELEGATION_PLACES = 3
+
+SIMULATION_COLUMNS = [
+    "Team", "P", "Pts", "Expected_Pts", "Expected_Pos", "Title_%", "Top4_%", "Relegation_%",
+]
+
+_SCORELINES = (MAX_GOALS + 1) ** 2
+# Scoreline cell -> home goals, away goals, home points, away points
+_CELL_HOME_GOALS, _CELL_AWAY_GOALS = (goals.astype(np.float64) for goals in np.divmod(np.arange(_SCORELINES), MAX_GOALS + 1))
+_CELL_HOME_POINTS = 3.0 * (_CELL_HOME_GOALS > _CELL_AWAY_GOALS) + (_CELL_HOME_GOALS == _CELL_AWAY_GOALS)
+_CELL_AWAY_POINTS = 3.0 * (_CELL_HOME_GOALS < _CELL_AWAY_GOALS) + (_CELL_HOME_GOALS == _CELL_AWAY_GOALS)
+
+
+def remaining_fixtures(engine):
+    """``(home, away)`` pairs not yet played in the current season"""
+    store = engine.store
+    start, stop = store.season_bounds(engine.season_number)
+    played = set(zip(store.column("home")[start:stop].tolist(), store.column("away")[start:stop].tolist()))
+    codes = store.team_codes
+    teams = sorted(engine.teams)
+    return [
+        (home, away)
+        for home in teams for away in teams
+        if home != away and (codes[home], codes[away]) not in played
+    ]
+
+
+def alias_tables(probabilities):
+    """Walker alias tables ``(accept, alias)`` for each row of ``probabilities``.
+
+    A draw picks a cell uniformly and keeps it with probability
+    ``accept``, otherwise takes its ``alias``: O(1) per sample whatever
+    the number of scorelines.
+    """
+    rows, cells = probabilities.shape
+    accept = np.ones((rows, cells))
+    alias = np.tile(np.arange(cells), (rows, 1))
+    for row_accept, row_alias, scaled in zip(accept, alias, (probabilities * cells).tolist()):
+        small = [cell for cell, weight in enumerate(scaled) if weight < 1]
+        large = [cell for cell, weight in enumerate(scaled) if weight >= 1]
+        while small and large:
+            cell, donor = small.pop(), large[-1]
+            row_accept[cell] = scaled[cell]
+            row_alias[cell] = donor
+            scaled[donor] -= 1 - scaled[cell]
+            if scaled[donor] < 1:
+                small.append(large.pop())
+    return accept, alias
+
+
+def _simulate_chunk(task):
+    """Position counts and points total of one chunk of simulations"""
+    accept, alias, home, away, base, simulations, seed = task
+    rng = np.random.default_rng(seed)
+    fixtures = len(home)
+    size = len(base["points"])
+
+    # One uniform per match: its integer part picks the cell, the fraction decides alias or not
+    offsets = np.arange(fixtures)
+    draws = rng.random((simulations, fixtures)) * _SCORELINES
+    cell = draws.astype(np.intp)
+    np.minimum(cell, _SCORELINES - 1, out=cell)
+    flat = cell + offsets * _SCORELINES
+    scoreline = np.where(draws - cell < accept.ravel()[flat], cell, alias.ravel()[flat])
+    home_goals = _CELL_HOME_GOALS[scoreline]
+    away_goals = _CELL_AWAY_GOALS[scoreline]
+
+    # Fixture -> team incidence, so per-team totals are matrix products
+    home_of = np.zeros((fixtures, size))
+    home_of[offsets, home] = 1
+    away_of = np.zeros((fixtures, size))
+    away_of[offsets, away] = 1
+    points = base["points"] + _CELL_HOME_POINTS[scoreline] @ home_of + _CELL_AWAY_POINTS[scoreline] @ away_of
+    goals_for = base["goals_for"] + home_goals @ home_of + away_goals @ away_of
+    goal_difference = base["goal_difference"] + (home_goals - away_goals) @ (home_of - away_of)
+
+    # Same order as the league table; the name tie-break is the sort order
+    key = ((points * 2048 + goal_difference + 1024) * 2048 + goals_for) * size + base["name_rank"]
+    order = np.argsort(-key, axis=1, kind="stable")
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(size)[None, :], axis=1)
+    counts = np.bincount((np.arange(size) * size + positions).ravel(), minlength=size * size)
+    return counts.reshape(size, size), points.sum(axis=0)
+
+
+def simulate_season(engine, simulations=DEFAULT_SIMULATIONS, seed=None, workers=None, goal_model=None):
+    """Finishing-position probabilities of every team over ``simulations`` seasons.
+
+    Returns a dict with the ``table`` DataFrame (SIMULATION_COLUMNS, best
+    expected points first), the ``positions`` matrix (team x position
+    probabilities), the number of ``fixtures`` simulated and ``seconds``.
+    """
+    started = time.perf_counter()
+    goal_model = goal_model or engine.cached(fit_goal_model)
+    teams = sorted(engine.teams)
+    size = len(teams)
+    index = {team: i for i, team in enumerate(teams)}
+    fixtures = remaining_fixtures(engine)
+
+    stats = engine.team_stats
+    base = {
+        "points": np.array([stats[team]["Pts"] for team in teams], dtype=np.float64),
+        "goals_for": np.array([stats[team]["GF"] for team in teams], dtype=np.float64),
+        "goal_difference": np.array([stats[team]["GD"] for team in teams], dtype=np.float64),
+        # Earlier names rank higher on a full tie, as in LeagueRanking
+        "name_rank": np.arange(size - 1, -1, -1, dtype=np.float64),
+    }
+    home = np.array([index[home] for home, _ in fixtures], dtype=np.intp)
+    away = np.array([index[away] for _, away in fixtures], dtype=np.intp)
+    if fixtures:
+        matrices = score_matrices(goal_model, [pair[0] for pair in fixtures], [pair[1] for pair in fixtures])
+        accept, alias = alias_tables(matrices.reshape(len(fixtures), -1))
+    else:
+        accept, alias = np.ones((0, _SCORELINES)), np.zeros((0, _SCORELINES), dtype=np.intp)
+
+    chunks = [CHUNK_SIZE] * (simulations // CHUNK_SIZE)
+    if simulations % CHUNK_SIZE:
+        chunks.append(simulations % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    tasks = [(accept, alias, home, away, base, chunk, child) for chunk, child in zip(chunks, seeds)]
+    workers = min(workers or os.cpu_count() or 1, len(tasks) or 1)
+    if workers == 1:
+        results = list(map(_simulate_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_simulate_chunk, tasks))
+
+    counts = sum(result[0] for result in results)
+    positions = counts / simulations
+    expected_points = sum(result[1] for result in results) / simulations
+    places = np.arange(1, size + 1)
+    relegated = max(0, min(RELEGATION_PLACES, size - 1))
+    table = pd.DataFrame({
+        "Team": teams,
+        "P": [stats[team]["P"] for team in teams],
+        "Pts": [stats[team]["Pts"] for team in teams],
+        "Expected_Pts": expected_points.round(1),
+        "Expected_Pos": (positions @ places).round(1),
+        "Title_%": (positions[:, 0] * 100).round(1),
+        "Top4_%": (positions[:, :TOP_PLACES].sum(axis=1) * 100).round(1),
+        "Relegation_%": (positions[:, size - relegated:].sum(axis=1) * 100).round(1),
+    }, columns=SIMULATION_COLUMNS)
+    table = table.sort_values(["Expected_Pts", "Expected_Pos"], ascending=[False, True], kind="stable")
+    return {
+        "table": table.reset_index(drop=True),
+        "positions": pd.DataFrame(positions, index=teams, columns=places),
+        "fixtures": len(fixtures),
+        "simulations": simulations,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate the rest of the current season")
+    parser.add_argument("--db", default="league_data.db", help="SQLite file of the default league")
+    parser.add_argument("--league", default=None, help="league key from the registry")
+    parser.add_argument("--synthetic", type=int, metavar="SEASONS",
+                        help="simulate generated seasons instead of a database")
+    parser.add_argument("--played", type=int, default=190,
+                        help="matches of the last synthetic season to keep (with --synthetic)")
+    parser.add_argument("--simulations", type=int, default=DEFAULT_SIMULATIONS)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    from league_registry import DEFAULT_LEAGUE, league_db_path, load_leagues, new_engine
+
+    league_key = args.league or DEFAULT_LEAGUE
+    leagues = load_leagues()
+    if league_key not in leagues:
+        raise SystemExit(f"Unknown league {league_key!r} (known: {', '.join(leagues)})")
+    engine = new_engine(leagues[league_key])
+    if args.synthetic:
+        from synthetic_league import generate_matches
+
+        matches = generate_matches(args.synthetic, args.seed or 0, leagues[league_key]["teams"])
+        season_matches = len(matches) // args.synthetic
+        engine.ingest(matches[:len(matches) - season_matches + args.played])
+    else:
+        from league_storage import LeagueStorage
+
+        path = league_db_path(args.db, league_key)
+        if not os.path.exists(path):
+            raise SystemExit(f"No database at {path}")
+        storage = LeagueStorage(path)
+        try:
+            storage.load(engine)
+        finally:
+            storage.close()
+
+    result = simulate_season(engine, args.simulations, args.seed, args.workers)
+    print(f"Season {engine.season_number}: {result['fixtures']} fixtures left, "
+          f"{result['simulations']:,} simulations in {result['seconds']:.2f}s")
+    print(result["table"].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
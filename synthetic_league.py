@@ -0,0 +1,94 @@
+"""Seeded synthetic league generator for benchmarks and demos.
+
+Each season is a double round robin (every team hosts every other team
+once), so with 20 teams a season is 38 rounds of 10 matches and every team
+plays exactly ``SEASON_LENGTH`` games. Scores are Poisson draws from
+per-team attack/defence strengths that drift a little between seasons.
+The same seed always yields the same matches and the same feed text.
+"""
+
+import numpy as np
+
+from league_engine import VALID_TEAMS
+
+HOME_ADVANTAGE = 0.25
+BASE_GOAL_RATE = 0.2  # log goals per team per match before strengths
+MAX_GOALS = 9
+
+
+def round_robin(teams, rng):
+    """Rounds of ``(home, away)`` pairs for one double round robin"""
+    teams = list(teams)
+    rng.shuffle(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    n = len(teams)
+    first_half = []
+    for _ in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = teams[i], teams[n - 1 - i]
+            if home is not None and away is not None:
+                # Alternate venues so no team is always at home
+                pairs.append((home, away) if (i + len(first_half)) % 2 else (away, home))
+        first_half.append(pairs)
+        # Circle method: keep the first team fixed, rotate the rest
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    second_half = [[(away, home) for home, away in pairs] for pairs in first_half]
+    return first_half + second_half
+
+
+def generate_matches(seasons, seed=0, teams=VALID_TEAMS):
+    """Oldest-first ``[home, home_score, away_score, away]`` for ``seasons`` seasons"""
+    rng = np.random.default_rng(seed)
+    teams = sorted(teams)
+    attack = dict(zip(teams, rng.normal(0, 0.2, len(teams))))
+    defence = dict(zip(teams, rng.normal(0, 0.2, len(teams))))
+
+    matches = []
+    for _ in range(seasons):
+        rounds = round_robin(teams, rng)
+        pairs = [pair for pairs in rounds for pair in pairs]
+        home_rate = np.array([
+            np.exp(BASE_GOAL_RATE + HOME_ADVANTAGE + attack[home] - defence[away]) for home, away in pairs
+        ])
+        away_rate = np.array([
+            np.exp(BASE_GOAL_RATE + attack[away] - defence[home]) for home, away in pairs
+        ])
+        home_goals = np.minimum(rng.poisson(home_rate), MAX_GOALS).tolist()
+        away_goals = np.minimum(rng.poisson(away_rate), MAX_GOALS).tolist()
+        matches.extend(
+            [home, home_score, away_score, away]
+            for (home, away), home_score, away_score in zip(pairs, home_goals, away_goals)
+        )
+        for team in teams:
+            attack[team] = 0.9 * attack[team] + rng.normal(0, 0.05)
+            defence[team] = 0.9 * defence[team] + rng.normal(0, 0.05)
+    return matches
+
+
+def generate_feed(matches, seed=0, first_week=1, matches_per_week=10, header="English League"):
+    """Raw feed text for ``matches``, newest first like a real paste.
+
+    Every match is followed by the ``<header> WEEK nn - #id`` line
+    and kick-off time lines that the feed parser has to skip.
+    """
+    rng = np.random.default_rng(seed)
+    hours = rng.integers(1, 13, len(matches)).tolist()
+    minutes = rng.integers(0, 60, len(matches)).tolist()
+    lines = []
+    for position in range(len(matches) - 1, -1, -1):
+        home, home_score, away_score, away = matches[position]
+        week = first_week + position // matches_per_week
+        lines += [
+            home, str(home_score), str(away_score), away,
+            f"{header} WEEK {week} - #2025{week:04d}{position % matches_per_week:02d}",
+            f"{hours[position]}:{minutes[position]:02d} pm",
+        ]
+    return "\n".join(lines)
+
+
+def generate_league(seasons, seed=0, teams=VALID_TEAMS):
+    """Structured matches plus the equivalent raw feed text"""
+    matches = generate_matches(seasons, seed, teams)
+    return matches, generate_feed(matches, seed)
@@ -0,0 +1,39 @@
+import json
+
+from league_engine import LeagueEngine
+from synthetic_league import generate_matches
+
+
+def engine_state(engine):
+    """Everything a rebuild, edit or reload has to reproduce"""
+    return {
+        "season_number": engine.season_number,
+        "match_counter": engine.match_counter,
+        "season_state": engine.season_state(),
+        "rows": engine.match_rows(),
+        "rankings": [team for team, _ in engine.calculate_rankings()],
+        "pattern_stats": json.dumps(engine.pattern_stats, sort_keys=True),
+        "elo": dict(engine.elo),
+        "pair_stats": engine.pair_stats.tolist(),
+    }
+
+
+def ingest_batches(engine, matches, size=137):
+    for start in range(0, len(matches), size):
+        engine.ingest(matches[start:start + size])
+
+
+def built_engine():
+    """900 matches in uneven batches, a manual season reset, then one more batch"""
+    matches = generate_matches(3, 5)
+    engine = LeagueEngine()
+    ingest_batches(engine, matches[:900])
+    engine.reset_season()
+    engine.ingest(matches[900:1100])
+    return engine
+
+
+def replayed(events, season_number):
+    engine = LeagueEngine()
+    engine.replay(events, season_number)
+    return engine
@@ -0,0 +1,91 @@
+import json
+import os
+
+import pytest
+
+from alert_backtest import DEFAULT_THRESHOLDS, backtest_alerts, load_engine, summarize
+from helpers import engine_state
+from league_analytics import ALERT_HORIZONS, alert_kind
+from league_engine import LeagueEngine
+from league_registry import league_config, new_engine
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+def reference_firings(engine, thresholds=DEFAULT_THRESHOLDS):
+    """Firings from a per-team walk: a hit is the counter falling to 0 within the horizon"""
+    f4_alert, f4_critical, s3_alert, s3_critical = thresholds
+    store = engine.store
+    columns = {name: store.column(name).tolist() for name in
+               ("season", "match_id", "home", "away", "ha_home", "ha_away", "s3_home", "s3_away")}
+    runs = {}
+    for row, season in enumerate(columns["season"]):
+        for side in ("home", "away"):
+            team = store.teams[columns[side][row]]
+            counters = {"f4": columns["ha_" + side][row], "s3": columns["s3_" + side][row]}
+            runs.setdefault((season, team), []).append((columns["match_id"][row], counters))
+
+    firings = set()
+    for (season, team), run in runs.items():
+        for index, (match_id, counters) in enumerate(run):
+            for family, alert, critical in (("f4", f4_alert, f4_critical), ("s3", s3_alert, s3_critical)):
+                kind = alert_kind(counters[family], alert, critical, family)
+                if kind is None:
+                    continue
+                ahead = [later[family] for _, later in run[index + 1:index + 1 + ALERT_HORIZONS[kind]]]
+                hit = 0 in ahead
+                evaluated = hit or len(ahead) == ALERT_HORIZONS[kind]
+                firings.add((season, match_id, team, kind, counters[family], hit, evaluated))
+    return firings
+
+
+def backtested(engine, workers):
+    firings = backtest_alerts(engine, workers)
+    columns = ["season", "match_id", "team", "kind", "counter", "hit", "evaluated"]
+    return set(firings[columns].itertuples(index=False, name=None))
+
+
+@pytest.mark.parametrize("status3_exact", [False, True])
+def test_backtest_hits_match_a_per_team_walk(status3_exact):
+    engine = LeagueEngine(status3_exact=status3_exact)
+    engine.ingest(generate_matches(3, 12)[:1000])
+    expected = reference_firings(engine)
+    assert expected
+    assert backtested(engine, 1) == expected
+    assert backtested(engine, 2) == expected
+
+
+def test_summary_counts_the_evaluated_firings_and_hits_per_kind():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 12)[:700])
+    summary = summarize(backtest_alerts(engine, 1)).set_index("kind")
+    for kind in summary.index:
+        firings = [firing for firing in reference_firings(engine) if firing[3] == kind]
+        assert summary.loc[kind, "firings"] == len(firings)
+        assert summary.loc[kind, "evaluated"] == sum(firing[6] for firing in firings)
+        assert summary.loc[kind, "hits"] == sum(firing[5] for firing in firings)
+
+
+def test_load_engine_reads_the_leagues_own_file_read_only(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "league.db")
+    leagues_path = str(tmp_path / "leagues.json")
+    teams = ["Barcelona", "Madrid", "Sevilla", "Valencia"]
+    with open(leagues_path, "w", encoding="utf-8") as handle:
+        json.dump({"spanish": {"name": "Spanish League", "teams": teams}}, handle)
+    saved = new_engine(league_config("spanish", "Spanish League", teams))
+    saved.ingest(generate_matches(3, 2, teams))
+    LeagueStorage(str(tmp_path / "league_spanish.db")).save(saved)
+    opened = []
+
+    def storage(path, read_only=False):
+        opened.append((os.path.basename(path), read_only))
+        return LeagueStorage(path, read_only)
+
+    monkeypatch.setattr("league_storage.LeagueStorage", storage)
+    loaded = load_engine(db_path, league="spanish", leagues_path=leagues_path)
+    assert opened == [("league_spanish.db", True)]
+    assert engine_state(loaded) == engine_state(saved)
+    assert loaded.season_length == 6
+    with pytest.raises(FileNotFoundError, match="league.db"):
+        load_engine(db_path, leagues_path=leagues_path)
+    assert not os.path.exists(db_path)
@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import hashlib
+import http.client
+import json
+import os
+import sqlite3
+import threading
+
+import pytest
+
+from api_server import LeagueService, serve
+from league_engine import LeagueEngine
+from league_registry import DEFAULT_LEAGUE, LEAGUES, league_config
+from league_storage import LeagueStorage
+from match_predictor import match_prediction
+from synthetic_league import generate_matches
+
+
+def respond(service, target, headers=None, method="GET"):
+    return asyncio.run(service.respond(method, target, headers or {}))
+
+
+@pytest.fixture
+def service():
+    service = LeagueService(None)
+    service.registry.engine(DEFAULT_LEAGUE).ingest(generate_matches(1, 8)[:200])
+    return service
+
+
+def test_etag_follows_the_data(service):
+    status, body, etag = respond(service, "/table")
+    assert status == 200
+    assert json.loads(body)["matches"] == 200
+    assert respond(service, "/table", {"if-none-match": etag}) == (304, b"", etag)
+    assert respond(service, "/table", {"if-none-match": f'"other", W/{etag}'})[0] == 304
+    service.registry.engine(DEFAULT_LEAGUE).ingest(generate_matches(1, 8)[200:210])
+    status, body, new_etag = respond(service, "/table", {"if-none-match": etag})
+    assert (status, json.loads(body)["matches"]) == (200, 210)
+    assert new_etag != etag
+
+
+def test_prediction_matches_the_predictor(service):
+    status, body, _ = respond(service, "/predict?home=Leeds&away=Wolves")
+    assert status == 200
+    engine = service.registry.engine(DEFAULT_LEAGUE)
+    assert json.loads(body)["prediction"] == json.loads(json.dumps(match_prediction(engine, "Leeds", "Wolves")))
+
+
+@pytest.mark.parametrize("target, status, error", [
+    ("/predict?home=Leeds", 400, "missing query parameter(s): away"),
+    ("/predict?home=Leeds&away=Madrid", 400, "unknown team(s): Madrid"),
+    ("/predict?home=Leeds&away=Leeds", 400, "home and away must differ"),
+    ("/table?league=spanish", 404, "unknown league 'spanish'"),
+    ("/standings", 404, "unknown path /standings"),
+])
+def test_bad_requests_are_refused(service, target, status, error):
+    result, body, _ = respond(service, target)
+    assert (result, json.loads(body)["error"]) == (status, error)
+
+
+def test_writes_are_refused(service):
+    assert respond(service, "/table", method="POST")[0] == 405
+
+
+@contextlib.contextmanager
+def serving(service):
+    """``serve`` on a free port in a thread; yields the port"""
+    loop = asyncio.new_event_loop()
+    ports = []
+    task = loop.create_task(serve(service, port=0, ready=ports.append))
+
+    def run():
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+        loop.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    while not ports:
+        thread.join(0.01)
+    try:
+        yield ports[0]
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(5)
+
+
+def test_http_304_has_no_body_or_content_length(service):
+    with serving(service) as port:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        connection.request("GET", "/alerts")
+        response = connection.getresponse()
+        body = response.read()
+        assert int(response.getheader("Content-Length")) == len(body) > 0
+        # The same keep-alive connection revalidates
+        connection.request("GET", "/alerts", headers={"If-None-Match": response.getheader("ETag")})
+        response = connection.getresponse()
+        assert response.status == 304
+        assert response.getheader("Content-Length") is None
+        assert response.read() == b""
+        connection.close()
+
+
+def digest(path):
+    with open(path, "rb") as handle:
+        return hashlib.sha256(handle.read()).hexdigest()
+
+
+def test_service_reads_the_database_without_touching_it(tmp_path):
+    path = str(tmp_path / "league.db")
+    matches = generate_matches(1, 8)
+    engine = LeagueEngine()
+    engine.ingest(matches[:100])
+    writer = LeagueStorage(path)
+    writer.save(engine)
+    before = digest(path)
+
+    leagues = dict(LEAGUES, spanish=league_config("spanish", "Spanish League", ["Madrid", "Sevilla"]))
+    service = LeagueService(path, leagues, refresh_seconds=0)
+    assert json.loads(respond(service, "/table")[1])["matches"] == 100
+    assert digest(path) == before
+    # A league without a file is served empty and no file is created
+    assert json.loads(respond(service, "/table?league=spanish")[1])["matches"] == 0
+    assert not os.path.exists(tmp_path / "league_spanish.db")
+    served = service.registry.engine(DEFAULT_LEAGUE)
+    served.ingest(matches[100:101])
+    with pytest.raises(sqlite3.OperationalError, match="readonly"):
+        service._storages[DEFAULT_LEAGUE].save(served)
+    assert digest(path) == before
+
+    engine.ingest(matches[100:120])
+    writer.save(engine)
+    assert json.loads(respond(service, "/table")[1])["matches"] == 120
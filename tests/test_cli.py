@@ -0,0 +1,48 @@
+import os
+
+import pandas as pd
+import pytest
+
+import cli
+from synthetic_league import generate_feed, generate_matches
+
+
+@pytest.fixture
+def feeds(tmp_path):
+    directory = tmp_path / "feeds"
+    directory.mkdir()
+    matches = generate_matches(1, 7)
+    for week in range(3):
+        text = generate_feed(matches[week * 40:(week + 1) * 40], week)
+        (directory / f"week{week + 1}.txt").write_text(text, encoding="utf-8")
+    return directory
+
+
+def run(tmp_path, *argv):
+    return cli.main([*argv, "--db", str(tmp_path / "league.db"), "--out", str(tmp_path / "reports")])
+
+
+def test_ingest_imports_each_feed_file_once(tmp_path, feeds, capsys):
+    assert run(tmp_path, "ingest", str(feeds)) == 0
+    assert "imported 120 matches from 3 new file(s)" in capsys.readouterr().out
+    assert run(tmp_path, "ingest", str(feeds)) == 0
+    assert "imported 0 matches from 0 new file(s)" in capsys.readouterr().out
+
+    (feeds / "week4.txt").write_text(generate_feed(generate_matches(1, 7)[120:150], 3), encoding="utf-8")
+    assert run(tmp_path, "ingest", str(feeds)) == 0
+    assert "imported 30 matches from 1 new file(s)" in capsys.readouterr().out
+    table = pd.read_csv(tmp_path / "reports" / "matches.csv")
+    assert len(table) == 150
+
+
+def test_report_needs_an_existing_database(tmp_path, feeds):
+    with pytest.raises(SystemExit, match="No league database"):
+        run(tmp_path, "report")
+    assert not os.path.exists(tmp_path / "league.db")
+
+    run(tmp_path, "ingest", str(feeds), "--no-reports")
+    assert not os.path.exists(tmp_path / "reports")
+    assert run(tmp_path, "report") == 0
+    assert sorted(os.listdir(tmp_path / "reports")) == [
+        "alerts.csv", "fixture_predictions.csv", "league_table.csv", "matches.csv", "season_1_matches.csv",
+    ]
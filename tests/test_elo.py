@@ -0,0 +1,58 @@
+import sqlite3
+
+import numpy as np
+
+from helpers import engine_state
+from league_engine import LeagueEngine, replay_elo
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+def elo_columns(engine):
+    return engine.store.column("home_elo").tolist(), engine.store.column("away_elo").tolist()
+
+
+def test_incremental_ratings_equal_a_replay_of_the_log():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 17)[:600])
+    store = engine.store
+    home_elo, away_elo, ratings = replay_elo(
+        store.column("home"), store.column("away"), store.column("home_score"), store.column("away_score"),
+        len(store.teams),
+    )
+    assert (home_elo.tolist(), away_elo.tolist()) == elo_columns(engine)
+    assert {team: ratings[store.team_codes[team]] for team in engine.teams} == engine.elo
+    history = engine.elo_history("Leeds")
+    assert history.iloc[-1] == engine.elo["Leeds"]
+    assert history.index.tolist() == store.team_rows("Leeds").tolist()
+
+
+def test_ratings_continue_identically_after_a_float32_round_trip(tmp_path):
+    path = str(tmp_path / "league.db")
+    matches = generate_matches(2, 17)
+    engine = LeagueEngine()
+    engine.ingest(matches[:500])
+    LeagueStorage(path).save(engine)
+    restored = LeagueEngine()
+    LeagueStorage(path).load(restored)
+    assert restored.elo == engine.elo
+    assert all(np.float32(rating) == rating for rating in restored.elo.values())
+    engine.ingest(matches[500:700])
+    restored.ingest(matches[500:700])
+    assert elo_columns(restored) == elo_columns(engine)
+    assert restored.elo == engine.elo
+
+
+def test_ratings_missing_from_an_older_file_are_replayed(tmp_path):
+    path = str(tmp_path / "league.db")
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(1, 17)[:300])
+    LeagueStorage(path).save(engine)
+    # Files written before ratings were tracked have no rating columns to read
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE matches SET home_elo = NULL, away_elo = NULL")
+    conn.commit()
+    conn.close()
+    restored = LeagueEngine()
+    LeagueStorage(path).load(restored)
+    assert engine_state(restored) == engine_state(engine)
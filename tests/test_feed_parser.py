@@ -0,0 +1,81 @@
+import pytest
+
+from feed_parser import FeedParser, clean_and_parse_matches
+from synthetic_league import generate_feed, generate_matches
+
+
+def test_generated_feed_parses_back_oldest_first():
+    matches = generate_matches(1, 3)
+    parsed, errors, cleaned = clean_and_parse_matches(generate_feed(matches, 3))
+    assert parsed == matches
+    assert errors == []
+    assert len(cleaned) == 4 * len(matches)
+
+
+def test_headers_times_ids_and_blank_lines_are_skipped():
+    text = "\n".join([
+        "",
+        "English League WEEK 12 - #202500120",
+        "Leeds",
+        "   ",
+        "2",
+        "1",
+        "Wolves",
+        "7:45 pm",
+        "202501234567",
+        "#2025",
+        "",
+    ])
+    assert clean_and_parse_matches(text) == ([["Leeds", 2, 1, "Wolves"]], [], ["Leeds", "2", "1", "Wolves"])
+
+
+def test_newest_first_feed_is_reversed():
+    text = "Leeds\n1\n0\nWolves\nFulham\n3\n3\nBurnley"
+    matches, _, _ = clean_and_parse_matches(text)
+    assert matches == [["Fulham", 3, 3, "Burnley"], ["Leeds", 1, 0, "Wolves"]]
+
+
+def test_team_names_are_found_in_free_text():
+    text = "Manchester Reds (H)\n2\n2\nfull time: Manchester Blue won't like that"
+    matches, errors, _ = clean_and_parse_matches(text)
+    assert matches == [["Manchester Reds", 2, 2, "Manchester Blue"]]
+    assert errors == []
+
+
+@pytest.mark.parametrize("raw, score", [("0", 0), ("007", 7), ("20", 20)])
+def test_scores_up_to_the_maximum_are_kept(raw, score):
+    matches, _, _ = clean_and_parse_matches(f"Leeds\n{raw}\n1\nWolves")
+    assert matches == [["Leeds", score, 1, "Wolves"]]
+
+
+def test_scores_above_the_maximum_are_dropped():
+    matches, errors, cleaned = clean_and_parse_matches("Leeds\n21\n1\nWolves")
+    assert matches == []
+    assert cleaned == ["Leeds", "1", "Wolves"]
+    assert errors == ["Incomplete match at position 1"]
+
+
+def test_misaligned_group_is_reported_and_skipped():
+    text = "Leeds\nWolves\n1\n2\nFulham\n0\n0\nBurnley"
+    matches, errors, _ = clean_and_parse_matches(text)
+    assert matches == [["Fulham", 0, 0, "Burnley"]]
+    assert errors == ["Invalid away team: 2", "Non-numeric home score: Wolves"]
+
+
+def test_unknown_lines_are_ignored():
+    text = "Leeds\n1\nGoal!\nReal Madrid\n1\nWolves"
+    assert clean_and_parse_matches(text)[0] == [["Leeds", 1, 1, "Wolves"]]
+
+
+def test_incomplete_trailing_match_is_an_error():
+    matches, errors, _ = clean_and_parse_matches("Leeds\n1\n1\nWolves\nFulham\n2")
+    assert matches == [["Leeds", 1, 1, "Wolves"]]
+    assert errors == ["Incomplete match at position 5"]
+
+
+def test_parser_uses_its_league_teams_and_header():
+    parser = FeedParser(["Sevilla", "Valencia"], header="Spanish League")
+    text = "Spanish League WEEK 1 - #1\nSevilla\n1\n0\nValencia\nLeeds"
+    matches, errors, _ = clean_and_parse_matches(text, parser)
+    assert matches == [["Sevilla", 1, 0, "Valencia"]]
+    assert errors == []
@@ -0,0 +1,70 @@
+import json
+
+import numpy as np
+import pytest
+
+from goal_model import (
+    DEFAULT_AWAY_RATE, DEFAULT_HOME_RATE, expected_goals, fit_goal_model, market_probabilities, score_matrices,
+)
+from league_engine import LeagueEngine
+from match_predictor import PERCENT_MARKETS, fixture_predictions, match_prediction, predict_match_outcome
+
+
+def _engine(matches):
+    engine = LeagueEngine()
+    engine.ingest(matches)
+    return engine
+
+
+def _assert_finite_model(model):
+    assert np.isfinite(model["attack"]).all()
+    assert np.isfinite(model["defence"]).all()
+    assert np.isfinite([model["home"], model["base"], model["rho"]]).all()
+
+
+@pytest.mark.parametrize("matches", [[], [["Leeds", 0, 0, "Wolves"]] * 3])
+def test_empty_or_goalless_log_gives_default_rates(matches):
+    model = fit_goal_model(_engine(matches))
+    _assert_finite_model(model)
+    assert model["rho"] == 0.0
+    home_rate, away_rate = expected_goals(model, ["Leeds"], ["Wolves"])
+    assert home_rate[0] == pytest.approx(DEFAULT_HOME_RATE)
+    assert away_rate[0] == pytest.approx(DEFAULT_AWAY_RATE)
+
+
+def test_goalless_log_predictions_are_valid_json():
+    engine = _engine([["Leeds", 0, 0, "Wolves"]] * 3)
+    prediction = match_prediction(engine, "Leeds", "Wolves")
+    assert all(np.isfinite(prediction[key]) for key in PERCENT_MARKETS)
+    json.dumps(prediction, allow_nan=False)
+
+
+def test_no_home_goals_still_prices_every_fixture():
+    engine = _engine([["Leeds", 0, 2, "Wolves"], ["Wolves", 0, 1, "Leeds"]])
+    _assert_finite_model(fit_goal_model(engine))
+    for prediction in fixture_predictions(engine).values():
+        assert all(np.isfinite(prediction[key]) for key in PERCENT_MARKETS)
+
+
+def test_score_matrices_are_distributions():
+    engine = _engine([["Leeds", 3, 1, "Wolves"], ["Wolves", 2, 2, "Leeds"], ["Leeds", 0, 1, "Everton"]])
+    model = fit_goal_model(engine)
+    matrices = score_matrices(model, ["Leeds", "Wolves"], ["Wolves", "Everton"])
+    assert (matrices >= 0).all()
+    assert matrices.sum(axis=(1, 2)) == pytest.approx([1.0, 1.0])
+    markets = market_probabilities(matrices)
+    assert markets["home_win"] + markets["draw"] + markets["away_win"] == pytest.approx([1.0, 1.0])
+
+
+def test_predict_match_outcome_keeps_its_return_contract():
+    engine = _engine([["Leeds", 3, 1, "Wolves"], ["Wolves", 2, 2, "Leeds"]])
+    model = fit_goal_model(engine)
+    prediction = predict_match_outcome("Leeds", "Wolves", goal_model=model)
+    for key in [*PERCENT_MARKETS, "expected_goals", "predicted_score"]:
+        assert key in prediction
+    home, away = prediction["predicted_score"].split("-")
+    assert float(home) == pytest.approx(prediction["home_expected_goals"], abs=0.05)
+    assert float(away) == pytest.approx(prediction["away_expected_goals"], abs=0.05)
+    assert prediction["likely_score"].count("-") == 1
+    with pytest.raises(TypeError):
+        predict_match_outcome("Leeds", "Wolves", {})
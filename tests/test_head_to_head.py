@@ -0,0 +1,58 @@
+import numpy as np
+
+from helpers import built_engine
+from league_analytics import create_head_to_head_stats, head_to_head_matrix
+from league_engine import PAIR_FIELDS, LeagueEngine
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+def scanned_pair_stats(engine):
+    """The pair counters recounted match by match from the logged events"""
+    codes = engine.store.team_codes
+    counts = np.zeros((len(PAIR_FIELDS), len(codes), len(codes)), dtype=np.int64)
+    for _, (home, home_score, away_score, away) in engine.logged_events():
+        total = home_score + away_score
+        values = (1, home_score > away_score, home_score < away_score, home_score == away_score,
+                  total, total > 2, total > 3, home_score > 0 and away_score > 0)
+        for field, value in enumerate(values):
+            counts[field, codes[home], codes[away]] += value
+    return counts
+
+
+def test_pair_stats_follow_ingest_edits_and_reloads(tmp_path):
+    engine = built_engine()
+    assert np.array_equal(engine.pair_stats, scanned_pair_stats(engine))
+    engine.delete_match(250)
+    _, (home, _, _, away) = engine.logged_events(600, 601)[0]
+    engine.correct_match(600, [home, 5, 1, away])
+    engine.undo_last_batch()
+    assert np.array_equal(engine.pair_stats, scanned_pair_stats(engine))
+
+    path = str(tmp_path / "league.db")
+    LeagueStorage(path).save(engine)
+    restored = LeagueEngine()
+    LeagueStorage(path).load(restored)
+    assert np.array_equal(restored.pair_stats, engine.pair_stats)
+
+
+def test_head_to_head_views_match_a_log_scan():
+    engine = LeagueEngine()
+    matches = generate_matches(3, 19)[:1000]
+    engine.ingest(matches)
+    meetings = [match for match in matches if {match[0], match[3]} == {"Leeds", "Wolves"}]
+    stats = create_head_to_head_stats(engine, "Leeds", "Wolves")
+    assert stats["total_matches"] == len(meetings)
+    leeds_wins = sum(
+        (home_score > away_score) == (home == "Leeds") and home_score != away_score
+        for home, home_score, away_score, _ in meetings
+    )
+    assert stats["home_wins"] == leeds_wins
+    scores = [(home_score, away_score) for _, home_score, away_score, _ in meetings]
+    assert stats["draws"] == sum(home_score == away_score for home_score, away_score in scores)
+    assert stats["both_teams_score"] == sum(home_score > 0 and away_score > 0 for home_score, away_score in scores)
+
+    wins = head_to_head_matrix(engine, "wins")
+    assert wins.loc["Leeds", "Wolves"] == leeds_wins
+    assert wins.equals(head_to_head_matrix(engine, "losses").T.rename_axis(index="Team", columns="Opponent"))
+    assert create_head_to_head_stats(engine, "Leeds", "Leeds") is None
@@ -0,0 +1,202 @@
+import pytest
+
+from league_engine import MATCH_COLUMNS, VALID_TEAMS, LeagueEngine, get_alert_symbols_and_reason
+from synthetic_league import generate_matches
+
+
+def reference_reset(state):
+    """The dashboards' reset_league_for_new_season"""
+    teams = sorted(state["teams"])
+    state["team_stats"] = {
+        team: {"P": 0, "W": 0, "D": 0, "L": 0, "GF": 0, "GA": 0, "GD": 0, "Pts": 0, "Form": []}
+        for team in teams
+    }
+    for name in ("home_counters", "away_counters", "ha_counters", "status3_counters"):
+        state[name] = {team: 0 for team in teams}
+    state["season_number"] += 1
+    state["match_counter"] = 1
+
+
+def reference_ingest(state, matches, status3_exact=False, season_length=38):
+    """The dashboards' original per-match loop, on plain dicts"""
+
+    def season_over():
+        return any(stats["P"] >= season_length for stats in state["team_stats"].values())
+
+    def position(team):
+        ranked = sorted(state["team_stats"].items(), key=lambda x: (x[1]["Pts"], x[1]["GD"], x[1]["GF"]), reverse=True)
+        return [name for name, _ in ranked].index(team) + 1
+
+    stats = state["team_stats"]
+    if any(stats[home]["P"] >= season_length or stats[away]["P"] >= season_length for home, _, _, away in matches):
+        if season_over():
+            reference_reset(state)
+    for home_team, home_score, away_score, away_team in matches:
+        stats = state["team_stats"]
+        if stats[home_team]["P"] >= season_length or stats[away_team]["P"] >= season_length:
+            if season_over():
+                reference_reset(state)
+            stats = state["team_stats"]
+        match_id = state["match_counter"]
+        state["match_counter"] += 1
+        total_goals = home_score + away_score
+        home_c, away_c = state["home_counters"], state["away_counters"]
+        ha, s3 = state["ha_counters"], state["status3_counters"]
+        if total_goals == 4:
+            home_c[home_team] = away_c[away_team] = ha[home_team] = ha[away_team] = 0
+        else:
+            home_c[home_team] += 1
+            away_c[away_team] += 1
+            ha[home_team] += 1
+            ha[away_team] += 1
+        if total_goals == 3 if status3_exact else total_goals >= 3:
+            s3[home_team] = s3[away_team] = 0
+        else:
+            s3[home_team] += 1
+            s3[away_team] += 1
+
+        for team, scored, conceded in ((home_team, home_score, away_score), (away_team, away_score, home_score)):
+            team_stats = stats[team]
+            team_stats["P"] += 1
+            team_stats["GF"] += scored
+            team_stats["GA"] += conceded
+            team_stats["GD"] = team_stats["GF"] - team_stats["GA"]
+            if scored > conceded:
+                team_stats["W"] += 1
+                team_stats["Pts"] += 3
+                team_stats["Form"].append("W")
+            elif scored < conceded:
+                team_stats["L"] += 1
+                team_stats["Form"].append("L")
+            else:
+                team_stats["D"] += 1
+                team_stats["Pts"] += 1
+                team_stats["Form"].append("D")
+            if len(team_stats["Form"]) > 5:
+                team_stats["Form"].pop(0)
+
+        state["rows"].append({
+            "Match_ID": match_id,
+            "Home_Team": home_team,
+            "Home_Score": home_score,
+            "Away_Score": away_score,
+            "Away_Team": away_team,
+            "Total_Goals": total_goals,
+            "Home_Rank": position(home_team),
+            "Away_Rank": position(away_team),
+            "Games_Since_Last_Won_Home": home_c[home_team],
+            "Games_Since_Last_Won_Away": away_c[away_team],
+            "Games_Since_Last_Won_Combined_Home": ha[home_team],
+            "Games_Since_Last_Won_Combined_Away": ha[away_team],
+            "Games_Since_Last_3Goals_Home": s3[home_team],
+            "Games_Since_Last_3Goals_Away": s3[away_team],
+            "F!=4HA": f"{home_team}: {ha[home_team]} | {away_team}: {ha[away_team]}",
+            "Status3": f"{home_team}: {s3[home_team]} | {away_team}: {s3[away_team]}",
+            "F4_Alert_Home": get_alert_symbols_and_reason(ha[home_team], s3[home_team])[0],
+            "S3_Alert_Home": get_alert_symbols_and_reason(ha[home_team], s3[home_team])[1],
+            "F4_Alert_Away": get_alert_symbols_and_reason(ha[away_team], s3[away_team])[0],
+            "S3_Alert_Away": get_alert_symbols_and_reason(ha[away_team], s3[away_team])[1],
+            "Season_Number": state["season_number"],
+        })
+
+
+def run_reference(batches, status3_exact=False, season_length=38, teams=VALID_TEAMS):
+    state = {"teams": teams, "season_number": 0, "rows": []}
+    reference_reset(state)
+    for batch in batches:
+        reference_ingest(state, batch, status3_exact, season_length)
+    return state
+
+
+def engine_rows(engine):
+    return [dict(zip(MATCH_COLUMNS, row)) for row in engine.match_rows()]
+
+
+def assert_matches_reference(engine, state):
+    rows = engine_rows(engine)
+    assert len(rows) == len(state["rows"])
+    for row, expected in zip(rows, state["rows"]):
+        assert {key: row[key] for key in expected} == expected
+    assert engine.season_number == state["season_number"]
+    assert engine.match_counter == state["match_counter"]
+    for team, stats in state["team_stats"].items():
+        assert engine.team_stats[team] == stats
+    assert engine.ha_counters == state["ha_counters"]
+    assert engine.status3_counters == state["status3_counters"]
+    assert engine.home_counters == state["home_counters"]
+    assert engine.away_counters == state["away_counters"]
+
+
+def batches_of(matches, sizes):
+    batches, start = [], 0
+    for size in sizes:
+        batches.append(matches[start:start + size])
+        start += size
+    batches.append(matches[start:])
+    return batches
+
+
+@pytest.mark.parametrize("status3_exact", [False, True])
+def test_ingest_matches_the_dashboard_loop_across_seasons(status3_exact):
+    matches = generate_matches(3, 11)
+    batches = batches_of(matches, [1, 37, 200, 142, 380, 5])
+    engine = LeagueEngine(status3_exact=status3_exact)
+    completed = []
+    for batch in batches:
+        completed += engine.ingest(batch)["completed_seasons"]
+    assert_matches_reference(engine, run_reference(batches, status3_exact))
+    assert [season for season, _ in completed] == [1, 2]
+    assert engine.season_number == 3
+
+
+def test_batch_boundaries_do_not_change_the_result():
+    matches = generate_matches(2, 4)
+    whole = LeagueEngine()
+    whole.ingest(matches)
+    split = LeagueEngine()
+    for batch in batches_of(matches, [3, 400, 17, 300]):
+        split.ingest(batch)
+    assert engine_rows(whole) == engine_rows(split)
+    assert whole.season_state() == split.season_state()
+
+
+def test_season_rolls_over_at_the_league_season_length():
+    teams = ["Alpha", "Beta", "Gamma", "Delta"]
+    matches = generate_matches(3, 2, teams)
+    engine = LeagueEngine(teams, season_length=6)
+    summary = engine.ingest(matches)
+    assert [season for season, _ in summary["completed_seasons"]] == [1, 2]
+    assert engine.season_number == 3
+    assert [engine.season_match_count(season) for season in (1, 2, 3)] == [12, 12, 12]
+    assert_matches_reference(engine, run_reference([matches], season_length=6, teams=teams))
+
+
+def test_counters_reset_on_four_and_three_goals():
+    engine = LeagueEngine()
+    engine.ingest([["Leeds", 0, 0, "Wolves"], ["Leeds", 1, 1, "Wolves"]])
+    assert engine.ha_counters["Leeds"] == engine.ha_counters["Wolves"] == 2
+    assert engine.status3_counters["Leeds"] == 2
+    engine.ingest([["Wolves", 2, 2, "Leeds"]])
+    assert engine.ha_counters["Leeds"] == engine.ha_counters["Wolves"] == 0
+    assert engine.home_counters["Wolves"] == engine.away_counters["Leeds"] == 0
+    assert engine.status3_counters["Leeds"] == 0
+    engine.ingest([["Leeds", 2, 1, "Wolves"]])
+    assert engine.ha_counters["Leeds"] == 1
+    assert engine.status3_counters["Leeds"] == 0
+
+    exact = LeagueEngine(status3_exact=True)
+    exact.ingest([["Leeds", 3, 1, "Wolves"]])
+    assert exact.status3_counters["Leeds"] == 1
+
+
+def test_ranks_follow_points_goal_difference_goals_then_name():
+    engine = LeagueEngine()
+    engine.ingest([["Wolves", 2, 0, "Leeds"], ["Burnley", 2, 0, "Fulham"]])
+    ranking = [team for team, _ in engine.calculate_rankings()]
+    assert ranking[:2] == ["Burnley", "Wolves"]
+    assert engine.get_team_position("Burnley") == 1
+    assert ranking[-2:] == ["Fulham", "Leeds"]
+    row = engine_rows(engine)[-1]
+    # Fulham and Leeds are level on everything, so the name decides
+    assert (row["Home_Rank"], row["Away_Rank"]) == (1, 19)
+
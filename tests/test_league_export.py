@@ -0,0 +1,41 @@
+import gzip
+import io
+
+import pandas as pd
+
+from league_engine import LeagueEngine
+from league_export import match_export, table_export
+from synthetic_league import generate_matches
+
+
+def read_csv(data):
+    return pd.read_csv(io.BytesIO(data))
+
+
+def test_exports_are_encoded_once_per_data_version():
+    matches = generate_matches(2, 4)
+    engine = LeagueEngine()
+    engine.ingest(matches[:300])
+    export = engine.cached(match_export, "CSV")
+    assert engine.cached(match_export, "CSV") is export
+    assert len(read_csv(export)) == 300
+    engine.ingest(matches[300:320])
+    assert len(read_csv(engine.cached(match_export, "CSV"))) == 320
+
+
+def test_season_export_holds_only_that_season():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 4)[:500])
+    season = read_csv(match_export(engine, "CSV", 2))
+    assert len(season) == 500 - 380
+    assert season["Match_ID"].tolist() == list(range(1, 121))
+
+
+def test_gzip_export_is_the_csv_with_stable_bytes():
+    matches = generate_matches(1, 4)[:100]
+    first, second = LeagueEngine(), LeagueEngine()
+    first.ingest(matches)
+    second.ingest(matches)
+    compressed = table_export(first, "CSV (gzip)")
+    assert gzip.decompress(compressed) == table_export(first, "CSV")
+    assert table_export(second, "CSV (gzip)") == compressed
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from feed_parser import clean_and_parse_matches
+from helpers import engine_state
+from league_registry import (
+    DEFAULT_LEAGUE, LeagueRegistry, import_leagues, league_config, league_db_path, load_leagues, new_engine,
+)
+from league_storage import LeagueStorage
+from synthetic_league import generate_feed, generate_matches
+
+SPANISH_TEAMS = ["Barcelona", "Bilbao", "Madrid", "Sevilla", "Valencia", "Villarreal"]
+
+
+@pytest.fixture
+def leagues(tmp_path):
+    path = tmp_path / "leagues.json"
+    path.write_text(json.dumps({"spanish": {"name": "Spanish League", "teams": SPANISH_TEAMS}}), encoding="utf-8")
+    return load_leagues(str(path))
+
+
+def test_leagues_file_adds_double_round_robin_leagues(leagues):
+    assert list(leagues) == [DEFAULT_LEAGUE, "spanish"]
+    assert leagues["spanish"]["header"] == "Spanish League"
+    assert leagues["spanish"]["season_length"] == 10
+    assert leagues[DEFAULT_LEAGUE]["season_length"] == 38
+    with pytest.raises(ValueError, match="two teams"):
+        league_config("solo", "Solo League", ["Madrid"])
+
+
+def test_each_league_has_its_own_file_engine_and_parser(leagues):
+    assert league_db_path("data/league.db", DEFAULT_LEAGUE) == "data/league.db"
+    assert league_db_path("data/league.db", "spanish") == "data/league_spanish.db"
+    registry = LeagueRegistry(leagues)
+    assert registry.loaded() == []
+    spanish = registry.engine("spanish")
+    assert registry.engine("spanish") is spanish
+    assert registry.loaded() == ["spanish"]
+    assert spanish.teams == set(SPANISH_TEAMS)
+    assert spanish.season_length == 10
+    # Leeds is not a Spanish team
+    text = "Spanish League WEEK 1 - #1\nMadrid\n1\n0\nSevilla\nLeeds"
+    parsed, errors, _ = clean_and_parse_matches(text, registry.parser("spanish"))
+    assert parsed == [["Madrid", 1, 0, "Sevilla"]]
+    assert errors == []
+    registry.unload("spanish")
+    assert registry.engine("spanish") is not spanish
+
+
+def write_feeds(directory, matches, header, per_file):
+    paths = []
+    for index, start in enumerate(range(0, len(matches), per_file)):
+        path = directory / f"week{index + 1:02d}.txt"
+        path.write_text(generate_feed(matches[start:start + per_file], index, header=header), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_import_leagues_fills_each_leagues_file_once(tmp_path, leagues, workers):
+    english_matches = generate_matches(1, 5)[:200]
+    spanish_matches = generate_matches(3, 5, SPANISH_TEAMS)
+    (tmp_path / "english").mkdir()
+    (tmp_path / "spanish").mkdir()
+    sources = {
+        DEFAULT_LEAGUE: write_feeds(tmp_path / "english", english_matches, "English League", 50),
+        "spanish": write_feeds(tmp_path / "spanish", spanish_matches, "Spanish League", 15),
+    }
+    base_path = str(tmp_path / "league.db")
+    summaries = import_leagues(sources, base_path, leagues, workers=workers)
+    assert summaries[DEFAULT_LEAGUE]["processed"] == 200
+    assert summaries["spanish"]["processed"] == 90
+    assert summaries["spanish"]["season_number"] == 3
+
+    for key, matches in ((DEFAULT_LEAGUE, english_matches), ("spanish", spanish_matches)):
+        expected = new_engine(leagues[key])
+        expected.ingest(matches)
+        stored = new_engine(leagues[key])
+        LeagueStorage(league_db_path(base_path, key), read_only=True).load(stored)
+        assert engine_state(stored) == engine_state(expected)
+
+    again = import_leagues(sources, base_path, leagues, workers=workers)
+    assert {key: summary["processed"] for key, summary in again.items()} == {DEFAULT_LEAGUE: 0, "spanish": 0}
@@ -0,0 +1,83 @@
+import pytest
+
+from helpers import built_engine, engine_state, ingest_batches, replayed
+from league_engine import LeagueEngine
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+@pytest.mark.parametrize("row", [0, 499, 500, 760, 1099])
+def test_delete_match_equals_a_fresh_ingest(row):
+    engine = built_engine()
+    events, season_number = engine.logged_events(), engine.season_number
+    del events[row]
+    engine.delete_match(row)
+    assert engine_state(engine) == engine_state(replayed(events, season_number))
+
+
+@pytest.mark.parametrize("row", [0, 500, 1099])
+def test_correct_match_equals_a_fresh_ingest(row):
+    engine = built_engine()
+    events, season_number = engine.logged_events(), engine.season_number
+    season, (home, _, _, away) = events[row]
+    events[row] = (season, [home, 2, 2, away])
+    engine.correct_match(row, [home, 2, 2, away])
+    assert engine_state(engine) == engine_state(replayed(events, season_number))
+
+
+def test_undo_last_batch_restores_the_earlier_state():
+    matches = generate_matches(3, 5)
+    engine = built_engine()
+    assert engine.undo_last_batch() == 200
+    reference = LeagueEngine()
+    ingest_batches(reference, matches[:900])
+    reference.reset_season()
+    assert engine_state(engine) == engine_state(reference)
+    # The manual reset after the undone batch stays
+    assert engine.undo_last_batch() == 900 - 822
+    reference = LeagueEngine()
+    ingest_batches(reference, matches[:822])
+    reference.reset_season()
+    assert engine_state(engine) == engine_state(reference)
+
+
+def test_edits_are_persisted(tmp_path):
+    path = str(tmp_path / "league.db")
+    engine = built_engine()
+    storage = LeagueStorage(path)
+    storage.save(engine)
+    engine.delete_match(300)
+    storage.save(engine)
+    engine.undo_last_batch()
+    storage.save(engine)
+    restored = LeagueEngine()
+    LeagueStorage(path).load(restored)
+    assert engine_state(restored) == engine_state(engine)
+    assert restored.batches == engine.batches
+
+
+def season_labels(engine):
+    return engine.store.column("season").tolist()
+
+
+def test_delete_keeps_the_logged_seasons():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(3, 8)[:1000])
+    labels = season_labels(engine)
+    engine.delete_match(200)
+    del labels[200]
+    assert season_labels(engine) == labels
+    assert [engine.season_match_count(season) for season in (1, 2, 3)] == [379, 380, 240]
+
+
+def test_correction_that_adds_a_teams_match_keeps_the_logged_seasons():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 8)[:500])
+    labels = season_labels(engine)
+    _, (home, home_score, away_score, away) = engine.logged_events(5, 6)[0]
+    other = next(team for team in sorted(engine.teams) if team not in (home, away))
+    # ``other`` now plays 39 matches in Season 1, which must not close it early
+    engine.correct_match(5, [home, home_score, away_score, other])
+    assert season_labels(engine) == labels
+    assert engine.season_number == 2
+    assert engine.season_match_count(2) == 120
@@ -0,0 +1,32 @@
+from goal_model import fit_goal_model
+from league_engine import LeagueEngine, elo_expectancy
+from match_predictor import fixture_predictions, match_prediction, predict_match_outcome, prediction_frame
+from synthetic_league import generate_matches
+
+ELO_KEYS = ("home_elo", "away_elo", "elo_home_expectancy")
+
+
+def test_fixture_matrix_equals_one_prediction_per_fixture():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 13)[:600])
+    model = fit_goal_model(engine)
+    matrix = fixture_predictions(engine)
+    assert len(matrix) == 20 * 19
+    for (home, away), prediction in matrix.items():
+        single = predict_match_outcome(home, away, goal_model=model)
+        assert {key: value for key, value in prediction.items() if key not in ELO_KEYS} == single
+        assert prediction["home_elo"] == round(engine.elo[home], 1)
+        assert prediction["elo_home_expectancy"] == round(elo_expectancy(engine.elo[home], engine.elo[away]) * 100, 1)
+
+
+def test_fixture_lookups_share_the_memoized_matrix():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(1, 13)[:200])
+    matrix = engine.cached(fixture_predictions)
+    assert match_prediction(engine, "Leeds", "Wolves") is matrix[("Leeds", "Wolves")]
+    frame = prediction_frame(engine)
+    assert len(frame) == len(matrix)
+    row = frame[(frame["Home_Team"] == "Palace") & (frame["Away_Team"] == "Fulham")].iloc[0]
+    assert row["home_win"] == matrix[("Palace", "Fulham")]["home_win"]
+    engine.ingest(generate_matches(1, 13)[200:210])
+    assert match_prediction(engine, "Leeds", "Wolves") is not matrix[("Leeds", "Wolves")]
@@ -0,0 +1,48 @@
+from league_analytics import league_table
+from league_engine import LeagueEngine
+from synthetic_league import generate_matches
+
+
+def counting(calls):
+    def team_count(engine, offset=0):
+        calls.append(offset)
+        return len(engine.store) + offset
+    return team_count
+
+
+def test_cached_results_are_reused_until_the_data_changes():
+    matches = generate_matches(2, 3)
+    engine = LeagueEngine()
+    engine.ingest(matches[:100])
+    calls = []
+    compute = counting(calls)
+    assert engine.cached(compute) == 100
+    assert engine.cached(compute) == 100
+    assert engine.cached(compute, 5) == 105
+    assert calls == [0, 5]
+    engine.ingest(matches[100:150])
+    assert engine.cached(compute) == 150
+    assert calls == [0, 5, 0]
+
+
+def test_every_kind_of_change_invalidates_the_memo():
+    matches = generate_matches(2, 3)
+    engine = LeagueEngine()
+    engine.ingest(matches[:400])
+    home, _, _, away = matches[3]
+    changes = [
+        lambda: engine.ingest(matches[400:410]),
+        engine.reset_season,
+        lambda: engine.delete_match(20),
+        lambda: engine.correct_match(3, [home, 9, 9, away]),
+        engine.undo_last_batch,
+        engine.clear,
+    ]
+    for change in changes:
+        before = engine.cached(league_table)
+        assert engine.cached(league_table) is before
+        version = engine.version
+        change()
+        assert engine.version > version
+        assert engine.cached(league_table) is not before
+        assert engine.cached(league_table).equals(league_table(engine))
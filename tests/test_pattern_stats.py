@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from helpers import engine_state, ingest_batches
+from league_engine import LeagueEngine, compute_pattern_stats
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+@pytest.mark.parametrize("status3_exact", [False, True])
+def test_pattern_stats_kept_on_ingest_match_a_full_scan(status3_exact):
+    engine = LeagueEngine(status3_exact=status3_exact)
+    ingest_batches(engine, generate_matches(2, 9), 157)
+    scanned = compute_pattern_stats(engine.store, engine.teams, status3_exact)
+    assert json.dumps(engine.pattern_stats, sort_keys=True) == json.dumps(scanned, sort_keys=True)
+
+
+def test_exact_status3_counts_only_three_goal_matches_as_s3_hits():
+    matches = generate_matches(1, 4)[:300]
+    engine = LeagueEngine(status3_exact=True)
+    engine.ingest(matches)
+    for team in engine.teams:
+        totals = [home_score + away_score for home, home_score, away_score, away in matches if team in (home, away)]
+        assert engine.pattern_stats[team]["s3_hits"] == totals.count(3)
+
+
+def test_loading_snapshots_saved_under_the_old_rule_recounts_the_patterns(tmp_path):
+    path = str(tmp_path / "league.db")
+    matches = generate_matches(2, 6)[:700]
+    reference = LeagueEngine(status3_exact=True)
+    reference.ingest(matches)
+    # Snapshots saved before the rule was recorded counted every 3+ goal match
+    old, inclusive = LeagueEngine(status3_exact=True), LeagueEngine()
+    old.ingest(matches)
+    inclusive.ingest(matches)
+    for snapshot, counted in zip(old.snapshots, inclusive.snapshots, strict=True):
+        snapshot["patterns"] = counted["patterns"]
+        del snapshot["status3_exact"]
+    LeagueStorage(path).save(old)
+    loaded = LeagueEngine(status3_exact=True)
+    LeagueStorage(path).load(loaded)
+    assert engine_state(loaded) == engine_state(reference)
+    loaded.delete_match(100)
+    reference.delete_match(100)
+    assert engine_state(loaded) == engine_state(reference)
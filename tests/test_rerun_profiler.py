@@ -0,0 +1,35 @@
+import threading
+
+from league_analytics import alert_list, get_type_a_alerts, league_table
+from league_engine import LeagueEngine
+from rerun_profiler import RerunProfiler
+from synthetic_league import generate_matches
+
+
+def memo_rows(profiler):
+    last = profiler.last_rerun()
+    last = last[last["kind"].str.startswith("memo")]
+    return sorted(zip(last["kind"], last["name"], last["calls"]))
+
+
+def test_memo_lookups_of_the_rerun_are_recorded_as_hits_and_misses():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(1, 2)[:200])
+    profiler = RerunProfiler()
+    profiler.enabled = True
+    profiler.begin()
+    # The alert list reads the memoized alerts internally
+    engine.cached(alert_list)
+    engine.cached(get_type_a_alerts)
+    engine.cached(league_table)
+    # Another session's thread reports nothing into this profiler
+    other = threading.Thread(target=engine.cached, args=(league_table,))
+    other.start()
+    other.join()
+    profiler.finish()
+    assert memo_rows(profiler) == [
+        ("memo hit", "get_type_a_alerts", 1),
+        ("memo miss", "alert_list", 1),
+        ("memo miss", "get_type_a_alerts", 1),
+        ("memo miss", "league_table", 1),
+    ]
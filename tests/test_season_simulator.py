@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from league_engine import LeagueEngine
+from season_simulator import SIMULATION_COLUMNS, remaining_fixtures, simulate_season
+from synthetic_league import generate_matches
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(2, 6)[:380 + 250])
+    return engine
+
+
+def test_remaining_fixtures_are_the_unplayed_pairs(engine):
+    fixtures = remaining_fixtures(engine)
+    assert len(fixtures) == 380 - 250
+    played = {(home, away) for _, (home, _, _, away) in engine.logged_events(380)}
+    assert not played & set(fixtures)
+
+
+def test_same_seed_gives_the_same_result(engine):
+    first = simulate_season(engine, simulations=3000, seed=7, workers=1)
+    second = simulate_season(engine, simulations=3000, seed=7, workers=1)
+    pd.testing.assert_frame_equal(first["table"], second["table"])
+    pd.testing.assert_frame_equal(first["positions"], second["positions"])
+
+
+def test_worker_count_does_not_change_the_result(engine):
+    # Two chunks, so two workers really split the work
+    serial = simulate_season(engine, simulations=12_000, seed=3, workers=1)
+    parallel = simulate_season(engine, simulations=12_000, seed=3, workers=2)
+    pd.testing.assert_frame_equal(serial["table"], parallel["table"])
+    pd.testing.assert_frame_equal(serial["positions"], parallel["positions"])
+
+
+def test_positions_are_probabilities(engine):
+    result = simulate_season(engine, simulations=2000, seed=1, workers=1)
+    positions = result["positions"].values
+    assert np.allclose(positions.sum(axis=1), 1)
+    assert np.allclose(positions.sum(axis=0), 1)
+    assert list(result["table"].columns) == SIMULATION_COLUMNS
+    assert result["fixtures"] == 380 - 250
+
+
+def test_finished_season_is_already_decided():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(1, 6))
+    result = simulate_season(engine, simulations=100, seed=1, workers=1)
+    assert result["fixtures"] == 0
+    leader = engine.calculate_rankings()[0][0]
+    assert result["positions"].loc[leader, 1] == 1
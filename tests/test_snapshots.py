@@ -0,0 +1,32 @@
+import pytest
+
+from helpers import built_engine, engine_state
+from league_engine import LeagueEngine
+from league_storage import LeagueStorage
+from synthetic_league import generate_matches
+
+
+def test_snapshots_at_the_interval_and_season_boundaries():
+    engine = LeagueEngine(snapshot_interval=300)
+    engine.ingest(generate_matches(2, 1) + generate_matches(1, 2)[:10])
+    assert [snapshot["row"] for snapshot in engine.snapshots] == [0, 300, 380, 600, 760]
+    assert [snapshot["season_number"] for snapshot in engine.snapshots] == [1, 1, 2, 2, 3]
+
+
+@pytest.mark.parametrize("row", [0, 450, 899, 900, 1050, None])
+def test_rebuild_from_a_snapshot_reproduces_the_state(row):
+    engine = built_engine()
+    before = engine_state(engine)
+    engine.rebuild(row)
+    assert engine_state(engine) == before
+
+
+def test_loaded_engine_rebuilds_from_the_stored_snapshots(tmp_path):
+    path = str(tmp_path / "league.db")
+    engine = built_engine()
+    LeagueStorage(path).save(engine)
+    restored = LeagueEngine()
+    LeagueStorage(path).load(restored)
+    assert [snapshot["row"] for snapshot in restored.snapshots] == [snapshot["row"] for snapshot in engine.snapshots]
+    restored.rebuild(600)
+    assert engine_state(restored) == engine_state(engine)
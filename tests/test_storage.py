@@ -0,0 +1,106 @@
+import pytest
+
+from helpers import built_engine, engine_state
+from league_engine import LeagueEngine
+from league_storage import LeagueStorage, StaleEngineError
+from synthetic_league import generate_matches
+
+
+def loaded(path):
+    engine = LeagueEngine()
+    storage = LeagueStorage(path)
+    assert storage.load(engine)
+    storage.close()
+    return engine
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "league.db")
+
+
+def test_load_restores_the_saved_engine(db_path):
+    engine = built_engine()
+    storage = LeagueStorage(db_path)
+    storage.save(engine)
+    storage.close()
+    restored = loaded(db_path)
+    assert engine_state(restored) == engine_state(engine)
+    assert restored.batches == engine.batches
+
+
+def test_empty_database_loads_nothing(db_path):
+    assert not LeagueStorage(db_path).load(LeagueEngine())
+
+
+def test_sessions_sharing_a_storage_keep_the_imported_feeds(db_path):
+    matches = generate_matches(1, 2)
+    storage = LeagueStorage(db_path)
+    first = LeagueEngine()
+    first.ingest(matches[:60])
+    storage.save(first, ["week1.txt"])
+    second = LeagueEngine()
+    storage.load(second)
+    second.ingest(matches[60:100])
+    storage.save(second)
+    assert storage.imported_feeds() == ["week1.txt"]
+    assert storage.match_count() == 100
+    assert engine_state(loaded(db_path)) == engine_state(second)
+
+
+def test_clear_forgets_the_imported_feeds(db_path):
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(1, 2)[:10])
+    storage = LeagueStorage(db_path)
+    storage.save(engine, ["week1.txt"])
+    storage.clear()
+    assert storage.imported_feeds() == []
+    assert storage.match_count() == 0
+
+
+def test_save_refuses_to_overwrite_another_sessions_matches(db_path):
+    matches = generate_matches(1, 3)
+    storage = LeagueStorage(db_path)
+    first, second = LeagueEngine(), LeagueEngine()
+    storage.load(first)
+    storage.load(second)
+    first.ingest(matches[:10])
+    storage.save(first)
+    second.ingest(matches[10:20])
+    with pytest.raises(StaleEngineError):
+        storage.save(second)
+    assert storage.match_count() == 10
+    storage.load(second)
+    second.ingest(matches[10:20])
+    storage.save(second)
+    assert engine_state(loaded(db_path)) == engine_state(second)
+    assert storage.match_count() == 20
+
+
+def test_save_refuses_a_write_from_another_connection_since_the_load(db_path):
+    matches = generate_matches(1, 3)
+    storage = LeagueStorage(db_path)
+    engine = LeagueEngine()
+    storage.load(engine)
+    other = LeagueEngine()
+    other_storage = LeagueStorage(db_path)
+    other_storage.load(other)
+    other.ingest(matches[:10])
+    other_storage.save(other)
+    engine.ingest(matches[10:20])
+    with pytest.raises(StaleEngineError):
+        storage.save(engine)
+    with pytest.raises(StaleEngineError):
+        storage.save(LeagueEngine())
+    assert engine_state(loaded(db_path)) == engine_state(other)
+
+
+# Snapshot at row 20: unknown teams in the bulk-read head; at row 0: in the replayed tail
+@pytest.mark.parametrize("snapshot_interval", [20, 500])
+def test_loading_another_leagues_file_names_the_unknown_teams(db_path, snapshot_interval):
+    engine = LeagueEngine(snapshot_interval=snapshot_interval)
+    engine.ingest(generate_matches(1, 2)[:40])
+    LeagueStorage(db_path).save(engine)
+    other = LeagueEngine(["Barcelona", "Leeds", "Madrid"])
+    with pytest.raises(ValueError, match="'Aston V', .*'Wolves'"):
+        LeagueStorage(db_path).load(other)
@@ -0,0 +1,72 @@
+import pytest
+
+from alert_backtest import DEFAULT_THRESHOLDS, backtest_alerts
+from league_analytics import ALERT_HORIZONS
+from league_engine import LeagueEngine
+from synthetic_league import generate_matches
+from threshold_sweep import sweep_thresholds, threshold_grid
+
+GRID = [("f4", 4, 6), ("f4", 7, 9), ("s3", 2, 3), ("s3", 3, 6)]
+
+
+@pytest.fixture(scope="module")
+def engine():
+    engine = LeagueEngine()
+    engine.ingest(generate_matches(3, 21)[:1000])
+    return engine
+
+
+def team_runs(engine):
+    """Per (season, team): ``(f4 counter, s3 counter, total goals)`` after each match"""
+    store = engine.store
+    columns = {name: store.column(name).tolist() for name in
+               ("season", "home", "away", "total_goals", "ha_home", "ha_away", "s3_home", "s3_away")}
+    runs = {}
+    for row, season in enumerate(columns["season"]):
+        for side in ("home", "away"):
+            entry = (columns["ha_" + side][row], columns["s3_" + side][row], columns["total_goals"][row])
+            runs.setdefault((season, columns[side][row]), []).append(entry)
+    return runs
+
+
+def reference_recall(engine, family, alert, critical):
+    """Share of resets a firing announced within its horizon"""
+    counter = 0 if family == "f4" else 1
+    is_hit = (lambda total: total == 4) if family == "f4" else (lambda total: total >= 3)
+    warning_horizon = ALERT_HORIZONS[family + "_warning"]
+    critical_horizon = ALERT_HORIZONS[family + "_critical"]
+    resets = announced = 0
+    for run in team_runs(engine).values():
+        for index, entry in enumerate(run):
+            if not is_hit(entry[2]):
+                continue
+            resets += 1
+            earlier = [previous[counter] for previous in reversed(run[:index])]
+            announced += (
+                any(alert <= value < critical for value in earlier[:warning_horizon])
+                or any(value >= critical for value in earlier[:critical_horizon])
+            )
+    return round(announced / resets * 100, 1)
+
+
+def test_sweep_rows_match_a_backtest_with_those_thresholds(engine):
+    sweep = sweep_thresholds(engine, GRID, workers=1).set_index(["family", "alert_threshold", "critical_threshold"])
+    for family, alert, critical in GRID:
+        # DEFAULT_THRESHOLDS holds the F!=4HA pair, then the Status3 pair
+        offset = 0 if family == "f4" else 2
+        thresholds = list(DEFAULT_THRESHOLDS)
+        thresholds[offset:offset + 2] = alert, critical
+        firings = backtest_alerts(engine, 1, tuple(thresholds))
+        row = sweep.loc[(family, alert, critical)]
+        for level in ("warning", "critical"):
+            fired = firings[firings["kind"] == f"{family}_{level}"]
+            evaluated = fired[fired["evaluated"]]
+            assert row[level + "_firings"] == len(fired)
+            assert row[level + "_precision"] == round(evaluated["hit"].mean() * 100, 1)
+        assert row["recall"] == reference_recall(engine, family, alert, critical)
+
+
+def test_sweep_is_the_same_across_worker_processes(engine):
+    grid = threshold_grid((4, 8), 3)
+    assert len(grid) == 30
+    assert sweep_thresholds(engine, grid, workers=1).equals(sweep_thresholds(engine, grid, workers=3))
@@ -0,0 +1,203 @@
+"""Sweep of F!=4HA / Status3 alert thresholds against the match history.
+
+Every team-match of the log is long-formatted once, with the counter after
+the match and whether the counter resets within each alert horizon. A
+threshold pair is then scored with a few array comparisons:
+
+* precision: share of evaluated firings whose counter reset within the
+  horizon the message promises (warning and critical separately and
+  combined);
+* recall: share of counter resets that fell inside the promised horizon
+  of at least one earlier warning or critical firing;
+* volume: firings in total and per season.
+
+The F!=4HA and Status3 families are independent, so each is swept over
+its own (warning, critical) pairs, and the pairs are spread across a
+process pool.
+
+    python threshold_sweep.py --db league_data.db --top 5
+    python threshold_sweep.py --synthetic 100 --csv sweep.csv
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from alert_backtest import add_source_arguments, engine_from_args, hits_ahead, season_ranges, team_entries
+from league_analytics import ALERT_HORIZONS
+from league_engine import F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD, S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD
+
+FAMILIES = ("f4", "s3")
+CURRENT_THRESHOLDS = {
+    "f4": (F4_ALERT_THRESHOLD, F4_CRITICAL_THRESHOLD),
+    "s3": (S3_ALERT_THRESHOLD, S3_CRITICAL_THRESHOLD),
+}
+DEFAULT_ALERT_RANGE = (3, 15)
+DEFAULT_MAX_GAP = 6
+
+SWEEP_COLUMNS = [
+    "family", "alert_threshold", "critical_threshold",
+    "warning_firings", "warning_precision", "critical_firings", "critical_precision",
+    "firings", "firings_per_season", "precision", "recall", "f1", "current",
+]
+
+_MAX_HORIZON = max(ALERT_HORIZONS.values())
+
+_SWEEP_FIELDS = ["home", "away", "total_goals", "ha_home", "ha_away", "s3_home", "s3_away"]
+
+# Sweep arrays installed in each worker process
+_worker_arrays = None
+
+
+def sweep_arrays(engine):
+    """Per-family arrays shared by every threshold pair"""
+    store = engine.store
+    parts = {family: {key: [] for key in ("counter", "warning_hit", "warning_known",
+                                           "critical_hit", "critical_known", "prior")}
+             for family in FAMILIES}
+    ranges = season_ranges(store)
+    for _, start, stop in ranges:
+        columns = {name: store.column(name, start, stop) for name in _SWEEP_FIELDS}
+        entries = team_entries(columns, engine.status3_exact)
+        order, group_end = entries["order"], entries["group_end"]
+        position = np.arange(len(order))
+        first_in_group = np.r_[True, group_end[1:] != group_end[:-1]]
+        for family in FAMILIES:
+            counter = entries[family + "_counter"]
+            hit = entries[family + "_hit"]
+            part = parts[family]
+            part["counter"].append(counter)
+            for level in ("warning", "critical"):
+                hit_ahead, known = hits_ahead(hit, order, group_end, ALERT_HORIZONS[f"{family}_{level}"])
+                part[level + "_hit"].append(hit_ahead)
+                part[level + "_known"].append(known)
+            # Counters of the team's last few matches before each reset this
+            # season, newest first; -1 where the season had not started yet
+            grouped_counter = counter[order]
+            reset_positions = position[hit[order]]
+            group_start = np.maximum.accumulate(np.where(first_in_group, position, 0))[reset_positions]
+            prior = np.full((len(reset_positions), _MAX_HORIZON), -1, dtype=np.int64)
+            for back in range(1, _MAX_HORIZON + 1):
+                earlier = reset_positions - back
+                valid = earlier >= group_start
+                prior[valid, back - 1] = grouped_counter[earlier[valid]]
+            part["prior"].append(prior)
+    arrays = {
+        family: {key: np.concatenate(values) for key, values in part.items()}
+        for family, part in parts.items()
+    }
+    arrays["seasons"] = len(ranges)
+    return arrays
+
+
+def evaluate_thresholds(arrays, family, alert_threshold, critical_threshold):
+    """Precision, recall and volume for one (warning, critical) pair"""
+    data = arrays[family]
+    counter = data["counter"]
+    critical = counter >= critical_threshold
+    warning = (counter >= alert_threshold) & ~critical
+
+    warning_known = warning & data["warning_known"]
+    critical_known = critical & data["critical_known"]
+    warning_hits = int(np.count_nonzero(warning_known & data["warning_hit"]))
+    critical_hits = int(np.count_nonzero(critical_known & data["critical_hit"]))
+    warning_evaluated = int(np.count_nonzero(warning_known))
+    critical_evaluated = int(np.count_nonzero(critical_known))
+    evaluated = warning_evaluated + critical_evaluated
+
+    firings = int(np.count_nonzero(warning)) + int(np.count_nonzero(critical))
+    precision = (warning_hits + critical_hits) / evaluated * 100 if evaluated else 0.0
+    prior = data["prior"]
+    warning_horizon = ALERT_HORIZONS[family + "_warning"]
+    critical_horizon = ALERT_HORIZONS[family + "_critical"]
+    warned = prior[:, :warning_horizon]
+    announced = (
+        ((warned >= alert_threshold) & (warned < critical_threshold)).any(axis=1)
+        | (prior[:, :critical_horizon] >= critical_threshold).any(axis=1)
+    )
+    resets = len(prior)
+    recall = np.count_nonzero(announced) / resets * 100 if resets else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    return [
+        family, alert_threshold, critical_threshold,
+        int(np.count_nonzero(warning)),
+        round(warning_hits / warning_evaluated * 100, 1) if warning_evaluated else 0.0,
+        int(np.count_nonzero(critical)),
+        round(critical_hits / critical_evaluated * 100, 1) if critical_evaluated else 0.0,
+        firings, round(firings / max(arrays["seasons"], 1), 1),
+        round(precision, 1), round(recall, 1), round(f1, 1),
+        (alert_threshold, critical_threshold) == CURRENT_THRESHOLDS[family],
+    ]
+
+
+def threshold_grid(alert_range=DEFAULT_ALERT_RANGE, max_gap=DEFAULT_MAX_GAP):
+    """``(family, alert, critical)`` combinations with ``alert < critical``"""
+    low, high = alert_range
+    return [
+        (family, alert, alert + gap)
+        for family in FAMILIES
+        for alert in range(low, high + 1)
+        for gap in range(1, max_gap + 1)
+    ]
+
+
+def _init_worker(arrays):
+    global _worker_arrays
+    _worker_arrays = arrays
+
+
+def _evaluate_chunk(combinations):
+    return [evaluate_thresholds(_worker_arrays, *combination) for combination in combinations]
+
+
+def sweep_thresholds(engine, grid=None, workers=None):
+    """Score every threshold combination; one row per ``(family, alert, critical)``"""
+    grid = grid if grid is not None else threshold_grid()
+    arrays = sweep_arrays(engine)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(grid) < 2:
+        rows = [evaluate_thresholds(arrays, *combination) for combination in grid]
+    else:
+        chunks = [grid[index::workers] for index in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(arrays,)) as pool:
+            rows = [row for chunk in pool.map(_evaluate_chunk, chunks) for row in chunk]
+    sweep = pd.DataFrame(rows, columns=SWEEP_COLUMNS)
+    return sweep.sort_values(["family", "alert_threshold", "critical_threshold"], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep F!=4HA / Status3 alert thresholds over the match log")
+    add_source_arguments(parser, "sweep")
+    parser.add_argument("--alert-range", type=int, nargs=2, default=DEFAULT_ALERT_RANGE, metavar=("MIN", "MAX"))
+    parser.add_argument("--max-gap", type=int, default=DEFAULT_MAX_GAP,
+                        help="largest critical minus warning threshold to try")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10, help="best combinations by F1 to print per family")
+    parser.add_argument("--csv", help="also write the full sweep to this CSV file")
+    args = parser.parse_args(argv)
+
+    engine = engine_from_args(args)
+    grid = threshold_grid(tuple(args.alert_range), args.max_gap)
+    started = time.perf_counter()
+    sweep = sweep_thresholds(engine, grid, args.workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(engine.store)} matches, {len(grid)} threshold combinations in {elapsed:.2f}s")
+    for family in FAMILIES:
+        rows = sweep[sweep["family"] == family]
+        print(f"\n{family.upper()} (current {CURRENT_THRESHOLDS[family][0]}/{CURRENT_THRESHOLDS[family][1]})")
+        best = rows.nlargest(args.top, "f1")
+        current = rows[rows["current"]]
+        print(pd.concat([best, current]).drop_duplicates().drop(columns="family").to_string(index=False))
+    if args.csv:
+        sweep.to_csv(args.csv, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())